@@ -0,0 +1,60 @@
+import asyncio
+import json
+
+from django.conf import settings
+
+from payouts.events import status_channel, subscriptions
+from payouts.models import Payout, SETTLED_STATUSES
+from .formatters import format_datetime
+
+
+def format_event(payout_uid, status, updated_at):
+    data = json.dumps({
+        'payout_uid': str(payout_uid),
+        'status': status,
+        'updated_at': updated_at,
+    })
+    return f'event: status\ndata: {data}\n\n'
+
+
+async def stream_statuses(payout_uids):
+    """
+    Поток Server-Sent Events со сменой статусов заявок.
+
+    Подписка на каналы оформляется до чтения текущих статусов из БД,
+    поэтому переходы между чтением и подпиской не теряются. Поток
+    закрывается, когда все заявки достигли конечного статуса или failed.
+    Сообщения приходят через общее для процесса pub/sub-подключение.
+    """
+    channels = [status_channel(payout_uid) for payout_uid in payout_uids]
+    queue = await subscriptions.subscribe(channels)
+    try:
+        waiting = set(map(str, payout_uids))
+        snapshot = Payout.objects.filter(pk__in=payout_uids).values_list(
+            'payout_uid', 'status', 'updated_at'
+        )
+        found = set()
+        async for payout_uid, status, updated_at in snapshot:
+            found.add(str(payout_uid))
+            yield format_event(
+                payout_uid, status, format_datetime(updated_at)
+            )
+            if status in SETTLED_STATUSES:
+                waiting.discard(str(payout_uid))
+        waiting &= found
+        while waiting:
+            try:
+                message = await asyncio.wait_for(
+                    queue.get(), settings.PAYOUT_EVENTS_HEARTBEAT
+                )
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            data = json.loads(message)
+            yield format_event(
+                data['payout_uid'], data['status'], data['updated_at']
+            )
+            if data['status'] in SETTLED_STATUSES:
+                waiting.discard(data['payout_uid'])
+    finally:
+        await subscriptions.unsubscribe(queue, channels)
@@ -0,0 +1,10 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PayoutConflict(APIException):
+    """Статус заявки изменился параллельно с запросом."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Статус заявки был изменён другим запросом'
+    default_code = 'conflict'
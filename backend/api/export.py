@@ -0,0 +1,41 @@
+import csv
+import json
+
+from django.conf import settings
+
+from .formatters import PAYOUT_FIELDS, format_rows, payout_values_list
+
+
+class Echo:
+    """Буфер, возвращающий записанную строку вместо её накопления."""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, chunk_size=None):
+    """Читает выплаты серверным курсором без создания экземпляров модели."""
+    rows = payout_values_list(queryset.order_by()).iterator(
+        chunk_size=chunk_size or settings.PAYOUT_EXPORT_CHUNK_SIZE
+    )
+    return format_rows(rows)
+
+
+def iter_csv(queryset, chunk_size=None):
+    writer = csv.writer(Echo())
+    yield writer.writerow(PAYOUT_FIELDS)
+    for row in iter_rows(queryset, chunk_size):
+        yield writer.writerow(row)
+
+
+def iter_ndjson(queryset, chunk_size=None):
+    for row in iter_rows(queryset, chunk_size):
+        yield json.dumps(
+            dict(zip(PAYOUT_FIELDS, row)), ensure_ascii=False
+        ) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', iter_csv),
+    'ndjson': ('application/x-ndjson; charset=utf-8', iter_ndjson),
+}
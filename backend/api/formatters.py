@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.db.models import CharField, ExpressionWrapper, F
+from django.utils import timezone
+
+from payouts.fields import reveal
+
+
+def format_str(value):
+    return str(value)
+
+
+def format_secret(value):
+    # Номера читаются из БД шифротекстом и расшифровываются только здесь
+    return str(reveal(value))
+
+
+def format_decimal(value):
+    return f'{value:f}'
+
+
+def format_datetime(value):
+    value = timezone.localtime(value).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+# Форматирование полей PayoutReadSerializer без объектов полей DRF.
+# Результат совпадает с to_representation соответствующих полей.
+PAYOUT_FORMATTERS = {
+    'payout_uid': format_str,
+    'amount': format_decimal,
+    'method': format_str,
+    'currency': format_str,
+    'status': format_str,
+    'bank_name': format_str,
+    'bank_bik': format_str,
+    'card_number': format_secret,
+    'account_number': format_secret,
+    'phone': format_str,
+    'description': format_str,
+    'created_at': format_datetime,
+    'updated_at': format_datetime,
+}
+PAYOUT_FIELDS = tuple(PAYOUT_FORMATTERS)
+
+# Телефон хранится в БД уже в формате вывода, поэтому при совпадении
+# форматов он читается строкой, минуя разбор и проверку PhoneNumber.
+PAYOUT_COLUMNS = {field: field for field in PAYOUT_FIELDS}
+if (
+    getattr(settings, 'PHONENUMBER_DB_FORMAT', 'E164')
+    == getattr(settings, 'PHONENUMBER_DEFAULT_FORMAT', 'E164')
+):
+    PAYOUT_COLUMNS['phone'] = ExpressionWrapper(
+        F('phone'), output_field=CharField()
+    )
+PAYOUT_VALUE_KEYS = {
+    field: field if isinstance(column, str) else f'{field}_raw'
+    for field, column in PAYOUT_COLUMNS.items()
+}
+
+
+def payout_values(queryset):
+    """Возвращает queryset строк .values() для быстрого чтения."""
+    fields = [
+        field for field in PAYOUT_FIELDS if PAYOUT_VALUE_KEYS[field] == field
+    ]
+    expressions = {
+        PAYOUT_VALUE_KEYS[field]: PAYOUT_COLUMNS[field]
+        for field in PAYOUT_FIELDS if PAYOUT_VALUE_KEYS[field] != field
+    }
+    return queryset.values(*fields, **expressions)
+
+
+def payout_values_list(queryset):
+    """Возвращает queryset кортежей полей выплат в порядке PAYOUT_FIELDS."""
+    return queryset.values_list(*PAYOUT_COLUMNS.values())
+
+
+def format_rows(rows, fields=PAYOUT_FIELDS):
+    """Форматирует кортежи values_list в списки строк."""
+    formatters = [PAYOUT_FORMATTERS[field] for field in fields]
+    for row in rows:
+        yield [
+            None if value is None else formatter(value)
+            for formatter, value in zip(formatters, row)
+        ]
+
+
+def format_dicts(rows, fields=PAYOUT_FIELDS):
+    """Форматирует словари payout_values() в словари ответа API."""
+    formatters = [
+        (field, PAYOUT_VALUE_KEYS[field], PAYOUT_FORMATTERS[field])
+        for field in fields
+    ]
+    return [
+        {
+            field: None if row[key] is None else formatter(row[key])
+            for field, key, formatter in formatters
+        }
+        for row in rows
+    ]
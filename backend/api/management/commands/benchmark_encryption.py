@@ -0,0 +1,165 @@
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from api.formatters import format_dicts, payout_values
+from api.serializers import PayoutReadSerializer
+from payouts.fields import reveal
+from payouts.models import (
+    CurrencyChoice,
+    PaymentMethodChoice,
+    Payout,
+    PayoutOutbox
+)
+from payouts.services import bulk_create_payouts
+
+
+SECRET_FIELDS = ('card_number', 'account_number')
+
+
+def elapsed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - started) * 1000
+
+
+def median(repeat, func):
+    return statistics.median(elapsed(func) for _ in range(repeat))
+
+
+def compare(pairs, func):
+    """
+    Медианы времени func на парах аргументов без шифрования и с ним.
+
+    Замеры чередуются, чтобы фоновый шум одинаково влиял на оба варианта.
+    """
+    plain, encrypted = [], []
+    for plain_args, encrypted_args in pairs:
+        plain.append(elapsed(func, *plain_args))
+        encrypted.append(elapsed(func, *encrypted_args))
+    return statistics.median(plain), statistics.median(encrypted)
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет накладные расходы расшифровки номеров карт и счетов '
+        'при чтении списка и отдельной выплаты. Создаёт тестовые выплаты '
+        'в текущей БД и удаляет их после замера'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=1000,
+            help='Сколько выплат создать для замера',
+        )
+        parser.add_argument(
+            '--page-size', type=int, default=100,
+            help='Размер страницы списка',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=200,
+            help='Количество повторов каждого замера',
+        )
+        parser.add_argument(
+            '--budget', type=float, default=15,
+            help='Допустимые накладные расходы, процентов',
+        )
+
+    def handle(self, *args, **options):
+        items = [
+            {
+                'method': PaymentMethodChoice.CARD_TRANSFER,
+                'amount': Decimal('100.00'),
+                'currency': CurrencyChoice.RUB,
+                'bank_name': 'Тинькофф',
+                'card_number': '2201221554561246',
+                'phone': '+79856584565',
+            }
+            for _ in range(options['rows'])
+        ]
+        created = [payout.payout_uid for payout in bulk_create_payouts(items)]
+        try:
+            results = {
+                'list': self.measure_list(created, options),
+                'retrieve': self.measure_retrieve(created, options),
+            }
+        finally:
+            Payout.objects.filter(payout_uid__in=created).delete()
+            PayoutOutbox.objects.filter(payout_uid__in=created).delete()
+        self.stdout.write(
+            f'{"query":<10} {"plain ms":>10} {"encrypted ms":>13} '
+            f'{"overhead":>9}'
+        )
+        exceeded = False
+        for name, (plain, encrypted) in results.items():
+            overhead = (encrypted - plain) / plain * 100
+            exceeded = exceeded or overhead > options['budget']
+            self.stdout.write(
+                f'{name:<10} {plain:>10.3f} {encrypted:>13.3f} '
+                f'{overhead:>8.1f}%'
+            )
+        if exceeded:
+            self.stdout.write(self.style.WARNING(
+                f'Накладные расходы превышают бюджет {options["budget"]}%'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Накладные расходы в пределах бюджета {options["budget"]}%'
+            ))
+
+    def measure_list(self, created, options):
+        """
+        Страница быстрого чтения: выборка строк и форматирование.
+
+        Без шифрования форматируются заранее расшифрованные строки,
+        поэтому разница — стоимость расшифровки при выводе.
+        """
+        queryset = payout_values(
+            Payout.objects.filter(payout_uid__in=created)
+        )[:options['page_size']]
+        fetch = median(options['repeat'], lambda: list(queryset))
+        rows = list(queryset)
+        plain_rows = [
+            {
+                **row,
+                **{field: reveal(row[field]) for field in SECRET_FIELDS},
+            }
+            for row in rows
+        ]
+        plain, encrypted = compare(
+            [((plain_rows,), (rows,))] * options['repeat'], format_dicts
+        )
+        return fetch + plain, fetch + encrypted
+
+    def measure_retrieve(self, created, options):
+        """
+        Чтение одной выплаты моделью и PayoutReadSerializer.
+
+        Каждая выплата сериализуется один раз: у заранее прочитанных
+        экземпляров без шифрования номера уже расшифрованы.
+        """
+        payout_uid = created[0]
+        fetch = median(
+            options['repeat'], lambda: Payout.objects.get(pk=payout_uid)
+        )
+        plain_payouts = [
+            Payout.objects.get(pk=payout_uid)
+            for _ in range(options['repeat'])
+        ]
+        for payout in plain_payouts:
+            for field in SECRET_FIELDS:
+                getattr(payout, field)
+        payouts = [
+            Payout.objects.get(pk=payout_uid)
+            for _ in range(options['repeat'])
+        ]
+        plain, encrypted = compare(
+            [
+                ((plain_payout,), (payout,))
+                for plain_payout, payout in zip(plain_payouts, payouts)
+            ],
+            lambda payout: PayoutReadSerializer(payout).data,
+        )
+        return fetch + plain, fetch + encrypted
@@ -0,0 +1,89 @@
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.renderers import JSONRenderer
+
+from api.formatters import PAYOUT_VALUE_KEYS
+from api.serializers import PayoutFastReadSerializer, PayoutReadSerializer
+from payouts.models import (
+    CurrencyChoice,
+    Payout,
+    PaymentMethodChoice,
+    StatusChoice
+)
+
+
+def make_rows(size):
+    now = timezone.now()
+    return [
+        {
+            'payout_uid': uuid.uuid4(),
+            'amount': Decimal('1045.50'),
+            'method': PaymentMethodChoice.CARD_TRANSFER.value,
+            'currency': CurrencyChoice.RUB.value,
+            'status': StatusChoice.PENDING.value,
+            'bank_name': 'Тинькофф',
+            'bank_bik': '044525974',
+            'card_number': '2201221554561246',
+            'account_number': '',
+            'phone': PhoneNumber.from_string('+79856584565'),
+            'description': 'Оплата обучения',
+            'created_at': now,
+            'updated_at': now,
+        }
+        for _ in range(size)
+    ]
+
+
+def measure(serializer, data, repeat):
+    renderer = JSONRenderer()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        renderer.render(serializer(data, many=True).data)
+    return time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает скорость PayoutReadSerializer и быстрого '
+        'сериализатора чтения для разных размеров страницы'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='10,100,1000',
+            help='Размеры страниц через запятую',
+        )
+        parser.add_argument(
+            '--rows', type=int, default=100000,
+            help='Сколько строк сериализовать для каждого размера',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{"page":>6} {"drf rows/s":>12} {"fast rows/s":>12} '
+            f'{"speedup":>8}'
+        )
+        for size in map(int, options['sizes'].split(',')):
+            instances = [Payout(**row) for row in make_rows(size)]
+            rows = [
+                {
+                    key: (
+                        str(getattr(instance, field)) if key != field
+                        else getattr(instance, field)
+                    )
+                    for field, key in PAYOUT_VALUE_KEYS.items()
+                }
+                for instance in instances
+            ]
+            repeat = max(options['rows'] // size, 1)
+            total = repeat * size
+            drf = total / measure(PayoutReadSerializer, instances, repeat)
+            fast = total / measure(PayoutFastReadSerializer, rows, repeat)
+            self.stdout.write(
+                f'{size:>6} {drf:>12.0f} {fast:>12.0f} {fast / drf:>7.1f}x'
+            )
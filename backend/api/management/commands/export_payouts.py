@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from api.export import EXPORT_FORMATS
+from api.filters import filter_payouts
+from payouts.models import Payout
+
+
+class Command(BaseCommand):
+    help = 'Выгружает выплаты в CSV или NDJSON для сверки'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=EXPORT_FORMATS, default='csv',
+            help='Формат выгрузки',
+        )
+        parser.add_argument(
+            '--output', default=None,
+            help='Путь к файлу, по умолчанию stdout',
+        )
+        parser.add_argument('--status', help='Статусы через запятую')
+        parser.add_argument(
+            '--created-after', help='Начало окна по дате создания'
+        )
+        parser.add_argument(
+            '--created-before', help='Конец окна по дате создания'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=None,
+            help='Размер чанка серверного курсора',
+        )
+
+    def handle(self, *args, **options):
+        params = {
+            'status': options['status'],
+            'created_after': options['created_after'],
+            'created_before': options['created_before'],
+        }
+        try:
+            queryset = filter_payouts(Payout.objects.all(), params)
+        except ValidationError as exc:
+            raise CommandError(exc.detail)
+        _, iterator = EXPORT_FORMATS[options['format']]
+        chunks = iterator(queryset, options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(
+            options['output'], 'w', encoding='utf-8', newline=''
+        ) as output:
+            output.writelines(chunks)
@@ -0,0 +1,167 @@
+import base64
+import json
+import uuid
+from collections import OrderedDict
+
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    Оценивает количество строк без COUNT(*).
+
+    Для запроса без фильтров используется pg_class.reltuples,
+    для запроса с фильтрами — оценка планировщика из EXPLAIN.
+    """
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            return max(row[0], 0) if row else 0
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]['Plan']['Plan Rows']
+
+
+class PayoutPagination(LimitOffsetPagination):
+    """
+    Пагинация списка выплат.
+
+    Без параметра cursor работает как LimitOffsetPagination.
+    С параметром cursor (пустым для первой страницы) включается keyset
+    пагинация по (created_at, payout_uid): каждая страница читается
+    диапазоном по составному индексу за постоянное время, а общее
+    количество считается только по запросу count=exact|estimated.
+    """
+
+    max_limit = 1000
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = ('-created_at', '-payout_uid')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.count = self.get_keyset_count(queryset, request)
+        position = self.decode_cursor(request)
+        queryset = queryset.order_by(*self.ordering)
+        reverse = False
+        if position is not None:
+            created_at, payout_uid, reverse = position
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at)
+                    | Q(created_at=created_at, payout_uid__gt=payout_uid),
+                    created_at__gte=created_at,
+                ).reverse()
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at)
+                    | Q(created_at=created_at, payout_uid__lt=payout_uid),
+                    created_at__lte=created_at,
+                )
+        page = list(queryset[:self.limit + 1])
+        has_more = len(page) > self.limit
+        page = page[:self.limit]
+        if reverse:
+            page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page = page
+        return page
+
+    def get_keyset_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == 'exact':
+            return queryset.count()
+        if mode == 'estimated':
+            return estimate_count(queryset)
+        return None
+
+    def encode_cursor(self, payout, reverse):
+        if not isinstance(payout, dict):
+            payout = {
+                'created_at': payout.created_at,
+                'payout_uid': payout.payout_uid,
+            }
+        position = [
+            payout['created_at'].isoformat(), str(payout['payout_uid'])
+        ]
+        if reverse:
+            position.append(1)
+        token = base64.urlsafe_b64encode(json.dumps(position).encode())
+        return token.decode()
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(token.encode()))
+        except ValueError:
+            position = None
+        if (
+            not isinstance(position, list)
+            or len(position) not in (2, 3)
+            or not all(isinstance(value, str) for value in position[:2])
+        ):
+            raise NotFound('Некорректный курсор')
+        try:
+            created_at = parse_datetime(position[0])
+            payout_uid = uuid.UUID(position[1])
+        except ValueError:
+            created_at = None
+        reverse = len(position) > 2
+        if created_at is None:
+            raise NotFound('Некорректный курсор')
+        return created_at, payout_uid, reverse
+
+    def get_keyset_link(self, payout, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(payout, reverse)
+        )
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.get_keyset_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page:
+            return None
+        return self.get_keyset_link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        response = OrderedDict()
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.get_next_link()
+        response['previous'] = self.get_previous_link()
+        response['results'] = data
+        return Response(response)
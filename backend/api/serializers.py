@@ -1,6 +1,32 @@
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 
-from payouts.models import PaymentMethodChoice, Payout
+from payouts.models import PaymentMethodChoice, Payout, StatusChoice
+from payouts.services import bulk_create_payouts
+from payouts.stats import record_method_change
+from payouts.transitions import (
+    bulk_transition,
+    bulk_transition_matching,
+    can_transition,
+    transition_payout
+)
+from payouts.validators import (
+    REQUISITE_FIELDS,
+    validate_requisites,
+    validation_fingerprint
+)
+from .exceptions import PayoutConflict
+from .filters import PAYOUT_FILTERS, filter_payouts
+from .formatters import format_dicts
+
+
+# Статусы, в которые оператор может перевести заявки массово
+BULK_TARGETS = (
+    StatusChoice.APPROVED,
+    StatusChoice.REJECTED,
+    StatusChoice.CANCELLED,
+)
 
 
 class PayoutReadSerializer(serializers.ModelSerializer):
@@ -25,6 +51,27 @@ class PayoutReadSerializer(serializers.ModelSerializer):
         )
 
 
+class PayoutFastReadSerializer:
+    """
+    Быстрый сериализатор чтения выплат из строк .values().
+
+    Даёт те же данные, что PayoutReadSerializer, но вместо объектов
+    полей DRF применяет заранее подготовленные форматтеры.
+    """
+
+    fields = PayoutReadSerializer.Meta.fields
+
+    def __init__(self, instance=None, many=False, **kwargs):
+        self.instance = instance
+        self.many = many
+
+    @property
+    def data(self):
+        if self.many:
+            return format_dicts(self.instance, self.fields)
+        return format_dicts([self.instance], self.fields)[0]
+
+
 class PayoutCreateSerializer(serializers.ModelSerializer):
     """Сериализатор для создания выплат."""
 
@@ -49,32 +96,70 @@ class PayoutCreateSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ('payout_uid',)
 
+    def create(self, validated_data):
+        # Заявка и сообщение outbox из сигнала пишутся в одной транзакции
+        with transaction.atomic():
+            return super().create(validated_data)
+
     def validate(self, attrs):
-        method = attrs.get('method')
-        card = attrs.get('card_number')
-        account = attrs.get('account_number')
-        if method == "card":
-            if not card:
-                raise serializers.ValidationError({
-                    "card_number": "Для выплаты на карту требуется card_number"
-                })
-            if not card.isdigit() or len(card) != 16:
-                raise serializers.ValidationError(
-                    {"card_number": "Номер карты должен содержать 16 цифр"}
+        requisites = {
+            field: attrs.get(field) or '' for field in REQUISITE_FIELDS
+        }
+        errors = validate_requisites(**requisites)
+        if errors:
+            raise serializers.ValidationError(errors)
+        attrs['validation_fingerprint'] = validation_fingerprint(
+            **requisites
+        )
+        return attrs
+
+
+class PayoutBulkCreateSerializer(serializers.ListSerializer):
+    """
+    Сериализатор пакетного создания выплат.
+
+    Все элементы проверяются одним экземпляром PayoutCreateSerializer,
+    ошибки собираются по индексам и не прерывают обработку пакета.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('child', PayoutCreateSerializer())
+        kwargs.setdefault('max_length', settings.PAYOUT_BULK_MAX_ITEMS)
+        kwargs.setdefault('allow_empty', False)
+        super().__init__(*args, **kwargs)
+        self.valid_indexes = []
+        self.item_errors = []
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError(
+                {"detail": "Ожидается список заявок"}
+            )
+        if not data:
+            raise serializers.ValidationError(
+                {"detail": "Список заявок не может быть пустым"}
+            )
+        if len(data) > self.max_length:
+            raise serializers.ValidationError({
+                "detail": (
+                    f"Превышено максимальное количество заявок "
+                    f"в пакете ({self.max_length})"
                 )
-        if method == "bank":
-            if not account:
-                raise serializers.ValidationError({
-                    "account_number": (
-                        "Для выплаты на банковский счёт "
-                        "требуется account_number"
-                    )
-                })
-            if not account.isdigit() or len(account) != 20:
-                raise serializers.ValidationError(
-                    {"account_number": "Номер счёта должен содержать 20 цифр"}
+            })
+        validated = []
+        for index, item in enumerate(data):
+            try:
+                validated.append(self.child.run_validation(item))
+            except serializers.ValidationError as exc:
+                self.item_errors.append(
+                    {"index": index, "errors": exc.detail}
                 )
-        return attrs
+            else:
+                self.valid_indexes.append(index)
+        return validated
+
+    def create(self, validated_data):
+        return bulk_create_payouts(validated_data)
 
 
 class PayoutUpdateSerializer(serializers.ModelSerializer):
@@ -99,43 +184,113 @@ class PayoutUpdateSerializer(serializers.ModelSerializer):
             'description',
         )
 
+    def validate_status(self, value):
+        if self.instance is None or value == self.instance.status:
+            return value
+        if not can_transition(self.instance.status, value):
+            raise serializers.ValidationError(
+                f"Недопустимый переход статуса: "
+                f"{self.instance.status} -> {value}"
+            )
+        return value
+
+    def update(self, instance, validated_data):
+        """
+        Обновляет поля заявки и применяет переход статуса.
+
+        Статус меняется условным UPDATE относительно прочитанного
+        значения, поэтому параллельное изменение даёт 409, а не
+        потерянное обновление.
+        """
+        target = validated_data.pop('status', instance.status)
+        with transaction.atomic():
+            if 'method' in validated_data:
+                # Итоги переносятся по статусу и способу заблокированной
+                # строки: прочитанный ранее статус мог смениться воркером
+                locked = Payout.objects.select_for_update().values(
+                    'status', 'method'
+                ).get(pk=instance.pk)
+            if validated_data:
+                for attr, value in validated_data.items():
+                    setattr(instance, attr, value)
+                instance.save(update_fields=[*validated_data, 'updated_at'])
+            if 'method' in validated_data:
+                record_method_change(
+                    instance, locked['method'], status=locked['status']
+                )
+            if target != instance.status:
+                if not transition_payout(
+                    instance.payout_uid, target, sources=[instance.status]
+                ):
+                    raise PayoutConflict()
+                instance.refresh_from_db(fields=['status', 'updated_at'])
+        return instance
+
     def validate(self, attrs):
-        """Валидатор для проверки полей в зависимости от метода выплаты."""
+        """Проверяет реквизиты с учётом текущих значений заявки."""
         if self.instance is None:
             raise serializers.ValidationError({"detail": "Заявка не найдена"})
-        method = attrs.get("method") or getattr(self.instance, "method", None)
-        card = attrs.get("card_number") or getattr(
-            self.instance, "card_number", None
-        )
-        account = attrs.get("account_number") or getattr(
-            self.instance, "account_number", None
+        if not attrs.keys() & set(REQUISITE_FIELDS):
+            return attrs
+        requisites = {
+            field: attrs.get(field, getattr(self.instance, field)) or ''
+            for field in REQUISITE_FIELDS
+        }
+        errors = validate_requisites(**requisites)
+        if errors:
+            raise serializers.ValidationError(errors)
+        attrs['validation_fingerprint'] = validation_fingerprint(
+            **requisites
         )
-        if not method:
+        return attrs
+
+
+class PayoutBulkTransitionSerializer(serializers.Serializer):
+    """
+    Сериализатор массовой смены статуса выплат.
+
+    Заявки задаются списком payout_uids или фильтром с теми же
+    параметрами, что у списка выплат. Пустой фильтр не допускается.
+    """
+
+    status = serializers.ChoiceField(
+        choices=[(str(value), value.label) for value in BULK_TARGETS],
+        help_text="Новый статус заявок",
+    )
+    payout_uids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        allow_empty=False,
+        max_length=settings.PAYOUT_BULK_MAX_ITEMS,
+    )
+    filter = serializers.DictField(
+        child=serializers.CharField(), required=False, allow_empty=False
+    )
+
+    def validate_filter(self, value):
+        unknown = value.keys() - set(PAYOUT_FILTERS)
+        if unknown:
             raise serializers.ValidationError(
-                {"method": "Выберите допустимый способ выплаты"}
+                f"Неизвестные параметры: {', '.join(sorted(unknown))}"
             )
+        try:
+            filter_payouts(Payout.objects.none(), value)
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError(exc.detail)
+        return value
 
-        if method == "card":
-            if "card_number" in attrs and not attrs["card_number"]:
-                raise serializers.ValidationError(
-                    {"card_number": "Номер карты не может быть пустым"}
-                )
-        if not card:
+    def validate(self, attrs):
+        if ('payout_uids' in attrs) == ('filter' in attrs):
             raise serializers.ValidationError(
-                {"card_number": "Для выплаты на карту требуется номер карты"}
+                {"detail": "Укажите либо payout_uids, либо filter"}
             )
-        if method == "bank":
-            if "account_number" in attrs and not attrs["account_number"]:
-                raise serializers.ValidationError(
-                    {"account_number": "Номер счёта не может быть пустым"}
-                )
-            if not account:
-                raise serializers.ValidationError(
-                    {
-                        "account_number": (
-                            "Для выплаты на счёт "
-                            "требуется номер счёта"
-                        )
-                    }
-                )
         return attrs
+
+    def save(self):
+        data = self.validated_data
+        if 'payout_uids' in data:
+            return bulk_transition(data['payout_uids'], data['status'])
+        return bulk_transition_matching(
+            filter_payouts(Payout.objects.all(), data['filter']),
+            data['status'],
+        )
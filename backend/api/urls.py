@@ -1,7 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import PayoutViewSet
+from .views import MetricsView, PayoutViewSet, payout_status_events
 
 
 app_name = 'api'
@@ -11,5 +11,11 @@ router = DefaultRouter()
 router.register(r'payouts', PayoutViewSet, basename='payouts')
 
 urlpatterns = [
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path(
+        'payouts/events/',
+        payout_status_events,
+        name='payouts-events'
+    ),
     path('', include(router.urls)),
 ]
@@ -1,20 +1,330 @@
-from rest_framework import viewsets
+import uuid
 
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    JsonResponse,
+    StreamingHttpResponse
+)
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .events import stream_statuses
+from .export import EXPORT_FORMATS
+from .filters import PayoutFilterBackend, parse_currency, stats_params
+from .formatters import payout_values
+from .pagination import PayoutPagination
+from .parsers import NDJSONParser
 from .serializers import (
+    PayoutBulkCreateSerializer,
+    PayoutBulkTransitionSerializer,
+    PayoutFastReadSerializer,
     PayoutReadSerializer,
     PayoutCreateSerializer,
     PayoutUpdateSerializer
 )
-from payouts.models import Payout
+from payouts import metrics
+from payouts.idempotency import (
+    IdempotencyKeyReused,
+    get_stored_response,
+    request_hash,
+    store_response
+)
+from payouts.constants import MAX_IDEMPOTENCY_KEY
+from payouts.fx import normalized_total
+from payouts.models import Payout, PayoutArchive
+from payouts.read_cache import (
+    get_payout,
+    invalidate_payouts,
+    set_payout
+)
+from payouts.stats import query_stats
 
 
 class PayoutViewSet(viewsets.ModelViewSet):
     queryset = Payout.objects.all()
     http_method_names = ['get', 'post', 'patch', 'delete']
+    pagination_class = PayoutPagination
+    filter_backends = [PayoutFilterBackend]
+    archived = False
+
+    @property
+    def fast_read(self):
+        # Схема OpenAPI строится по PayoutReadSerializer и моделям
+        return (
+            settings.PAYOUT_FAST_READ
+            and self.action in ('list', 'retrieve')
+            and not getattr(self, 'swagger_fake_view', False)
+        )
+
+    def get_queryset(self):
+        if self.archived:
+            queryset = PayoutArchive.objects.all()
+        else:
+            queryset = super().get_queryset()
+        if self.fast_read:
+            return payout_values(queryset)
+        return queryset
+
+    def create(self, request, *args, **kwargs):
+        """
+        Создание выплаты с поддержкой заголовка Idempotency-Key.
+
+        Повтор запроса с тем же ключом возвращает сохранённый ответ
+        без повторной валидации, записи в БД и постановки задачи.
+        """
+        key = request.headers.get('Idempotency-Key')
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > MAX_IDEMPOTENCY_KEY:
+            return Response(
+                {"Idempotency-Key": (
+                    f"Ключ не может быть длиннее "
+                    f"{MAX_IDEMPOTENCY_KEY} символов"
+                )},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        data_hash = request_hash(request.data)
+        try:
+            return self.replay(key, data_hash) or self.create_once(
+                request, key, data_hash, *args, **kwargs
+            )
+        except IdempotencyKeyReused:
+            return Response(
+                {"Idempotency-Key": (
+                    "Ключ уже использован для запроса с другими данными"
+                )},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+    def replay(self, key, data_hash):
+        stored = get_stored_response(key, data_hash)
+        if stored is None:
+            return None
+        status_code, body = stored
+        return Response(
+            body, status=status_code, headers={'Idempotent-Replayed': 'true'}
+        )
+
+    def create_once(self, request, key, data_hash, *args, **kwargs):
+        try:
+            with transaction.atomic():
+                response = super().create(request, *args, **kwargs)
+                store_response(
+                    key, data_hash, response.status_code, response.data
+                )
+        except IntegrityError:
+            # Параллельный запрос с тем же ключом успел сохранить ответ
+            response = self.replay(key, data_hash)
+            if response is None:
+                raise
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            payout_uid = uuid.UUID(
+                kwargs[self.lookup_url_kwarg or self.lookup_field]
+            )
+        except ValueError:
+            payout_uid = None
+        if payout_uid is None or request.query_params:
+            return super().retrieve(request, *args, **kwargs)
+        data = get_payout(payout_uid)
+        if data is not None:
+            return Response(data)
+        response = super().retrieve(request, *args, **kwargs)
+        set_payout(payout_uid, response.data)
+        return response
+
+    def get_object(self):
+        """Для просмотра ищет выплату также в архиве."""
+        try:
+            return super().get_object()
+        except Http404:
+            if self.action != 'retrieve':
+                raise
+        self.archived = True
+        return super().get_object()
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate_payouts([serializer.instance.payout_uid])
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        invalidate_payouts([instance.payout_uid])
 
     def get_serializer_class(self):
         if self.action == 'create':
             return PayoutCreateSerializer
         if self.action == 'partial_update':
             return PayoutUpdateSerializer
+        if self.action == 'bulk':
+            return PayoutBulkCreateSerializer
+        if self.action == 'bulk_transition':
+            return PayoutBulkTransitionSerializer
         return PayoutReadSerializer
+
+    def get_serializer(self, *args, **kwargs):
+        """Список и просмотр выплаты форматируют строки .values()."""
+        if self.fast_read:
+            return PayoutFastReadSerializer(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='bulk',
+        parser_classes=[JSONParser, NDJSONParser],
+    )
+    def bulk(self, request):
+        """Пакетное создание выплат из JSON-массива или NDJSON."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        payouts = serializer.save() if serializer.validated_data else []
+        created = [
+            {"index": index, "payout_uid": str(payout.payout_uid)}
+            for index, payout in zip(serializer.valid_indexes, payouts)
+        ]
+        return Response(
+            {"created": created, "errors": serializer.item_errors},
+            status=(
+                status.HTTP_201_CREATED if created
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk-transition')
+    def bulk_transition(self, request):
+        """
+        Массовая смена статуса выплат по списку uid или фильтру.
+
+        Переход применяется пачками условных UPDATE, ответ содержит
+        результат по каждой затронутой заявке.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = serializer.save()
+        return Response(
+            {"status": serializer.validated_data['status'], **results}
+        )
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """Потоковая выгрузка выплат в CSV или NDJSON."""
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"export_format": "Допустимые форматы: csv, ndjson"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        content_type, iterator = EXPORT_FORMATS[export_format]
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            iterator(queryset), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="payouts.{export_format}"'
+        )
+        return response
+
+    @action(detail=False, methods=['get'], url_path='stats')
+    def stats(self, request):
+        """
+        Итоги по выплатам в разрезе дня, статуса, валюты и способа.
+
+        Читаются из дневных итогов PayoutDailyStat, а не из таблицы
+        заявок, поэтому время ответа не зависит от их числа.
+        """
+        rows = query_stats(**stats_params(request.query_params))
+        return Response({
+            "results": [
+                {
+                    name: value if name in ('day', 'count') or value is None
+                    else str(value)
+                    for name, value in row.items()
+                }
+                for row in rows
+            ]
+        })
+
+    @action(detail=False, methods=['get'], url_path='exposure')
+    def exposure(self, request):
+        """
+        Сумма отфильтрованных выплат в одной валюте.
+
+        Пересчёт по курсу на день создания выполняется в БД одним
+        агрегирующим запросом. Валюта задаётся параметром currency_to,
+        по умолчанию базовая.
+        """
+        target = parse_currency(
+            'currency_to',
+            request.query_params.get(
+                'currency_to', settings.PAYOUT_FX_BASE_CURRENCY
+            ),
+        )
+        queryset = self.filter_queryset(self.get_queryset())
+        amount, unconverted = normalized_total(queryset, target)
+        return Response({
+            "currency": target,
+            "amount": str(amount),
+            "unconverted_currencies": unconverted,
+        })
+
+
+class MetricsView(APIView):
+    """Метрики обработки выплат в текстовом формате Prometheus."""
+
+    def get(self, request):
+        return HttpResponse(
+            metrics.collect(),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+
+async def payout_status_events(request):
+    """
+    Подписка на смену статусов заявок через Server-Sent Events.
+
+    Заявки передаются параметром payout_uid (повторяемым или через
+    запятую). Предназначено для ASGI-сервера: ожидающий клиент держит
+    одно соединение без обращений к БД.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    raw_uids = [
+        value for param in request.GET.getlist('payout_uid')
+        for value in param.split(',') if value
+    ]
+    try:
+        payout_uids = list(dict.fromkeys(map(uuid.UUID, raw_uids)))
+    except ValueError:
+        return JsonResponse(
+            {"payout_uid": "Некорректный UUID заявки"}, status=400
+        )
+    if not payout_uids:
+        return JsonResponse(
+            {"payout_uid": "Укажите хотя бы одну заявку"}, status=400
+        )
+    if len(payout_uids) > settings.PAYOUT_EVENTS_MAX_SUBSCRIPTIONS:
+        return JsonResponse(
+            {
+                "payout_uid": (
+                    f"Не более {settings.PAYOUT_EVENTS_MAX_SUBSCRIPTIONS} "
+                    f"заявок в одной подписке"
+                )
+            },
+            status=400,
+        )
+    response = StreamingHttpResponse(
+        stream_statuses(payout_uids), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
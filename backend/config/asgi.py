@@ -13,4 +13,25 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from payouts.events import subscriptions  # noqa: E402
+
+
+async def lifespan(receive, send):
+    # Общее pub/sub-подключение для потоков статусов создаётся при старте
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            subscriptions.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await subscriptions.stop()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    return await django_application(scope, receive, send)
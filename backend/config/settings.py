@@ -9,8 +9,11 @@ https://docs.djangoproject.com/en/5.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
+import json
 import os
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
+from kombu import Queue
 from pathlib import Path
 
 
@@ -44,6 +47,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'drf_yasg',
     'api.apps.ApiConfig',
@@ -135,6 +139,34 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'collected_static'
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHE_BACKEND = os.getenv(
+    'CACHE_BACKEND', 'django.core.cache.backends.redis.RedisCache'
+)
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.getenv('CACHE_LOCATION', 'redis://redis:6379/1'),
+    },
+    # Кэш детальных ответов по выплатам. Живёт в отдельном Redis
+    # с maxmemory и allkeys-lru (см. docker-compose.yml): вытеснение
+    # не должно затрагивать брокер Celery и остальные ключи.
+    'payouts': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.getenv(
+            'PAYOUT_CACHE_LOCATION', 'redis://redis-cache:6379/0'
+        ),
+        'TIMEOUT': int(os.getenv('PAYOUT_CACHE_TTL', 30)),
+        'KEY_PREFIX': 'payout',
+    },
+}
+if CACHE_BACKEND.endswith('LocMemCache'):
+    CACHES['payouts']['OPTIONS'] = {
+        'MAX_ENTRIES': int(os.getenv('PAYOUT_CACHE_MAX_ENTRIES', 10000)),
+    }
+
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
@@ -151,5 +183,174 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # CELERY SETTINGS
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
+# Период обхода очередей; задачи обхода устаревают через тот же период
+PAYOUT_CLAIM_INTERVAL = float(os.getenv('PAYOUT_CLAIM_INTERVAL', 5))
+CELERY_BEAT_SCHEDULE = {
+    'claim-pending-payouts': {
+        'task': 'payouts.tasks.claim_pending_payouts_task',
+        'schedule': PAYOUT_CLAIM_INTERVAL,
+    },
+    'reap-stuck-payouts': {
+        'task': 'payouts.tasks.reap_stuck_payouts_task',
+        'schedule': float(os.getenv('PAYOUT_REAPER_INTERVAL', 10)),
+    },
+    'purge-idempotency-keys': {
+        'task': 'payouts.tasks.purge_idempotency_keys_task',
+        'schedule': 3600.0,
+    },
+    'archive-payouts': {
+        'task': 'payouts.tasks.archive_payouts_task',
+        'schedule': 3600.0,
+    },
+    'rebuild-payout-stats': {
+        'task': 'payouts.tasks.rebuild_payout_stats_task',
+        'schedule': float(os.getenv('PAYOUT_STATS_REBUILD_INTERVAL', 3600)),
+    },
+    'load-fx-rates': {
+        'task': 'payouts.tasks.load_fx_rates_task',
+        'schedule': 24 * 3600.0,
+    },
+    'maintain-status-event-partitions': {
+        'task': 'payouts.tasks.maintain_status_event_partitions_task',
+        'schedule': 24 * 3600.0,
+    },
+}
 
 PHONENUMBER_DEFAULT_REGION = 'RU'  # Default region for phone numbers
+
+# PAYOUTS SETTINGS
+PAYOUT_BULK_MAX_ITEMS = int(os.getenv('PAYOUT_BULK_MAX_ITEMS', 100000))
+PAYOUT_BULK_CHUNK_SIZE = int(os.getenv('PAYOUT_BULK_CHUNK_SIZE', 1000))
+PAYOUT_BULK_TRANSITION_CHUNK_SIZE = int(
+    os.getenv('PAYOUT_BULK_TRANSITION_CHUNK_SIZE', 1000)
+)
+PAYOUT_DISPATCH_CHUNK_SIZE = int(os.getenv('PAYOUT_DISPATCH_CHUNK_SIZE', 1000))
+PAYOUT_PROCESSOR_CONCURRENCY = int(
+    os.getenv('PAYOUT_PROCESSOR_CONCURRENCY', 1000)
+)
+PAYOUT_FAST_READ = os.getenv('PAYOUT_FAST_READ', 'True') == 'True'
+# Ключи AES-256 (32 байта в urlsafe base64, payouts.encryption.generate_key)
+# для номеров карт и счетов через запятую: первым шифруются новые
+# значения, остальные нужны для расшифровки старых.
+PAYOUT_ENCRYPTION_KEYS = [
+    key for key in os.getenv('PAYOUT_ENCRYPTION_KEYS', '').split(',') if key
+]
+# Ключ хэшей для поиска по номерам; при смене ключа хэши пересчитываются
+PAYOUT_BLIND_INDEX_KEY = os.getenv('PAYOUT_BLIND_INDEX_KEY', '')
+# Ключи не выводятся из SECRET_KEY вне DEBUG: его смена сделала бы
+# сохранённые номера нечитаемыми, а ключ по умолчанию известен всем
+if not DEBUG and not (PAYOUT_ENCRYPTION_KEYS and PAYOUT_BLIND_INDEX_KEY):
+    raise ImproperlyConfigured(
+        'Задайте PAYOUT_ENCRYPTION_KEYS и PAYOUT_BLIND_INDEX_KEY'
+    )
+PAYOUT_BLIND_INDEX_KEY = PAYOUT_BLIND_INDEX_KEY or SECRET_KEY
+# Ниже этой оценки планировщика админка считает строки точным COUNT(*)
+PAYOUT_ADMIN_EXACT_COUNT_LIMIT = int(
+    os.getenv('PAYOUT_ADMIN_EXACT_COUNT_LIMIT', 10000)
+)
+PAYOUT_CACHE_MAX_ENTRY_BYTES = int(
+    os.getenv('PAYOUT_CACHE_MAX_ENTRY_BYTES', 4096)
+)
+PAYOUT_EVENTS_REDIS_URL = os.getenv(
+    'PAYOUT_EVENTS_REDIS_URL',
+    os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
+)
+PAYOUT_EVENTS_HEARTBEAT = float(os.getenv('PAYOUT_EVENTS_HEARTBEAT', 15))
+PAYOUT_EVENTS_MAX_SUBSCRIPTIONS = int(
+    os.getenv('PAYOUT_EVENTS_MAX_SUBSCRIPTIONS', 1000)
+)
+PAYOUT_IDEMPOTENCY_RETENTION = int(
+    os.getenv('PAYOUT_IDEMPOTENCY_RETENTION', 24 * 60 * 60)
+)
+PAYOUT_IDEMPOTENCY_PURGE_BATCH_SIZE = int(
+    os.getenv('PAYOUT_IDEMPOTENCY_PURGE_BATCH_SIZE', 5000)
+)
+PAYOUT_STATUS_EVENT_PARTITIONS_AHEAD = int(
+    os.getenv('PAYOUT_STATUS_EVENT_PARTITIONS_AHEAD', 2)
+)
+PAYOUT_STATUS_EVENT_RETENTION_MONTHS = int(
+    os.getenv('PAYOUT_STATUS_EVENT_RETENTION_MONTHS', 12)
+)
+PAYOUT_THROTTLE_REDIS_URL = os.getenv(
+    'PAYOUT_THROTTLE_REDIS_URL',
+    os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
+)
+# Лимиты провайдеров по способу выплаты: rate — вызовов в секунду,
+# burst — ёмкость корзины, concurrency — одновременных вызовов.
+PAYOUT_PROVIDER_LIMITS = json.loads(
+    os.getenv('PAYOUT_PROVIDER_LIMITS', 'null')
+) or {
+    'bank': {'rate': 50, 'burst': 100, 'concurrency': 200},
+    'card': {'rate': 500, 'burst': 1000, 'concurrency': 2000},
+}
+PAYOUT_THROTTLE_MIN_DELAY = float(os.getenv('PAYOUT_THROTTLE_MIN_DELAY', 1))
+PAYOUT_VISIBILITY_TIMEOUT = int(os.getenv('PAYOUT_VISIBILITY_TIMEOUT', 300))
+PAYOUT_MAX_ATTEMPTS = int(os.getenv('PAYOUT_MAX_ATTEMPTS', 5))
+PAYOUT_REAPER_BATCH_SIZE = int(os.getenv('PAYOUT_REAPER_BATCH_SIZE', 1000))
+PAYOUT_STUCK_AFTER = int(os.getenv('PAYOUT_STUCK_AFTER', 600))
+PAYOUT_ARCHIVE_AFTER_DAYS = int(os.getenv('PAYOUT_ARCHIVE_AFTER_DAYS', 90))
+PAYOUT_ARCHIVE_BATCH_SIZE = int(os.getenv('PAYOUT_ARCHIVE_BATCH_SIZE', 5000))
+PAYOUT_ARCHIVE_MAX_BATCHES = int(os.getenv('PAYOUT_ARCHIVE_MAX_BATCHES', 100))
+PAYOUT_STATS_REBUILD_DAYS = int(os.getenv('PAYOUT_STATS_REBUILD_DAYS', 3))
+# Курсы валют: суммы приводятся к базовой валюте по последнему снимку
+# не позже дня заявки. Файл курсов — CSV со столбцами day, currency,
+# rate; без файла загружаются курсы-заглушки PAYOUT_FX_STUB_RATES.
+PAYOUT_FX_BASE_CURRENCY = os.getenv('PAYOUT_FX_BASE_CURRENCY', 'RUB')
+PAYOUT_FX_RATES_FILE = os.getenv('PAYOUT_FX_RATES_FILE', '')
+PAYOUT_FX_STUB_RATES = json.loads(
+    os.getenv('PAYOUT_FX_STUB_RATES', 'null')
+) or {'USD': '90.00', 'EUR': '98.00', 'CNY': '12.50'}
+PAYOUT_FX_CACHE_TTL = int(os.getenv('PAYOUT_FX_CACHE_TTL', 300))
+PAYOUT_EXPORT_CHUNK_SIZE = int(os.getenv('PAYOUT_EXPORT_CHUNK_SIZE', 2000))
+PAYOUT_OUTBOX_BATCH_SIZE = int(os.getenv('PAYOUT_OUTBOX_BATCH_SIZE', 1000))
+PAYOUT_OUTBOX_POLL_INTERVAL = float(
+    os.getenv('PAYOUT_OUTBOX_POLL_INTERVAL', 0.5)
+)
+PAYOUT_CLAIM_BATCH_SIZE = int(os.getenv('PAYOUT_CLAIM_BATCH_SIZE', 1000))
+PAYOUT_CLAIM_MAX_BATCHES = int(os.getenv('PAYOUT_CLAIM_MAX_BATCHES', 10))
+PAYOUT_PROVIDER_CLASS = os.getenv(
+    'PAYOUT_PROVIDER_CLASS', 'payouts.providers.FakeProvider'
+)
+PAYOUT_PROVIDER_OPTIONS = {}
+PAYOUT_FAKE_PROVIDER_LATENCY = float(
+    os.getenv('PAYOUT_FAKE_PROVIDER_LATENCY', 5)
+)
+PAYOUT_FAKE_PROVIDER_FAILURE_RATE = float(
+    os.getenv('PAYOUT_FAKE_PROVIDER_FAILURE_RATE', 0.2)
+)
+# Повторы при временных ошибках провайдера. Максимальная задержка
+# должна быть меньше PAYOUT_VISIBILITY_TIMEOUT, иначе заявку заберёт
+# reaper.
+PAYOUT_MAX_RETRIES = int(os.getenv('PAYOUT_MAX_RETRIES', 5))
+PAYOUT_RETRY_BACKOFF_BASE = float(os.getenv('PAYOUT_RETRY_BACKOFF_BASE', 2))
+PAYOUT_RETRY_BACKOFF_MAX = float(os.getenv('PAYOUT_RETRY_BACKOFF_MAX', 120))
+
+# PAYOUT ROUTING
+# Правила проверяются по порядку, заявка уходит в очередь первого
+# подходящего. Ключи правила: queue, method, currency (списки),
+# amount_min, amount_max (строки с суммой).
+PAYOUT_DEFAULT_QUEUE = os.getenv('PAYOUT_DEFAULT_QUEUE', 'payouts')
+PAYOUT_ROUTES = json.loads(os.getenv('PAYOUT_ROUTES', 'null')) or [
+    {'queue': 'payouts.large', 'amount_min': '1000000'},
+    {'queue': 'payouts.bank', 'method': ['bank']},
+    {'queue': 'payouts.card', 'method': ['card']},
+]
+# Пороги суммы -> приоритет задачи (для Redis 0 — наивысший)
+PAYOUT_PRIORITY_BANDS = json.loads(
+    os.getenv('PAYOUT_PRIORITY_BANDS', 'null')
+) or [['100000', 0], ['10000', 3]]
+PAYOUT_DEFAULT_PRIORITY = int(os.getenv('PAYOUT_DEFAULT_PRIORITY', 6))
+
+CELERY_TASK_DEFAULT_QUEUE = 'celery'
+CELERY_TASK_QUEUES = [
+    Queue(name) for name in dict.fromkeys([
+        CELERY_TASK_DEFAULT_QUEUE,
+        PAYOUT_DEFAULT_QUEUE,
+        *(rule['queue'] for rule in PAYOUT_ROUTES),
+    ])
+]
+CELERY_TASK_ROUTES = ['payouts.routing.route_task']
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'queue_order_strategy': 'priority',
+}
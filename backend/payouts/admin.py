@@ -1,8 +1,103 @@
+import uuid
+
+import phonenumbers
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.views.main import SEARCH_VAR, ChangeList
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.http import HttpResponseRedirect
+from django.utils import timezone
+from django.utils.functional import cached_property
 
+from api.pagination import estimate_count
+from .encryption import blind_index
 from .models import Payout
 
 
+# Параметр Django all включает вывод без пагинации, поэтому метка своя
+ALL_DATES_VAR = 'all_dates'
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор с оценкой количества строк вместо COUNT(*).
+
+    Точный подсчёт выполняется, только если оценка планировщика меньше
+    PAYOUT_ADMIN_EXACT_COUNT_LIMIT.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate < settings.PAYOUT_ADMIN_EXACT_COUNT_LIMIT:
+            return super().count
+        return estimate
+
+
+def normalize_phone(value):
+    try:
+        number = phonenumbers.parse(value, settings.PHONENUMBER_DEFAULT_REGION)
+    except phonenumbers.NumberParseException:
+        return None
+    return phonenumbers.format_number(
+        number, phonenumbers.PhoneNumberFormat.E164
+    )
+
+
+def phone_prefix(value):
+    digits = ''.join(char for char in value if char.isdigit())
+    if not digits:
+        return None
+    if digits[0] == '8':
+        digits = f'7{digits[1:]}'
+    return f'+{digits}'
+
+
+def search_lookups(term):
+    """
+    Условие поиска заявок по строке из админки.
+
+    По умолчанию ищется точное совпадение uid, номера карты, счёта,
+    БИК или телефона и начало названия банка. Строка со звёздочкой
+    на конце ищется как префикс телефона или названия банка. Каждому
+    условию соответствует индекс модели Payout; номера карт и счетов
+    зашифрованы и ищутся по ключевому хэшу.
+    """
+    if term.endswith('*'):
+        prefix = term.rstrip('*')
+        if not prefix:
+            return None
+        lookups = Q(bank_name__istartswith=prefix)
+        if phone_prefix(prefix):
+            lookups |= Q(phone__startswith=phone_prefix(prefix))
+        return lookups
+    try:
+        return Q(payout_uid=uuid.UUID(term))
+    except ValueError:
+        pass
+    lookups = Q(bank_name__istartswith=term)
+    if term.isdigit():
+        lookups |= (
+            Q(card_number_hash=blind_index('card_number', term))
+            | Q(account_number_hash=blind_index('account_number', term))
+            | Q(bank_bik=term)
+        )
+    phone = normalize_phone(term)
+    if phone:
+        lookups |= Q(phone=phone)
+    return lookups
+
+
+class PayoutChangeList(ChangeList):
+    """Список заявок, не считающий ALL_DATES_VAR фильтром."""
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(ALL_DATES_VAR, None)
+        return lookup_params
+
+
 @admin.register(Payout)
 class PayoutAdmin(admin.ModelAdmin):
     list_display = (
@@ -13,7 +108,8 @@ class PayoutAdmin(admin.ModelAdmin):
         'created_at',
         'updated_at',
     )
-    list_filter = ('status', 'currency', 'created_at')
+    list_filter = ('status', 'currency')
+    date_hierarchy = 'created_at'
     search_fields = (
         'payout_uid',
         'bank_name',
@@ -22,9 +118,51 @@ class PayoutAdmin(admin.ModelAdmin):
         'account_number',
         'phone'
     )
+    search_help_text = (
+        'Точный поиск по uid, номеру карты, счёта, БИК или телефону '
+        'и по началу названия банка. Префикс телефона — '
+        'со звёздочкой на конце: +7985*'
+    )
     ordering = ('-created_at',)
     readonly_fields = (
         'payout_uid',
         'created_at',
         'updated_at',
     )
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        lookups = search_lookups(term)
+        if lookups is None:
+            return queryset.none(), False
+        return queryset.filter(lookups), False
+
+    def get_changelist(self, request, **kwargs):
+        return PayoutChangeList
+
+    def changelist_view(self, request, extra_context=None):
+        """
+        Без периода по created_at открывает список за текущий месяц.
+
+        Иерархия дат и выборка страницы тогда читают диапазон индекса
+        по created_at, а не всю таблицу. Адрес перенаправления содержит
+        ALL_DATES_VAR: метка сохраняется в ссылках фильтров, поэтому
+        «Все даты» и сброс фильтров открывают полный список. Поиск
+        читает свои индексы и выполняется по всем датам.
+        """
+        if request.method == 'GET' and not any(
+            param in (ALL_DATES_VAR, SEARCH_VAR)
+            or param.startswith('created_at__')
+            for param in request.GET
+        ):
+            today = timezone.localdate()
+            params = request.GET.copy()
+            params['created_at__year'] = today.year
+            params['created_at__month'] = today.month
+            params[ALL_DATES_VAR] = 1
+            return HttpResponseRedirect(f'{request.path}?{params.urlencode()}')
+        return super().changelist_view(request, extra_context)
@@ -0,0 +1,77 @@
+import logging
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import metrics
+from .models import TERMINAL_STATUSES, Payout, PayoutArchive
+from .partitions import create_partition, list_partitions, month_start
+
+
+logger = logging.getLogger(__name__)
+
+
+def archive_batch(cutoff, batch_size):
+    """
+    Переносит одну пачку завершённых выплат старше cutoff в архив.
+
+    Строки блокируются с SKIP LOCKED и переносятся одним запросом
+    DELETE ... RETURNING + INSERT, поэтому выплата в любой момент
+    находится ровно в одной из таблиц.
+    """
+    quote_name = connection.ops.quote_name
+    archive_table = PayoutArchive._meta.db_table
+    columns = ', '.join(
+        quote_name(field.column)
+        for field in Payout._meta.concrete_fields
+    )
+    with transaction.atomic():
+        rows = list(
+            Payout.objects.filter(
+                status__in=TERMINAL_STATUSES, created_at__lt=cutoff
+            )
+            .order_by('created_at')
+            .select_for_update(skip_locked=True)
+            .values_list('payout_uid', 'created_at')[:batch_size]
+        )
+        if not rows:
+            return 0
+        existing = list_partitions(archive_table)
+        months = {
+            month_start(created_at.astimezone(dt_timezone.utc).date())
+            for _, created_at in rows
+        }
+        for month in sorted(months - set(existing)):
+            create_partition(archive_table, month)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'WITH moved AS ('
+                f'DELETE FROM {quote_name(Payout._meta.db_table)} '
+                f'WHERE payout_uid = ANY(%s::uuid[]) RETURNING {columns}) '
+                f'INSERT INTO {quote_name(archive_table)} '
+                f'({columns}, archived_at) '
+                f'SELECT {columns}, %s FROM moved',
+                [[payout_uid for payout_uid, _ in rows], timezone.now()],
+            )
+            return cursor.rowcount
+
+
+def archive_payouts(older_than_days=None, batch_size=None, max_batches=None):
+    """Переносит завершённые выплаты старше older_than_days дней в архив."""
+    if older_than_days is None:
+        older_than_days = settings.PAYOUT_ARCHIVE_AFTER_DAYS
+    batch_size = batch_size or settings.PAYOUT_ARCHIVE_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(cutoff, batch_size)
+        total += moved
+        batches += 1
+        if moved < batch_size:
+            break
+    if total:
+        metrics.incr('payouts_archived_total', total)
+        logger.info(f"В архив перенесено {total} выплат")
+    return total
@@ -7,3 +7,9 @@ MAX_PHONE_NUMBER = 15
 MAX_PAYOUT_UID = 20
 MAX_DIGITS_AMOUNT = 15
 MAX_DECIMAL_PLACES = 2
+MAX_IDEMPOTENCY_KEY = 255
+MAX_VALIDATION_FINGERPRINT = 64
+MAX_DIGITS_STAT_AMOUNT = 20
+MAX_DIGITS_FX_RATE = 20
+FX_RATE_DECIMAL_PLACES = 8
+MAX_BLIND_INDEX = 64
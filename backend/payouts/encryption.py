@@ -0,0 +1,125 @@
+import base64
+import binascii
+import hashlib
+import os
+from functools import lru_cache
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.crypto import salted_hmac
+
+
+KEY_ID_SIZE = 4
+NONCE_SIZE = 12
+SEALED_FIELDS = ('card_number', 'account_number')
+
+
+class DecryptionError(ValueError):
+    """Шифротекст повреждён или зашифрован неизвестным ключом."""
+
+
+def generate_key():
+    """Новый ключ для PAYOUT_ENCRYPTION_KEYS."""
+    return base64.urlsafe_b64encode(
+        AESGCM.generate_key(bit_length=256)
+    ).decode()
+
+
+def default_key():
+    """Ключ из SECRET_KEY для DEBUG, где PAYOUT_ENCRYPTION_KEYS не задан."""
+    digest = hashlib.sha256(
+        f'payouts.encryption:{settings.SECRET_KEY}'.encode()
+    ).digest()
+    return base64.urlsafe_b64encode(digest).decode()
+
+
+@lru_cache(maxsize=None)
+def keyring():
+    """
+    Шифры по ключам PAYOUT_ENCRYPTION_KEYS и идентификатор основного.
+
+    Шифрование выполняется первым ключом, расшифровка — ключом,
+    идентификатор которого записан в начале шифротекста: новый ключ
+    добавляется в начало списка, старый остаётся до перешифровки данных.
+    Ключи читаются один раз за процесс, чтобы расшифровка строки списка
+    не обращалась к настройкам.
+    """
+    ring = {}
+    for key in settings.PAYOUT_ENCRYPTION_KEYS or [default_key()]:
+        raw = base64.urlsafe_b64decode(key)
+        ring[hashlib.sha256(raw).digest()[:KEY_ID_SIZE]] = AESGCM(raw)
+    return ring, next(iter(ring))
+
+
+@receiver(setting_changed)
+def reset_keyring(*, setting, **kwargs):
+    if setting in ('PAYOUT_ENCRYPTION_KEYS', 'SECRET_KEY'):
+        keyring.cache_clear()
+
+
+def encrypt(value):
+    """Шифрует строку AES-256-GCM: id ключа, nonce и шифротекст в base64."""
+    ring, key_id = keyring()
+    nonce = os.urandom(NONCE_SIZE)
+    data = ring[key_id].encrypt(nonce, value.encode(), None)
+    return binascii.b2a_base64(key_id + nonce + data, newline=False).decode()
+
+
+def decrypt(token):
+    try:
+        raw = binascii.a2b_base64(token)
+    except binascii.Error as error:
+        raise DecryptionError('Шифротекст повреждён') from error
+    cipher = keyring()[0].get(raw[:KEY_ID_SIZE])
+    if cipher is None:
+        raise DecryptionError('Шифротекст зашифрован неизвестным ключом')
+    nonce = raw[KEY_ID_SIZE:KEY_ID_SIZE + NONCE_SIZE]
+    try:
+        data = cipher.decrypt(nonce, raw[KEY_ID_SIZE + NONCE_SIZE:], None)
+    except InvalidTag as error:
+        raise DecryptionError('Шифротекст повреждён') from error
+    return data.decode()
+
+
+def blind_index(field, value):
+    """
+    Ключевой хэш значения поля для поиска по равенству.
+
+    Значение нельзя восстановить по хэшу без PAYOUT_BLIND_INDEX_KEY,
+    а соль по имени поля не даёт сопоставить одинаковые номера
+    в разных столбцах. Пустому значению соответствует пустая строка.
+    """
+    if not value:
+        return ''
+    return salted_hmac(
+        f'payouts.blind_index.{field}',
+        value,
+        secret=settings.PAYOUT_BLIND_INDEX_KEY,
+        algorithm='sha256',
+    ).hexdigest()
+
+
+def seal_body(body, transform=encrypt):
+    """
+    Шифрует номера карты и счёта в теле ответа по заявке.
+
+    Ответы хранятся в БД и Redis (идемпотентность, кэш чтения), поэтому
+    реквизиты в них не должны лежать открытым текстом, как и в таблице
+    выплат.
+    """
+    if not isinstance(body, dict):
+        return body
+    return {
+        name: transform(value)
+        if name in SEALED_FIELDS and isinstance(value, str) and value
+        else value
+        for name, value in body.items()
+    }
+
+
+def open_body(body):
+    """Расшифровывает тело ответа, сохранённое seal_body."""
+    return seal_body(body, transform=decrypt)
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+_client = None
+
+
+def status_channel(payout_uid):
+    return f'payouts:status:{payout_uid}'
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.PAYOUT_EVENTS_REDIS_URL)
+    return _client
+
+
+def get_async_client():
+    return aioredis.Redis.from_url(settings.PAYOUT_EVENTS_REDIS_URL)
+
+
+class StatusSubscriptions:
+    """
+    Подписки процесса на смену статусов заявок.
+
+    Все SSE-запросы процесса делят одно pub/sub-подключение к Redis,
+    сообщения из которого раскладываются по очередям asyncio.Queue
+    подписчиков. Канал подписан, пока на него подписана хотя бы одна
+    очередь. Подключение привязано к циклу событий, в котором создано.
+    """
+
+    def __init__(self):
+        self.loop = None
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is loop:
+            return
+        self.loop = loop
+        self.client = get_async_client()
+        self.pubsub = self.client.pubsub()
+        self.queues = defaultdict(set)
+        self.lock = asyncio.Lock()
+        self.listener = loop.create_task(self.listen())
+
+    async def stop(self):
+        if self.loop is None:
+            return
+        self.loop = None
+        self.listener.cancel()
+        await asyncio.gather(self.listener, return_exceptions=True)
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+    async def listen(self):
+        async with self.lock:
+            await self.pubsub.connect()
+        while True:
+            try:
+                message = await self.pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=settings.PAYOUT_EVENTS_HEARTBEAT,
+                )
+            except redis.RedisError as exc:
+                # PubSub переподключается и восстанавливает подписки сам
+                logger.warning(f"Ошибка подписки на статусы: {exc}")
+                await asyncio.sleep(1)
+                continue
+            if message is None:
+                continue
+            channel = message['channel']
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            for queue in self.queues.get(channel, ()):
+                queue.put_nowait(message['data'])
+
+    async def subscribe(self, channels):
+        """Подписывает новую очередь на каналы и возвращает её."""
+        self.start()
+        queue = asyncio.Queue()
+        async with self.lock:
+            new = [channel for channel in channels if not self.queues[channel]]
+            for channel in channels:
+                self.queues[channel].add(queue)
+            if new:
+                await self.pubsub.subscribe(*new)
+        return queue
+
+    async def unsubscribe(self, queue, channels):
+        async with self.lock:
+            unused = []
+            for channel in channels:
+                self.queues[channel].discard(queue)
+                if not self.queues[channel]:
+                    del self.queues[channel]
+                    unused.append(channel)
+            if unused:
+                await self.pubsub.unsubscribe(*unused)
+
+
+subscriptions = StatusSubscriptions()
+
+
+def publish_statuses(statuses, updated_at=None):
+    """
+    Публикует смену статусов заявок в Redis pub/sub.
+
+    Ошибка Redis не прерывает обработку: подписчики в этом случае
+    получат актуальный статус при переподключении.
+    """
+    if not statuses:
+        return
+    updated_at = (updated_at or timezone.now()).isoformat()
+    try:
+        pipeline = get_client().pipeline(transaction=False)
+        for payout_uid, status in statuses.items():
+            pipeline.publish(status_channel(payout_uid), json.dumps({
+                'payout_uid': str(payout_uid),
+                'status': str(status),
+                'updated_at': updated_at,
+            }))
+        pipeline.execute()
+    except redis.RedisError as exc:
+        logger.warning(f"Не удалось опубликовать смену статусов: {exc}")
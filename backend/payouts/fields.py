@@ -0,0 +1,154 @@
+from django.core.exceptions import FieldError
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+from .encryption import blind_index, decrypt, encrypt
+
+
+class Ciphertext(str):
+    """Зашифрованное значение поля в том виде, в каком оно хранится в БД."""
+
+
+def reveal(value):
+    """Расшифровывает значение, прочитанное из БД в обход модели."""
+    if isinstance(value, Ciphertext):
+        return decrypt(value)
+    return value
+
+
+class DecryptedAttribute(DeferredAttribute):
+    """
+    Атрибут зашифрованного поля модели.
+
+    Из БД в экземпляр попадает шифротекст; расшифровка выполняется при
+    первом чтении атрибута, результат запоминается в экземпляре.
+    __set__ делает дескриптор приоритетнее __dict__ экземпляра.
+    """
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if isinstance(value, Ciphertext):
+            value = decrypt(value)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+
+class EncryptedCharField(models.CharField):
+    """
+    Строковое поле, зашифрованное в БД (AES-256-GCM).
+
+    max_length ограничивает исходное значение, столбец имеет тип text.
+    Шифротекст недетерминирован, поэтому поиск по равенству выполняется
+    через парное поле BlindIndexField.
+    """
+
+    descriptor_class = DecryptedAttribute
+
+    def db_type(self, connection):
+        return 'text'
+
+    def get_lookup(self, lookup_name):
+        # Сравнение с шифротекстом молча ничего бы не находило
+        if lookup_name != 'isnull':
+            raise FieldError(
+                f'Поиск {lookup_name} по зашифрованному полю {self.name} '
+                f'не поддерживается, используйте его BlindIndexField'
+            )
+        return super().get_lookup(lookup_name)
+
+    def from_db_value(self, value, expression, connection):
+        if not value:
+            return value
+        return Ciphertext(value)
+
+    def pre_save(self, model_instance, add):
+        # Нерасшифрованное значение сохраняется без повторного шифрования
+        if self.attname in model_instance.__dict__:
+            return model_instance.__dict__[self.attname]
+        return super().pre_save(model_instance, add)
+
+    def get_prep_value(self, value):
+        if isinstance(value, Ciphertext):
+            return str(value)
+        value = super().get_prep_value(value)
+        if not value:
+            return value
+        return encrypt(value)
+
+
+class BlindIndexField(models.CharField):
+    """
+    Ключевой хэш поля source для поиска по равенству.
+
+    Вычисляется при сохранении модели, в том числе в bulk_create.
+    """
+
+    def __init__(self, source, *args, **kwargs):
+        self.source = source
+        kwargs.setdefault('max_length', 64)
+        kwargs.setdefault('blank', True)
+        kwargs.setdefault('default', '')
+        kwargs.setdefault('editable', False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        return name, path, [self.source, *args], kwargs
+
+    def pre_save(self, model_instance, add):
+        if self.source not in model_instance.__dict__:
+            # Поле source отложено и не сохраняется, хэш не меняется
+            return getattr(model_instance, self.attname)
+        raw = model_instance.__dict__[self.source]
+        if isinstance(raw, Ciphertext):
+            # Значение не менялось после чтения из БД, хэш актуален
+            return getattr(model_instance, self.attname)
+        value = blind_index(self.source, raw or '')
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class BlindIndexQuerySet(models.QuerySet):
+    """
+    QuerySet модели с BlindIndexField.
+
+    update и bulk_update не вызывают pre_save, поэтому хэши полей
+    source, изменяемых этими методами, пересчитываются здесь.
+    """
+
+    def blind_index_fields(self, names):
+        return [
+            field for field in self.model._meta.concrete_fields
+            if isinstance(field, BlindIndexField) and field.source in names
+        ]
+
+    def update(self, **kwargs):
+        for field in self.blind_index_fields(kwargs):
+            if field.attname in kwargs:
+                # Хэш передан явно, например из bulk_update
+                continue
+            value = kwargs[field.source]
+            if hasattr(value, 'resolve_expression'):
+                raise FieldError(
+                    f'Хэш поля {field.source} нельзя вычислить '
+                    f'для выражения в update()'
+                )
+            kwargs[field.attname] = blind_index(
+                field.source, reveal(value) or ''
+            )
+        return super().update(**kwargs)
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        hash_fields = self.blind_index_fields(fields)
+        if hash_fields:
+            objs = list(objs)
+            for obj in objs:
+                for field in hash_fields:
+                    field.pre_save(obj, add=False)
+            fields = [*fields, *(field.attname for field in hash_fields)]
+        return super().bulk_update(objs, fields, batch_size=batch_size)
@@ -0,0 +1,194 @@
+import csv
+import time
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import (
+    Case,
+    DecimalField,
+    F,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When
+)
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import CurrencyChoice, FxRate
+
+
+CENT = Decimal('0.01')
+
+
+class FxRateError(ValueError):
+    """Некорректная строка файла курсов."""
+
+
+def today():
+    return timezone.localdate(
+        timezone.now(), timezone.get_default_timezone()
+    )
+
+
+def parse_rate(day, currency, rate):
+    parsed_day = parse_date(str(day))
+    if parsed_day is None:
+        raise FxRateError(f'Некорректная дата курса: {day}')
+    if currency not in CurrencyChoice.values:
+        raise FxRateError(f'Неизвестная валюта: {currency}')
+    try:
+        parsed_rate = Decimal(str(rate))
+    except InvalidOperation:
+        raise FxRateError(f'Некорректный курс {currency}: {rate}')
+    if parsed_rate <= 0:
+        raise FxRateError(f'Курс {currency} должен быть положительным')
+    return FxRate(day=parsed_day, currency=currency, rate=parsed_rate)
+
+
+def read_rates_file(path):
+    """Читает курсы из CSV со столбцами day, currency, rate."""
+    with open(path, newline='', encoding='utf-8') as rates_file:
+        return [
+            parse_rate(row['day'], row['currency'], row['rate'])
+            for row in csv.DictReader(rates_file)
+        ]
+
+
+def stub_rates(day=None):
+    """Снимок курсов-заглушек PAYOUT_FX_STUB_RATES на день day."""
+    day = day or today()
+    return [
+        parse_rate(day, currency, rate)
+        for currency, rate in settings.PAYOUT_FX_STUB_RATES.items()
+    ]
+
+
+def load_rates(rates):
+    """Сохраняет снимки курсов, заменяя уже загруженные на те же дни."""
+    rates = list(rates)
+    FxRate.objects.bulk_create(
+        rates,
+        update_conflicts=True,
+        unique_fields=['currency', 'day'],
+        update_fields=['rate'],
+    )
+    rate_cache.cache_clear()
+    return len(rates)
+
+
+@lru_cache(maxsize=4096)
+def rate_cache(currency, day, base, epoch):
+    if currency == base:
+        return Decimal(1)
+    return (
+        FxRate.objects.filter(currency=currency, day__lte=day)
+        .order_by('-day')
+        .values_list('rate', flat=True)
+        .first()
+    )
+
+
+def get_rate(currency, day=None):
+    """
+    Курс валюты к базовой на день day или None, если снимков нет.
+
+    Результат кэшируется в процессе; запись устаревает не позже чем
+    через PAYOUT_FX_CACHE_TTL секунд, поэтому курс, загруженный другим
+    процессом, подхватывается без перезапуска.
+    """
+    return rate_cache(
+        str(currency),
+        day or today(),
+        settings.PAYOUT_FX_BASE_CURRENCY,
+        int(time.monotonic() // settings.PAYOUT_FX_CACHE_TTL),
+    )
+
+
+def convert(amount, currency, target=None, day=None):
+    """Пересчитывает сумму в валюту target или возвращает None."""
+    target = target or settings.PAYOUT_FX_BASE_CURRENCY
+    if currency == target:
+        return amount
+    rate = get_rate(currency, day)
+    target_rate = get_rate(target, day)
+    if rate is None or target_rate is None:
+        return None
+    return (Decimal(amount) * rate / target_rate).quantize(CENT)
+
+
+def rate_subquery(currency, day='day'):
+    """Подзапрос курса на день: последний снимок не позже day."""
+    return Subquery(
+        FxRate.objects.filter(currency=currency, day__lte=OuterRef(day))
+        .order_by('-day')
+        .values('rate')[:1]
+    )
+
+
+def normalized_amount(target, amount='amount', currency='currency'):
+    """
+    Сумма в валюте target для запросов к таблице с полем day.
+
+    Пересчёт выполняется в SQL: курс берётся подзапросом к FxRate по
+    индексу (currency, day). Строки без курса в сумму не входят.
+    """
+    base = settings.PAYOUT_FX_BASE_CURRENCY
+    rate = Case(
+        When(**{currency: base}, then=Value(Decimal(1))),
+        default=rate_subquery(OuterRef(currency)),
+        output_field=DecimalField(),
+    )
+    if target != base:
+        rate = rate / rate_subquery(target)
+    return Sum(F(amount) * rate, output_field=DecimalField())
+
+
+def normalized_total(queryset, target=None):
+    """
+    Итог сумм заявок queryset в валюте target одним запросом.
+
+    Заявки сначала группируются по дню создания и валюте, затем каждая
+    группа соединяется с курсом на свой день, поэтому число подзапросов
+    к FxRate не зависит от числа заявок. Возвращает сумму и список
+    валют, для которых не нашлось курса.
+    """
+    target = target or settings.PAYOUT_FX_BASE_CURRENCY
+    base = settings.PAYOUT_FX_BASE_CURRENCY
+    grouped = (
+        queryset.annotate(
+            day=TruncDate(
+                'created_at', tzinfo=timezone.get_default_timezone()
+            )
+        )
+        .values('day', 'currency')
+        .annotate(total=Sum('amount'))
+        .order_by()
+    )
+    sql, params = grouped.query.sql_with_params()
+    rates_table = connection.ops.quote_name(FxRate._meta.db_table)
+
+    def rate_sql(currency):
+        return (
+            f'CROSS JOIN LATERAL (SELECT CASE WHEN {currency} = %s THEN 1 '
+            f'ELSE (SELECT rate FROM {rates_table} '
+            f'WHERE currency = {currency} AND day <= g.day '
+            f'ORDER BY day DESC LIMIT 1) END AS rate)'
+        )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT coalesce(sum(g.total * r.rate / t.rate), 0), '
+            f'array_agg(DISTINCT g.currency) FILTER '
+            f'(WHERE r.rate IS NULL OR t.rate IS NULL) '
+            f'FROM ({sql}) AS g '
+            f'{rate_sql("g.currency")} AS r '
+            f'{rate_sql("%s::varchar")} AS t',
+            [*params, base, target, base, target],
+        )
+        total, unconverted = cursor.fetchone()
+    return Decimal(total).quantize(CENT), sorted(unconverted or [])
@@ -0,0 +1,94 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .encryption import open_body, seal_body
+from .models import IdempotencyKey
+
+
+IDEMPOTENCY_CACHE_PREFIX = 'idempotency:'
+
+
+class IdempotencyKeyReused(Exception):
+    """Ключ уже использован для запроса с другим телом."""
+
+
+def request_hash(data):
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_stored_response(key, data_hash):
+    """
+    Возвращает сохранённый ответ (status_code, body) или None.
+
+    Сначала проверяется Redis, затем уникальный индекс в БД. Ключи
+    старше окна хранения считаются отсутствующими.
+    """
+    stored = cache.get(IDEMPOTENCY_CACHE_PREFIX + key)
+    if stored is None:
+        retention_start = timezone.now() - timedelta(
+            seconds=settings.PAYOUT_IDEMPOTENCY_RETENTION
+        )
+        stored = IdempotencyKey.objects.filter(
+            key=key, created_at__gte=retention_start
+        ).values_list('request_hash', 'status_code', 'response_body').first()
+        if stored is None:
+            return None
+        cache.set(
+            IDEMPOTENCY_CACHE_PREFIX + key, stored,
+            settings.PAYOUT_IDEMPOTENCY_RETENTION,
+        )
+    stored_hash, status_code, body = stored
+    if stored_hash != data_hash:
+        raise IdempotencyKeyReused(key)
+    return status_code, open_body(body)
+
+
+def store_response(key, data_hash, status_code, body):
+    """
+    Сохраняет ответ в текущей транзакции, реквизиты шифруются.
+
+    При гонке двух одинаковых запросов второй получит IntegrityError
+    на уникальном индексе и будет откатан вместе с созданной заявкой.
+    """
+    IdempotencyKey.objects.filter(
+        key=key,
+        created_at__lt=timezone.now() - timedelta(
+            seconds=settings.PAYOUT_IDEMPOTENCY_RETENTION
+        ),
+    ).delete()
+    body = seal_body(body)
+    IdempotencyKey.objects.create(
+        key=key,
+        request_hash=data_hash,
+        status_code=status_code,
+        response_body=body,
+    )
+    transaction.on_commit(lambda: cache.set(
+        IDEMPOTENCY_CACHE_PREFIX + key,
+        (data_hash, status_code, body),
+        settings.PAYOUT_IDEMPOTENCY_RETENTION,
+    ))
+
+
+def purge_expired_keys(batch_size=None):
+    """Удаляет ключи старше окна хранения пачками."""
+    batch_size = batch_size or settings.PAYOUT_IDEMPOTENCY_PURGE_BATCH_SIZE
+    retention_start = timezone.now() - timedelta(
+        seconds=settings.PAYOUT_IDEMPOTENCY_RETENTION
+    )
+    purged = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(created_at__lt=retention_start)
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return purged
+        purged += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from payouts.archive import archive_payouts
+
+
+class Command(BaseCommand):
+    help = 'Переносит завершённые выплаты в секционированный архив'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.PAYOUT_ARCHIVE_AFTER_DAYS,
+            help='Переносить выплаты старше указанного числа дней',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Количество выплат в одной пачке',
+        )
+
+    def handle(self, *args, **options):
+        archived = archive_payouts(options['days'], options['batch_size'])
+        self.stdout.write(f'Перенесено в архив: {archived}')
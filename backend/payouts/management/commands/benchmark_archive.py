@@ -0,0 +1,146 @@
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from api.filters import filter_payouts
+from api.formatters import payout_values
+from payouts.archive import archive_payouts
+from payouts.encryption import blind_index, encrypt
+from payouts.models import (
+    CurrencyChoice,
+    Payout,
+    PayoutOutbox,
+    PaymentMethodChoice,
+    StatusChoice
+)
+from payouts.services import bulk_create_payouts
+
+
+# Каждая сотая выплата активна, остальные завершены и разнесены
+# по дням последнего года.
+FILL_SQL = """
+INSERT INTO payouts_payout (
+    payout_uid, method, amount, currency, status, bank_name, bank_bik,
+    card_number, card_number_hash, account_number, phone, description,
+    created_at, updated_at
+)
+SELECT
+    gen_random_uuid(), 'card', 100 + i %% 1000, 'RUB',
+    CASE WHEN i %% 100 = 0 THEN 'pending' ELSE 'completed' END,
+    'Тинькофф', '044525974', %s, %s, '', '+79856584565', '',
+    now() - make_interval(days => CASE WHEN i %% 100 = 0 THEN 0
+                                       ELSE i %% 365 END),
+    now()
+FROM generate_series(1, %s) AS i
+"""
+CARD_NUMBER = '2201221554561246'
+
+LIST_QUERIES = {
+    'list': {},
+    'list pending': {'status': StatusChoice.PENDING},
+    'list completed RUB': {
+        'status': StatusChoice.COMPLETED, 'currency': CurrencyChoice.RUB,
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет задержку списка и вставки выплат до и после переноса '
+        'завершённых выплат в архив. Заполняет текущую БД тестовыми '
+        'данными, запускать только на стенде'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=10_000_000,
+            help='Сколько выплат создать перед замером',
+        )
+        parser.add_argument(
+            '--days', type=int, default=90,
+            help='Возраст завершённых выплат для переноса в архив',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Количество повторов каждого замера',
+        )
+        parser.add_argument(
+            '--page-size', type=int, default=100,
+            help='Размер страницы списка',
+        )
+        parser.add_argument(
+            '--insert-size', type=int, default=1000,
+            help='Количество выплат в одной пачке вставки',
+        )
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            # Один шифротекст на все строки: номера одинаковые
+            cursor.execute(FILL_SQL, [
+                encrypt(CARD_NUMBER),
+                blind_index('card_number', CARD_NUMBER),
+                options['rows'],
+            ])
+        self.analyze()
+        before = self.measure(options)
+        started = time.perf_counter()
+        archived = archive_payouts(options['days'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'Перенесено в архив: {archived} за {elapsed:.1f} с'
+        )
+        self.analyze()
+        after = self.measure(options)
+        self.stdout.write(
+            f'{"query":<20} {"before ms":>10} {"after ms":>10}'
+        )
+        for name in before:
+            self.stdout.write(
+                f'{name:<20} {before[name]:>10.2f} {after[name]:>10.2f}'
+            )
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('VACUUM ANALYZE payouts_payout')
+            cursor.execute('ANALYZE payouts_payoutarchive')
+
+    def measure(self, options):
+        results = {
+            name: self.median(options['repeat'], lambda: list(
+                payout_values(filter_payouts(Payout.objects.all(), params))
+                [:options['page_size']]
+            ))
+            for name, params in LIST_QUERIES.items()
+        }
+        items = [
+            {
+                'method': PaymentMethodChoice.CARD_TRANSFER,
+                'amount': Decimal('100.00'),
+                'currency': CurrencyChoice.RUB,
+                'bank_name': 'Тинькофф',
+                'card_number': CARD_NUMBER,
+                'phone': '+79856584565',
+            }
+            for _ in range(options['insert_size'])
+        ]
+        created = []
+        results['insert'] = self.median(
+            options['repeat'],
+            lambda: created.extend(
+                payout.payout_uid for payout in bulk_create_payouts(items)
+            ),
+        )
+        Payout.objects.filter(payout_uid__in=created).delete()
+        PayoutOutbox.objects.filter(payout_uid__in=created).delete()
+        return results
+
+    def median(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
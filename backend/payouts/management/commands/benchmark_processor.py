@@ -0,0 +1,72 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from payouts.models import CurrencyChoice, Payout, PaymentMethodChoice
+from payouts.processor import run_batch
+from payouts.providers import FakeProvider
+
+
+def run_worker(payouts_count, latency, concurrency):
+    """Прогоняет пачку выплат через движок в отдельном процессе."""
+    payouts = [
+        Payout(
+            method=PaymentMethodChoice.CARD_TRANSFER,
+            amount=Decimal('100.00'),
+            currency=CurrencyChoice.RUB,
+            card_number='2201221554561246',
+        )
+        for _ in range(payouts_count)
+    ]
+    asyncio.run(run_batch(FakeProvider(latency), payouts, concurrency))
+    return payouts_count
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет пропускную способность асинхронного обработчика выплат '
+        'с локальным провайдером в зависимости от числа воркеров'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', default='1,2,4,8',
+            help='Список количества процессов-воркеров через запятую',
+        )
+        parser.add_argument(
+            '--payouts', type=int, default=10000,
+            help='Количество выплат на один воркер',
+        )
+        parser.add_argument(
+            '--latency', type=float, default=0.05,
+            help='Задержка ответа провайдера в секундах',
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=1000,
+            help='Количество одновременных вызовов провайдера на воркер',
+        )
+
+    def handle(self, *args, **options):
+        latency = options['latency']
+        concurrency = options['concurrency']
+        self.stdout.write(
+            f'{"workers":>8} {"payouts":>10} {"seconds":>10} '
+            f'{"payouts/s":>12} {"sleep model/s":>14}'
+        )
+        for workers in map(int, options['workers'].split(',')):
+            started = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                total = sum(executor.map(
+                    run_worker,
+                    [options['payouts']] * workers,
+                    [latency] * workers,
+                    [concurrency] * workers,
+                ))
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{workers:>8} {total:>10} {elapsed:>10.2f} '
+                f'{total / elapsed:>12.0f} {workers / latency:>14.0f}'
+            )
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from payouts.models import (
+    CurrencyChoice,
+    Payout,
+    PaymentMethodChoice,
+    StatusChoice
+)
+from payouts.processor import retry_delay, run_batch
+from payouts.providers import FaultyProvider
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет выплаты через провайдер со случайными временными '
+        'ошибками и показывает число вызовов, раундов повторов и '
+        'суммарную задержку для разной доли ошибок'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--failure-rates', default='0.1,0.2,0.3',
+            help='Доли временных ошибок провайдера через запятую',
+        )
+        parser.add_argument(
+            '--payouts', type=int, default=10000,
+            help='Количество выплат',
+        )
+        parser.add_argument(
+            '--latency', type=float, default=0.01,
+            help='Задержка ответа провайдера в секундах',
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=1000,
+            help='Количество одновременных вызовов провайдера',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=None,
+            help='Зерно генератора ошибок',
+        )
+
+    def handle(self, *args, **options):
+        # Предупреждение на каждую ошибку провайдера заглушило бы таблицу
+        logging.getLogger('payouts.processor').setLevel(logging.ERROR)
+        max_retries = settings.PAYOUT_MAX_RETRIES
+        self.stdout.write(
+            f'{"rate":>6} {"calls":>8} {"calls/payout":>13} {"rounds":>7} '
+            f'{"failed":>7} {"backoff s":>10} {"seconds":>8}'
+        )
+        for rate in map(float, options['failure_rates'].split(',')):
+            provider = FaultyProvider(
+                options['latency'], failure_rate=rate, seed=options['seed']
+            )
+            pending = [
+                Payout(
+                    method=PaymentMethodChoice.CARD_TRANSFER,
+                    amount=Decimal('100.00'),
+                    currency=CurrencyChoice.RUB,
+                    card_number='2201221554561246',
+                )
+                for _ in range(options['payouts'])
+            ]
+            calls = rounds = 0
+            backoff = 0.0
+            started = time.perf_counter()
+            while pending and rounds <= max_retries:
+                statuses = asyncio.run(
+                    run_batch(provider, pending, options['concurrency'])
+                )
+                calls += len(pending)
+                pending = [
+                    payout for payout in pending
+                    if statuses[payout.payout_uid] == StatusChoice.PROCESSING
+                ]
+                if pending and rounds < max_retries:
+                    backoff += retry_delay(rounds)
+                rounds += 1
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{rate:>6.2f} {calls:>8} '
+                f'{calls / options["payouts"]:>13.3f} {rounds:>7} '
+                f'{len(pending):>7} {backoff:>10.1f} {elapsed:>8.2f}'
+            )
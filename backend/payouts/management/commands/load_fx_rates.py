@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from payouts.fx import FxRateError, load_rates, read_rates_file, stub_rates
+
+
+class Command(BaseCommand):
+    help = 'Загружает снимки курсов валют из CSV-файла или заглушки'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file', default=settings.PAYOUT_FX_RATES_FILE,
+            help='CSV со столбцами day, currency, rate',
+        )
+        parser.add_argument(
+            '--stub', action='store_true',
+            help='Загрузить курсы-заглушки PAYOUT_FX_STUB_RATES',
+        )
+        parser.add_argument(
+            '--day', default=None,
+            help='День снимка заглушки (YYYY-MM-DD), по умолчанию сегодня',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options['stub'] or not options['file']:
+                day = options['day'] and parse_date(options['day'])
+                if options['day'] and day is None:
+                    raise FxRateError(
+                        '--day: ожидается дата в формате YYYY-MM-DD'
+                    )
+                rates = stub_rates(day)
+            else:
+                rates = read_rates_file(options['file'])
+        except (FxRateError, OSError, KeyError) as error:
+            raise CommandError(f'Не удалось прочитать курсы: {error}')
+        self.stdout.write(f'Загружено курсов: {load_rates(rates)}')
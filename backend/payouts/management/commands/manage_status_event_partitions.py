@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from payouts.models import PayoutStatusEvent
+from payouts.partitions import detach_partitions, ensure_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт будущие секции журнала статусов и отсоединяет секции '
+        'старше срока хранения'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ahead', type=int,
+            default=settings.PAYOUT_STATUS_EVENT_PARTITIONS_AHEAD,
+            help='На сколько месяцев вперёд создавать секции',
+        )
+        parser.add_argument(
+            '--retain-months', type=int,
+            default=settings.PAYOUT_STATUS_EVENT_RETENTION_MONTHS,
+            help='Сколько месяцев хранить секции в основной таблице',
+        )
+        parser.add_argument(
+            '--drop', action='store_true',
+            help='Удалить отсоединённые секции вместо их сохранения',
+        )
+
+    def handle(self, *args, **options):
+        table = PayoutStatusEvent._meta.db_table
+        for name in ensure_partitions(table, options['ahead']):
+            self.stdout.write(f'Создана секция {name}')
+        for name in detach_partitions(
+            table, options['retain_months'], options['drop']
+        ):
+            self.stdout.write(
+                f'Секция {name} ' + ('удалена' if options['drop']
+                                     else 'отсоединена')
+            )
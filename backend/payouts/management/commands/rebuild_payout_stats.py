@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from payouts.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает дневные итоги по заявкам за период'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.PAYOUT_STATS_REBUILD_DAYS,
+            help='Пересчитать итоги за последние дни, включая сегодня',
+        )
+        parser.add_argument(
+            '--date-from', default=None,
+            help='Первый день периода (YYYY-MM-DD), заменяет --days',
+        )
+        parser.add_argument(
+            '--date-to', default=None,
+            help='Последний день периода (YYYY-MM-DD), по умолчанию сегодня',
+        )
+
+    def parse_day(self, value, name):
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f'{name}: ожидается дата в формате YYYY-MM-DD')
+        return day
+
+    def handle(self, *args, **options):
+        day_to = timezone.localdate(
+            timezone.now(), timezone.get_default_timezone()
+        )
+        if options['date_to']:
+            day_to = self.parse_day(options['date_to'], '--date-to')
+        if options['date_from']:
+            day_from = self.parse_day(options['date_from'], '--date-from')
+        else:
+            day_from = day_to - timedelta(days=options['days'] - 1)
+        if day_from > day_to:
+            raise CommandError('Начало периода позже его окончания')
+        rows = rebuild_stats(day_from, day_to)
+        self.stdout.write(
+            f'Пересчитаны итоги за {day_from} — {day_to}, '
+            f'исправлено строк: {rows}'
+        )
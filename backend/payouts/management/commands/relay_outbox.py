@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from payouts.outbox import relay_outbox
+
+
+class Command(BaseCommand):
+    help = 'Переносит сообщения outbox заявок в брокер Celery'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Количество сообщений в одной пачке',
+        )
+        parser.add_argument(
+            '--interval', type=float,
+            default=settings.PAYOUT_OUTBOX_POLL_INTERVAL,
+            help='Пауза между опросами пустой таблицы, в секундах',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Отправить одну пачку и завершиться',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            relayed = relay_outbox(options['batch_size'])
+            if options['once']:
+                self.stdout.write(f'Отправлено сообщений: {relayed}')
+                return
+            if not relayed:
+                time.sleep(options['interval'])
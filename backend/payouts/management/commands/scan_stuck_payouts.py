@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from payouts.queues import stuck_payouts
+
+
+class Command(BaseCommand):
+    help = 'Выводит активные заявки, статус которых давно не менялся'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seconds', type=int, default=settings.PAYOUT_STUCK_AFTER,
+            help='Сколько секунд заявка может не меняться',
+        )
+        parser.add_argument(
+            '--limit', type=int, default=100,
+            help='Максимальное количество выводимых заявок',
+        )
+
+    def handle(self, *args, **options):
+        payouts = stuck_payouts(options['seconds']).values_list(
+            'payout_uid', 'status', 'updated_at'
+        )[:options['limit']]
+        for payout_uid, status, updated_at in payouts:
+            self.stdout.write(
+                f'{payout_uid} {status} {updated_at.isoformat()}'
+            )
@@ -0,0 +1,122 @@
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+
+METRICS_KEY_PREFIX = 'metrics:'
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+
+# name: (тип, описание, наборы меток, сборщик значений при выгрузке)
+METRICS = {
+    'payout_outbox_relayed_total': (
+        COUNTER, 'Количество сообщений outbox, отправленных в брокер',
+        None, None,
+    ),
+    'payout_outbox_last_batch_size': (
+        GAUGE, 'Размер последней пачки, отправленной relay',
+        None, None,
+    ),
+    'payout_outbox_lag_seconds': (
+        GAUGE, 'Возраст самого старого неотправленного сообщения outbox',
+        None, 'payouts.outbox.collect_outbox_lag',
+    ),
+    'payout_outbox_pending': (
+        GAUGE, 'Количество неотправленных сообщений outbox',
+        None, 'payouts.outbox.collect_outbox_pending',
+    ),
+    'payout_queue_depth': (
+        GAUGE, 'Количество активных заявок по статусу, валюте и способу',
+        None, 'payouts.queues.collect_queue_depth',
+    ),
+    'payout_broker_queue_depth': (
+        GAUGE, 'Количество задач в очередях выплат брокера',
+        None, 'payouts.routing.collect_broker_queue_depth',
+    ),
+    'payout_stuck': (
+        GAUGE, 'Активные заявки, не менявшиеся дольше PAYOUT_STUCK_AFTER',
+        None, 'payouts.queues.collect_stuck_payouts',
+    ),
+    'payout_failed': (
+        GAUGE, 'Заявки в статусе failed, ожидающие оператора',
+        None, 'payouts.queues.collect_failed_payouts',
+    ),
+    'payouts_failed_total': (
+        COUNTER, 'Заявки, переведённые в failed',
+        None, None,
+    ),
+    'payout_provider_admitted_total': (
+        COUNTER, 'Заявки, пропущенные лимитами провайдера',
+        [{'provider': 'bank'}, {'provider': 'card'}], None,
+    ),
+    'payout_provider_throttled_total': (
+        COUNTER, 'Заявки, отложенные из-за лимитов провайдера',
+        [{'provider': 'bank'}, {'provider': 'card'}], None,
+    ),
+    'payouts_reaped_total': (
+        COUNTER, 'Заявки, возвращённые из зависшего статуса processing',
+        [{'result': 'requeued'}, {'result': 'failed'}], None,
+    ),
+    'payouts_archived_total': (
+        COUNTER, 'Количество выплат, перенесённых в архив',
+        None, None,
+    ),
+    'payout_cache_hits_total': (
+        COUNTER, 'Попадания в кэш детальных ответов по выплатам',
+        None, None,
+    ),
+    'payout_cache_misses_total': (
+        COUNTER, 'Промахи кэша детальных ответов по выплатам',
+        None, None,
+    ),
+    'payout_cache_skipped_total': (
+        COUNTER, 'Ответы, не помещённые в кэш из-за размера',
+        None, None,
+    ),
+}
+
+
+def _sample_key(name, labels):
+    if not labels:
+        return name
+    rendered = ','.join(
+        f'{label}="{value}"' for label, value in sorted(labels.items())
+    )
+    return f'{name}{{{rendered}}}'
+
+
+def incr(name, value=1, **labels):
+    """Увеличивает счётчик, общий для всех процессов."""
+    key = METRICS_KEY_PREFIX + _sample_key(name, labels)
+    cache.add(key, 0, timeout=None)
+    cache.incr(key, value)
+
+
+def set_value(name, value, **labels):
+    """Устанавливает значение метрики-датчика."""
+    key = METRICS_KEY_PREFIX + _sample_key(name, labels)
+    cache.set(key, value, timeout=None)
+
+
+def collect():
+    """Возвращает текущие значения всех метрик в формате Prometheus."""
+    lines = []
+    for name, (kind, description, label_sets, collector) in METRICS.items():
+        if collector:
+            samples = import_string(collector)()
+        else:
+            label_sets = label_sets or [{}]
+            keys = [
+                METRICS_KEY_PREFIX + _sample_key(name, labels)
+                for labels in label_sets
+            ]
+            values = cache.get_many(keys)
+            samples = [
+                (labels, values.get(key, 0))
+                for labels, key in zip(label_sets, keys)
+            ]
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            lines.append(f'{_sample_key(name, labels)} {value}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0005_alter_payout_phone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayoutOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payout_uid', models.UUIDField(verbose_name='UUID заявки')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+            ],
+            options={
+                'verbose_name': 'Сообщение outbox',
+                'verbose_name_plural': 'Сообщения outbox',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0006_payoutoutbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payout',
+            index=models.Index(fields=['created_at', 'payout_uid'], name='payouts_pay_created_7c993f_idx'),
+        ),
+    ]
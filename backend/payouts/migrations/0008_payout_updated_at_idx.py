@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0007_payout_created_at_payout_uid_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payout',
+            index=models.Index(fields=['updated_at'], name='payouts_pay_updated_2c2281_idx'),
+        ),
+    ]
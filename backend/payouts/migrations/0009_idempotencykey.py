@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0008_payout_updated_at_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True, verbose_name='Ключ идемпотентности')),
+                ('request_hash', models.CharField(max_length=64, verbose_name='Хэш тела запроса')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='HTTP-статус ответа')),
+                ('response_body', models.JSONField(verbose_name='Тело ответа')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата создания')),
+            ],
+            options={
+                'verbose_name': 'Ключ идемпотентности',
+                'verbose_name_plural': 'Ключи идемпотентности',
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+CREATE_PARTITIONED_TABLE = """
+CREATE TABLE payouts_payoutstatusevent (
+    id bigint GENERATED BY DEFAULT AS IDENTITY,
+    payout_uid uuid NOT NULL,
+    from_status varchar NOT NULL,
+    to_status varchar NOT NULL,
+    created_at timestamp with time zone NOT NULL,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE INDEX payouts_pay_payout__5d9366_idx
+    ON payouts_payoutstatusevent (payout_uid, created_at);
+CREATE TABLE payouts_payoutstatusevent_default
+    PARTITION OF payouts_payoutstatusevent DEFAULT;
+"""
+
+DROP_PARTITIONED_TABLE = "DROP TABLE payouts_payoutstatusevent CASCADE;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0009_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=CREATE_PARTITIONED_TABLE,
+                    reverse_sql=DROP_PARTITIONED_TABLE,
+                ),
+            ],
+            state_operations=[
+                migrations.CreateModel(
+                    name='PayoutStatusEvent',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('payout_uid', models.UUIDField(verbose_name='UUID заявки')),
+                        ('from_status', models.CharField(choices=[('pending', 'На рассмотрении'), ('approved', 'Утверждена'), ('processing', 'В обработке'), ('completed', 'Выполнена'), ('rejected', 'Отклонена'), ('cancelled', 'Отменена')], verbose_name='Предыдущий статус')),
+                        ('to_status', models.CharField(choices=[('pending', 'На рассмотрении'), ('approved', 'Утверждена'), ('processing', 'В обработке'), ('completed', 'Выполнена'), ('rejected', 'Отклонена'), ('cancelled', 'Отменена')], verbose_name='Новый статус')),
+                        ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата перехода')),
+                    ],
+                    options={
+                        'verbose_name': 'Смена статуса заявки',
+                        'verbose_name_plural': 'Журнал статусов заявок',
+                        'ordering': ['created_at'],
+                        'indexes': [models.Index(fields=['payout_uid', 'created_at'], name='payouts_pay_payout__5d9366_idx')],
+                    },
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:07
+
+import django.core.validators
+import django.utils.timezone
+import phonenumber_field.modelfields
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+CREATE_PARTITIONED_TABLE = """
+CREATE TABLE payouts_payoutarchive (
+    payout_uid uuid NOT NULL,
+    method varchar NOT NULL,
+    amount numeric(15, 2) NOT NULL,
+    currency varchar NOT NULL,
+    status varchar NOT NULL,
+    bank_name varchar(100) NOT NULL,
+    bank_bik varchar(9) NOT NULL,
+    card_number varchar(20) NOT NULL,
+    account_number varchar(30) NOT NULL,
+    phone varchar(128) NOT NULL,
+    description text NOT NULL,
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    archived_at timestamp with time zone NOT NULL,
+    PRIMARY KEY (payout_uid, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE INDEX payouts_payoutarchive_created_at_idx
+    ON payouts_payoutarchive (created_at);
+CREATE INDEX payouts_pay_created_0ea27f_idx
+    ON payouts_payoutarchive (created_at, payout_uid);
+"""
+
+DROP_PARTITIONED_TABLE = "DROP TABLE payouts_payoutarchive CASCADE;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0010_payoutstatusevent'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=CREATE_PARTITIONED_TABLE,
+                    reverse_sql=DROP_PARTITIONED_TABLE,
+                ),
+            ],
+            state_operations=[
+                migrations.CreateModel(
+                    name='PayoutArchive',
+                    fields=[
+                        ('payout_uid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True, verbose_name='UUID заявки')),
+                        ('method', models.CharField(choices=[('bank', 'Банковский перевод'), ('card', 'Перевод на карту')], help_text='Выберите способ выплаты', verbose_name='Способ выплаты')),
+                        ('amount', models.DecimalField(decimal_places=2, help_text='Cумма к выплаты', max_digits=15, validators=[django.core.validators.MinValueValidator(Decimal('0.01000000000000000020816681711721685132943093776702880859375'))], verbose_name='Сумма выплаты')),
+                        ('currency', models.CharField(choices=[('RUB', 'Рубли (RUB)'), ('USD', 'Доллар США (USD)'), ('EUR', 'Евро (EUR)'), ('CNY', 'Юани (CNY)')], default='RUB', help_text='Выберите тип валюты', verbose_name='Валюта')),
+                        ('status', models.CharField(choices=[('pending', 'На рассмотрении'), ('approved', 'Утверждена'), ('processing', 'В обработке'), ('completed', 'Выполнена'), ('rejected', 'Отклонена'), ('cancelled', 'Отменена')], default='pending', verbose_name='Статус заявки')),
+                        ('bank_name', models.CharField(max_length=100, verbose_name='Банк')),
+                        ('bank_bik', models.CharField(blank=True, help_text='Банковский идентификационный код', max_length=9, verbose_name='БИК банка')),
+                        ('card_number', models.CharField(blank=True, max_length=20, verbose_name='Номер карты')),
+                        ('account_number', models.CharField(blank=True, max_length=30, verbose_name='Номер счёта')),
+                        ('phone', phonenumber_field.modelfields.PhoneNumberField(help_text='Телефон для связи по выплате', max_length=128, region=None, verbose_name='Контактный телефон')),
+                        ('description', models.TextField(blank=True, help_text='Основание для выплаты, назначение платежа', verbose_name='Описание / Комментарий')),
+                        ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата создания')),
+                        ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+                        ('archived_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата архивации')),
+                    ],
+                    options={
+                        'verbose_name': 'Архивная заявка на выплату',
+                        'verbose_name_plural': 'Архив заявок на выплату',
+                        'ordering': ['-created_at'],
+                        'indexes': [models.Index(fields=['created_at', 'payout_uid'], name='payouts_pay_created_0ea27f_idx')],
+                    },
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:09
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('payouts', '0011_payoutarchive'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='payout',
+            index=models.Index(condition=models.Q(('status__in', ('pending', 'approved', 'processing'))), fields=['created_at'], name='payout_active_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='payout',
+            index=models.Index(condition=models.Q(('status__in', ('pending', 'approved', 'processing'))), fields=['status', 'updated_at'], name='payout_active_updated_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='payout',
+            index=models.Index(condition=models.Q(('status__in', ('pending', 'approved', 'processing'))), fields=['status', 'currency', 'method'], name='payout_active_queue_idx'),
+        ),
+    ]
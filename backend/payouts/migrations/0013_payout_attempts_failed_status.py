@@ -0,0 +1,43 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0012_payout_active_partial_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payout',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Сколько раз заявка забиралась в обработку', verbose_name='Попытки обработки'),
+        ),
+        migrations.AddField(
+            model_name='payoutarchive',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Сколько раз заявка забиралась в обработку', verbose_name='Попытки обработки'),
+        ),
+        migrations.AlterField(
+            model_name='payout',
+            name='status',
+            field=models.CharField(choices=[('pending', 'На рассмотрении'), ('approved', 'Утверждена'), ('processing', 'В обработке'), ('completed', 'Выполнена'), ('rejected', 'Отклонена'), ('cancelled', 'Отменена'), ('failed', 'Не обработана')], default='pending', verbose_name='Статус заявки'),
+        ),
+        migrations.AlterField(
+            model_name='payoutarchive',
+            name='status',
+            field=models.CharField(choices=[('pending', 'На рассмотрении'), ('approved', 'Утверждена'), ('processing', 'В обработке'), ('completed', 'Выполнена'), ('rejected', 'Отклонена'), ('cancelled', 'Отменена'), ('failed', 'Не обработана')], default='pending', verbose_name='Статус заявки'),
+        ),
+        migrations.AlterField(
+            model_name='payoutstatusevent',
+            name='from_status',
+            field=models.CharField(choices=[('pending', 'На рассмотрении'), ('approved', 'Утверждена'), ('processing', 'В обработке'), ('completed', 'Выполнена'), ('rejected', 'Отклонена'), ('cancelled', 'Отменена'), ('failed', 'Не обработана')], verbose_name='Предыдущий статус'),
+        ),
+        migrations.AlterField(
+            model_name='payoutstatusevent',
+            name='to_status',
+            field=models.CharField(choices=[('pending', 'На рассмотрении'), ('approved', 'Утверждена'), ('processing', 'В обработке'), ('completed', 'Выполнена'), ('rejected', 'Отклонена'), ('cancelled', 'Отменена'), ('failed', 'Не обработана')], verbose_name='Новый статус'),
+        ),
+    ]
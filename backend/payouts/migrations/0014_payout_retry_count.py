@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0013_payout_attempts_failed_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payout',
+            name='retry_count',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Сколько раз вызов провайдера повторялся после ошибки', verbose_name='Повторы'),
+        ),
+        migrations.AddField(
+            model_name='payoutarchive',
+            name='retry_count',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Сколько раз вызов провайдера повторялся после ошибки', verbose_name='Повторы'),
+        ),
+    ]
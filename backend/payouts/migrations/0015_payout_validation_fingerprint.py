@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0014_payout_retry_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payout',
+            name='validation_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Отпечаток проверки реквизитов'),
+        ),
+        migrations.AddField(
+            model_name='payoutarchive',
+            name='validation_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Отпечаток проверки реквизитов'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0015_payout_validation_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayoutDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День создания заявок')),
+                ('status', models.CharField(choices=[('pending', 'На рассмотрении'), ('approved', 'Утверждена'), ('processing', 'В обработке'), ('completed', 'Выполнена'), ('rejected', 'Отклонена'), ('cancelled', 'Отменена'), ('failed', 'Не обработана')], verbose_name='Статус заявки')),
+                ('currency', models.CharField(choices=[('RUB', 'Рубли (RUB)'), ('USD', 'Доллар США (USD)'), ('EUR', 'Евро (EUR)'), ('CNY', 'Юани (CNY)')], verbose_name='Валюта')),
+                ('method', models.CharField(choices=[('bank', 'Банковский перевод'), ('card', 'Перевод на карту')], verbose_name='Способ выплаты')),
+                ('count', models.BigIntegerField(default=0, verbose_name='Количество')),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Сумма')),
+            ],
+            options={
+                'verbose_name': 'Дневной итог по заявкам',
+                'verbose_name_plural': 'Дневные итоги по заявкам',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'status', 'currency', 'method'), name='payout_daily_stat_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0016_payoutdailystat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FxRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Дата курса')),
+                ('currency', models.CharField(choices=[('RUB', 'Рубли (RUB)'), ('USD', 'Доллар США (USD)'), ('EUR', 'Евро (EUR)'), ('CNY', 'Юани (CNY)')], verbose_name='Валюта')),
+                ('rate', models.DecimalField(decimal_places=8, max_digits=20, verbose_name='Стоимость единицы валюты в базовой валюте')),
+            ],
+            options={
+                'verbose_name': 'Курс валюты',
+                'verbose_name_plural': 'Курсы валют',
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('currency', 'day'), name='fx_rate_currency_day_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:28
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('payouts', '0017_fxrate'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='payout',
+            index=django.contrib.postgres.indexes.HashIndex(fields=['card_number'], name='payout_card_number_hash_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='payout',
+            index=django.contrib.postgres.indexes.HashIndex(fields=['account_number'], name='payout_account_number_hash_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='payout',
+            index=models.Index(fields=['bank_bik'], name='payout_bank_bik_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='payout',
+            index=models.Index(fields=['phone'], name='payout_phone_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='payout',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('bank_name'), name='text_pattern_ops'), name='payout_bank_name_prefix_idx'),
+        ),
+    ]
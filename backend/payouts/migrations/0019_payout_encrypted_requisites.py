@@ -0,0 +1,62 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:34
+
+import payouts.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0018_payout_admin_search_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='payout',
+            name='payout_card_number_hash_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='payout',
+            name='payout_account_number_hash_idx',
+        ),
+        migrations.AddField(
+            model_name='payout',
+            name='account_number_hash',
+            field=payouts.fields.BlindIndexField('account_number', blank=True, default='', editable=False, max_length=64, verbose_name='Хэш номера счёта'),
+        ),
+        migrations.AddField(
+            model_name='payout',
+            name='card_number_hash',
+            field=payouts.fields.BlindIndexField('card_number', blank=True, default='', editable=False, max_length=64, verbose_name='Хэш номера карты'),
+        ),
+        migrations.AddField(
+            model_name='payoutarchive',
+            name='account_number_hash',
+            field=payouts.fields.BlindIndexField('account_number', blank=True, default='', editable=False, max_length=64, verbose_name='Хэш номера счёта'),
+        ),
+        migrations.AddField(
+            model_name='payoutarchive',
+            name='card_number_hash',
+            field=payouts.fields.BlindIndexField('card_number', blank=True, default='', editable=False, max_length=64, verbose_name='Хэш номера карты'),
+        ),
+        migrations.AlterField(
+            model_name='payout',
+            name='account_number',
+            field=payouts.fields.EncryptedCharField(blank=True, max_length=30, verbose_name='Номер счёта'),
+        ),
+        migrations.AlterField(
+            model_name='payout',
+            name='card_number',
+            field=payouts.fields.EncryptedCharField(blank=True, max_length=20, verbose_name='Номер карты'),
+        ),
+        migrations.AlterField(
+            model_name='payoutarchive',
+            name='account_number',
+            field=payouts.fields.EncryptedCharField(blank=True, max_length=30, verbose_name='Номер счёта'),
+        ),
+        migrations.AlterField(
+            model_name='payoutarchive',
+            name='card_number',
+            field=payouts.fields.EncryptedCharField(blank=True, max_length=20, verbose_name='Номер карты'),
+        ),
+    ]
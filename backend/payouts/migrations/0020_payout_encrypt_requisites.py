@@ -0,0 +1,92 @@
+from django.db import migrations, transaction
+
+from payouts.encryption import blind_index, decrypt, encrypt
+
+
+BATCH_SIZE = 1000
+TABLES = ('payouts_payout', 'payouts_payoutarchive')
+
+
+def update_batch(cursor, table, rows):
+    values = ', '.join(['(%s::uuid, %s, %s, %s, %s)'] * len(rows))
+    cursor.execute(
+        f'UPDATE {table} AS p SET card_number = v.card_number, '
+        f'account_number = v.account_number, '
+        f'card_number_hash = v.card_number_hash, '
+        f'account_number_hash = v.account_number_hash '
+        f'FROM (VALUES {values}) AS v (payout_uid, card_number, '
+        f'account_number, card_number_hash, account_number_hash) '
+        f'WHERE p.payout_uid = v.payout_uid',
+        [value for row in rows for value in row],
+    )
+
+
+def transform_batches(connection, where, transform):
+    """
+    Обрабатывает строки, подходящие под where, пачками.
+
+    Каждая пачка фиксируется своей транзакцией: блокировки строк
+    не держатся до конца миграции, а прерванная миграция продолжает
+    с необработанных строк, потому что обработанные больше не
+    подходят под where.
+    """
+    for table in TABLES:
+        while True:
+            with transaction.atomic(using=connection.alias):
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'SELECT payout_uid, card_number, account_number '
+                        f'FROM {table} WHERE {where} LIMIT %s '
+                        f'FOR UPDATE',
+                        ['', '', '', '', BATCH_SIZE],
+                    )
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+                    update_batch(cursor, table, [
+                        transform(*row) for row in rows
+                    ])
+
+
+def encrypt_requisites(apps, schema_editor):
+    """Шифрует открытые номера и заполняет их хэши."""
+    transform_batches(
+        schema_editor.connection,
+        'card_number_hash = %s AND account_number_hash = %s '
+        'AND (card_number <> %s OR account_number <> %s)',
+        lambda payout_uid, card, account: (
+            payout_uid,
+            card and encrypt(card),
+            account and encrypt(account),
+            blind_index('card_number', card),
+            blind_index('account_number', account),
+        ),
+    )
+
+
+def decrypt_requisites(apps, schema_editor):
+    transform_batches(
+        schema_editor.connection,
+        '(card_number_hash <> %s OR account_number_hash <> %s) '
+        'AND (card_number <> %s OR account_number <> %s)',
+        lambda payout_uid, card, account: (
+            payout_uid,
+            card and decrypt(card),
+            account and decrypt(account),
+            '',
+            '',
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('payouts', '0019_payout_encrypted_requisites'),
+    ]
+
+    operations = [
+        migrations.RunPython(encrypt_requisites, decrypt_requisites),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:34
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('payouts', '0020_payout_encrypt_requisites'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='payout',
+            index=django.contrib.postgres.indexes.HashIndex(fields=['card_number_hash'], name='payout_card_hash_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='payout',
+            index=django.contrib.postgres.indexes.HashIndex(fields=['account_number_hash'], name='payout_account_hash_idx'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.db import migrations
+from django.utils import timezone
+
+
+TABLE = 'payouts_payoutstatusevent'
+DEFAULT = 'payouts_payoutstatusevent_default'
+MONTHS_AHEAD = 1
+
+HAS_DEFAULT_ROWS = (
+    f'SELECT EXISTS (SELECT 1 FROM {DEFAULT} '
+    f'WHERE created_at >= %s AND created_at < %s)'
+)
+DETACH_DEFAULT = f'ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT}'
+ATTACH_DEFAULT = f'ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT} DEFAULT'
+CREATE_PARTITION = (
+    'CREATE TABLE {name} PARTITION OF ' + TABLE +
+    ' FOR VALUES FROM (%s) TO (%s)'
+)
+MOVE_DEFAULT_ROWS = (
+    'WITH rows AS (DELETE FROM ' + DEFAULT +
+    ' WHERE created_at >= %s AND created_at < %s RETURNING *) '
+    'INSERT INTO {name} SELECT * FROM rows'
+)
+
+
+def month_bounds(month_index):
+    lower = date(month_index // 12, month_index % 12 + 1, 1)
+    upper = date((month_index + 1) // 12, (month_index + 1) % 12 + 1, 1)
+    return tuple(
+        datetime.combine(bound, datetime.min.time(), dt_timezone.utc)
+        for bound in (lower, upper)
+    )
+
+
+def create_partitions(apps, schema_editor):
+    """
+    Создаёт секции журнала на текущий и следующий месяц.
+
+    Секции создаются сразу, чтобы события не копились в DEFAULT
+    до первого запуска maintain_status_event_partitions_task. Строки
+    месяца, уже попавшие в DEFAULT, переносятся в новую секцию.
+    DDL записан здесь, а не берётся из payouts.partitions, чтобы
+    миграция не менялась вместе с кодом приложения.
+    """
+    today = timezone.now().date()
+    current = today.year * 12 + today.month - 1
+    with schema_editor.connection.cursor() as cursor:
+        for month_index in range(current, current + MONTHS_AHEAD + 1):
+            lower, upper = month_bounds(month_index)
+            name = f'{TABLE}_y{lower.year}m{lower.month:02d}'
+            cursor.execute('SELECT to_regclass(%s)', [name])
+            if cursor.fetchone()[0] is not None:
+                continue
+            cursor.execute(HAS_DEFAULT_ROWS, [lower, upper])
+            moved = cursor.fetchone()[0]
+            if moved:
+                cursor.execute(DETACH_DEFAULT)
+            cursor.execute(
+                CREATE_PARTITION.format(name=name), [lower, upper]
+            )
+            if moved:
+                cursor.execute(
+                    MOVE_DEFAULT_ROWS.format(name=name), [lower, upper]
+                )
+                cursor.execute(ATTACH_DEFAULT)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0021_payout_requisite_hash_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_partitions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations
+
+from payouts.encryption import decrypt, encrypt
+
+
+BATCH_SIZE = 1000
+SEALED_FIELDS = ('card_number', 'account_number')
+
+
+def transform_responses(apps, transform):
+    IdempotencyKey = apps.get_model('payouts', 'IdempotencyKey')
+    last_id = 0
+    while True:
+        keys = list(
+            IdempotencyKey.objects.filter(id__gt=last_id)
+            .order_by('id')[:BATCH_SIZE]
+        )
+        if not keys:
+            return
+        for item in keys:
+            if isinstance(item.response_body, dict):
+                item.response_body = {
+                    name: transform(value)
+                    if name in SEALED_FIELDS and isinstance(value, str)
+                    and value
+                    else value
+                    for name, value in item.response_body.items()
+                }
+        IdempotencyKey.objects.bulk_update(keys, ['response_body'])
+        last_id = keys[-1].id
+
+
+def seal_responses(apps, schema_editor):
+    """Шифрует реквизиты в уже сохранённых ответах."""
+    transform_responses(apps, encrypt)
+
+
+def open_responses(apps, schema_editor):
+    transform_responses(apps, decrypt)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payouts', '0022_payoutstatusevent_initial_partitions'),
+    ]
+
+    operations = [
+        migrations.RunPython(seal_responses, open_responses),
+    ]
@@ -1,11 +1,15 @@
 from decimal import Decimal
 import uuid
 
+from django.contrib.postgres.indexes import HashIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from phonenumber_field.modelfields import PhoneNumberField
 
 import payouts.constants as constants
+from .fields import BlindIndexField, BlindIndexQuerySet, EncryptedCharField
 
 
 class CurrencyChoice(models.TextChoices):
@@ -22,6 +26,22 @@ class StatusChoice(models.TextChoices):
     COMPLETED = 'completed', 'Выполнена'
     REJECTED = 'rejected', 'Отклонена'
     CANCELLED = 'cancelled', 'Отменена'
+    FAILED = 'failed', 'Не обработана'
+
+
+TERMINAL_STATUSES = (
+    StatusChoice.COMPLETED,
+    StatusChoice.REJECTED,
+    StatusChoice.CANCELLED,
+)
+ACTIVE_STATUSES = (
+    StatusChoice.PENDING,
+    StatusChoice.APPROVED,
+    StatusChoice.PROCESSING,
+)
+# Статусы, из которых заявка не выходит без оператора: конечные и failed,
+# который не архивируется, потому что его можно вернуть в pending
+SETTLED_STATUSES = (*TERMINAL_STATUSES, StatusChoice.FAILED)
 
 
 class PaymentMethodChoice(models.TextChoices):
@@ -29,8 +49,8 @@ class PaymentMethodChoice(models.TextChoices):
     CARD_TRANSFER = 'card', 'Перевод на карту'
 
 
-class Payout(models.Model):
-    """Модель заявки на выплату."""
+class PayoutBase(models.Model):
+    """Общие поля заявки на выплату и её архивной копии."""
 
     payout_uid = models.UUIDField(
         default=uuid.uuid4,
@@ -72,12 +92,12 @@ class Payout(models.Model):
         help_text='Банковский идентификационный код',
         blank=True
     )
-    card_number = models.CharField(
+    card_number = EncryptedCharField(
         max_length=constants.MAX_CARD_NUMBER,
         verbose_name="Номер карты",
         blank=True
     )
-    account_number = models.CharField(
+    account_number = EncryptedCharField(
         max_length=constants.MAX_ACCOUNT_NUMBER,
         verbose_name="Номер счёта",
         blank=True
@@ -100,6 +120,60 @@ class Payout(models.Model):
         auto_now=True,
         verbose_name='Дата обновления'
     )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попытки обработки',
+        help_text='Сколько раз заявка забиралась в обработку'
+    )
+    retry_count = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Повторы',
+        help_text='Сколько раз вызов провайдера повторялся после ошибки'
+    )
+    validation_fingerprint = models.CharField(
+        max_length=constants.MAX_VALIDATION_FINGERPRINT,
+        blank=True,
+        editable=False,
+        verbose_name='Отпечаток проверки реквизитов',
+    )
+    card_number_hash = BlindIndexField(
+        'card_number',
+        max_length=constants.MAX_BLIND_INDEX,
+        verbose_name='Хэш номера карты',
+    )
+    account_number_hash = BlindIndexField(
+        'account_number',
+        max_length=constants.MAX_BLIND_INDEX,
+        verbose_name='Хэш номера счёта',
+    )
+
+    objects = BlindIndexQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, **kwargs):
+        # Хэш сохраняется вместе со своим полем и при update_fields
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            update_fields |= {
+                field.attname for field in self._meta.concrete_fields
+                if isinstance(field, BlindIndexField)
+                and field.source in update_fields
+            }
+            kwargs['update_fields'] = update_fields
+        super().save(**kwargs)
+
+    def __str__(self):
+        return (
+            f'Заявка {self.payout_uid} на сумму {self.amount}'
+            f'{self.currency} - Статус: {self.status}'
+        )
+
+
+class Payout(PayoutBase):
+    """Модель заявки на выплату."""
 
     class Meta:
         ordering = ['-created_at']
@@ -107,12 +181,233 @@ class Payout(models.Model):
             models.Index(fields=["status", "currency"]),
             models.Index(fields=["method"]),
             models.Index(fields=["created_at"]),
+            models.Index(fields=["created_at", "payout_uid"]),
+            models.Index(fields=["updated_at"]),
+            # Частичные индексы по активным заявкам для воркера: их размер
+            # не растёт вместе с числом завершённых выплат.
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+                name="payout_active_created_idx",
+            ),
+            models.Index(
+                fields=["status", "updated_at"],
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+                name="payout_active_updated_idx",
+            ),
+            models.Index(
+                fields=["status", "currency", "method"],
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+                name="payout_active_queue_idx",
+            ),
+            # Индексы поиска в админке: точное совпадение реквизитов,
+            # префиксы телефона и названия банка без учёта регистра.
+            HashIndex(
+                fields=["card_number_hash"],
+                name="payout_card_hash_idx",
+            ),
+            HashIndex(
+                fields=["account_number_hash"],
+                name="payout_account_hash_idx",
+            ),
+            models.Index(fields=["bank_bik"], name="payout_bank_bik_idx"),
+            models.Index(
+                fields=["phone"],
+                name="payout_phone_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            models.Index(
+                OpClass(Upper("bank_name"), name="text_pattern_ops"),
+                name="payout_bank_name_prefix_idx",
+            ),
         ]
         verbose_name = "Заявка на выплату"
         verbose_name_plural = "Заявки на выплату"
 
+
+class PayoutArchive(PayoutBase):
+    """
+    Архивная копия завершённой заявки на выплату.
+
+    Таблица секционирована по месяцу created_at; первичный ключ в БД
+    составной (payout_uid, created_at).
+    """
+
+    archived_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Дата архивации'
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=["created_at", "payout_uid"]),
+        ]
+        verbose_name = "Архивная заявка на выплату"
+        verbose_name_plural = "Архив заявок на выплату"
+
+
+class PayoutOutbox(models.Model):
+    """Исходящее сообщение на постановку заявки в обработку."""
+
+    payout_uid = models.UUIDField(verbose_name="UUID заявки")
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = "Сообщение outbox"
+        verbose_name_plural = "Сообщения outbox"
+
+    def __str__(self):
+        return f'Outbox {self.id} для заявки {self.payout_uid}'
+
+
+class IdempotencyKey(models.Model):
+    """Сохранённый ответ на запрос создания с ключом идемпотентности."""
+
+    key = models.CharField(
+        max_length=constants.MAX_IDEMPOTENCY_KEY,
+        unique=True,
+        verbose_name='Ключ идемпотентности'
+    )
+    request_hash = models.CharField(
+        max_length=64,
+        verbose_name='Хэш тела запроса'
+    )
+    status_code = models.PositiveSmallIntegerField(
+        verbose_name='HTTP-статус ответа'
+    )
+    response_body = models.JSONField(verbose_name='Тело ответа')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания',
+        db_index=True
+    )
+
+    class Meta:
+        verbose_name = "Ключ идемпотентности"
+        verbose_name_plural = "Ключи идемпотентности"
+
+    def __str__(self):
+        return f'Ключ {self.key} ({self.status_code})'
+
+
+class PayoutStatusEvent(models.Model):
+    """
+    Запись журнала смены статуса заявки.
+
+    Таблица секционирована по месяцам created_at (PARTITION BY RANGE)
+    и только дополняется; старые секции отсоединяются командой
+    manage_status_event_partitions.
+    """
+
+    payout_uid = models.UUIDField(verbose_name="UUID заявки")
+    from_status = models.CharField(
+        choices=StatusChoice.choices,
+        verbose_name='Предыдущий статус',
+    )
+    to_status = models.CharField(
+        choices=StatusChoice.choices,
+        verbose_name='Новый статус',
+    )
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Дата перехода'
+    )
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=["payout_uid", "created_at"]),
+        ]
+        verbose_name = "Смена статуса заявки"
+        verbose_name_plural = "Журнал статусов заявок"
+
     def __str__(self):
         return (
-            f'Заявка {self.payout_uid} на сумму {self.amount}'
-            f'{self.currency} - Статус: {self.status}'
+            f'Заявка {self.payout_uid}: '
+            f'{self.from_status} -> {self.to_status}'
         )
+
+
+class PayoutDailyStat(models.Model):
+    """
+    Дневной итог по заявкам в разрезе статуса, валюты и способа.
+
+    Обновляется инкрементально при создании, смене статуса и удалении
+    заявок; день считается по created_at в часовом поясе TIME_ZONE.
+    """
+
+    day = models.DateField(verbose_name='День создания заявок')
+    status = models.CharField(
+        choices=StatusChoice.choices,
+        verbose_name='Статус заявки',
+    )
+    currency = models.CharField(
+        choices=CurrencyChoice.choices,
+        verbose_name="Валюта",
+    )
+    method = models.CharField(
+        choices=PaymentMethodChoice.choices,
+        verbose_name="Способ выплаты",
+    )
+    count = models.BigIntegerField(default=0, verbose_name='Количество')
+    amount = models.DecimalField(
+        max_digits=constants.MAX_DIGITS_STAT_AMOUNT,
+        decimal_places=constants.MAX_DECIMAL_PLACES,
+        default=0,
+        verbose_name='Сумма',
+    )
+
+    class Meta:
+        ordering = ['day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'status', 'currency', 'method'],
+                name='payout_daily_stat_key',
+            ),
+        ]
+        verbose_name = "Дневной итог по заявкам"
+        verbose_name_plural = "Дневные итоги по заявкам"
+
+    def __str__(self):
+        return (
+            f'{self.day} {self.status} {self.currency} {self.method}: '
+            f'{self.count} / {self.amount}'
+        )
+
+
+class FxRate(models.Model):
+    """
+    Курс валюты к базовой валюте PAYOUT_FX_BASE_CURRENCY на дату.
+
+    Курс действует с day до следующего снимка той же валюты.
+    """
+
+    day = models.DateField(verbose_name='Дата курса')
+    currency = models.CharField(
+        choices=CurrencyChoice.choices,
+        verbose_name="Валюта",
+    )
+    rate = models.DecimalField(
+        max_digits=constants.MAX_DIGITS_FX_RATE,
+        decimal_places=constants.FX_RATE_DECIMAL_PLACES,
+        verbose_name='Стоимость единицы валюты в базовой валюте',
+    )
+
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['currency', 'day'],
+                name='fx_rate_currency_day_key',
+            ),
+        ]
+        verbose_name = "Курс валюты"
+        verbose_name_plural = "Курсы валют"
+
+    def __str__(self):
+        return f'{self.day} {self.currency}: {self.rate}'
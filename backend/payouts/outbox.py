@@ -0,0 +1,48 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import metrics
+from .models import PayoutOutbox
+from .services import enqueue_payouts
+
+
+logger = logging.getLogger(__name__)
+
+
+def relay_outbox(batch_size=None):
+    """
+    Отправляет пачку сообщений outbox в брокер.
+
+    Сообщения блокируются с SKIP LOCKED и удаляются в той же транзакции,
+    в которой ставятся задачи, поэтому несколько relay не дублируют друг
+    друга, а при ошибке брокера сообщения остаются в таблице.
+    """
+    batch_size = batch_size or settings.PAYOUT_OUTBOX_BATCH_SIZE
+    with transaction.atomic():
+        messages = list(
+            PayoutOutbox.objects.select_for_update(skip_locked=True)
+            .values_list('id', 'payout_uid')[:batch_size]
+        )
+        if messages:
+            ids, payout_uids = zip(*messages)
+            enqueue_payouts(payout_uids)
+            PayoutOutbox.objects.filter(id__in=ids).delete()
+    metrics.set_value('payout_outbox_last_batch_size', len(messages))
+    if messages:
+        metrics.incr('payout_outbox_relayed_total', len(messages))
+        logger.info(f"Relay отправил {len(messages)} сообщений outbox")
+    return len(messages)
+
+
+def collect_outbox_lag():
+    oldest = PayoutOutbox.objects.values_list('created_at', flat=True).first()
+    if oldest is None:
+        return [({}, 0)]
+    return [({}, round((timezone.now() - oldest).total_seconds(), 3))]
+
+
+def collect_outbox_pending():
+    return [({}, PayoutOutbox.objects.count())]
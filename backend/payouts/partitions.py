@@ -0,0 +1,139 @@
+import re
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+
+PARTITION_SUFFIX = re.compile(r'_y(\d{4})m(\d{2})$')
+
+
+def month_start(day, shift=0):
+    """Первый день месяца, сдвинутого на shift месяцев от day."""
+    month_index = day.year * 12 + day.month - 1 + shift
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f'{table}_y{month.year}m{month.month:02d}'
+
+
+def list_partitions(table):
+    """Возвращает {первый день месяца: имя секции} для помесячных секций."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE parent.relname = %s',
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = PARTITION_SUFFIX.search(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def default_partition(table):
+    """Имя секции DEFAULT таблицы table или None."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_partitioned_table parent '
+            'JOIN pg_class child ON child.oid = parent.partdefid '
+            'WHERE parent.partrelid = %s::regclass',
+            [table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def create_partition(table, month):
+    """
+    Создаёт секцию table за месяц month, если её ещё нет.
+
+    Строки месяца, уже попавшие в секцию DEFAULT, переносятся в новую
+    секцию: иначе PostgreSQL отказывает в создании секции, потому что
+    DEFAULT перестала бы соответствовать своему ограничению. На время
+    переноса DEFAULT отсоединяется в той же транзакции.
+    """
+    name = partition_name(table, month)
+    lower, upper = (
+        datetime.combine(bound, datetime.min.time(), dt_timezone.utc)
+        for bound in (month, month_start(month, 1))
+    )
+    quote_name = connection.ops.quote_name
+    default = default_partition(table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s)', [name])
+        if cursor.fetchone()[0] is not None:
+            return name
+        moved = False
+        if default is not None:
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM {quote_name(default)} '
+                f'WHERE created_at >= %s AND created_at < %s)',
+                [lower, upper],
+            )
+            moved = cursor.fetchone()[0]
+        if moved:
+            cursor.execute(
+                f'ALTER TABLE {quote_name(table)} '
+                f'DETACH PARTITION {quote_name(default)}'
+            )
+        cursor.execute(
+            f'CREATE TABLE {quote_name(name)} '
+            f'PARTITION OF {quote_name(table)} '
+            f'FOR VALUES FROM (%s) TO (%s)',
+            [lower, upper],
+        )
+        if moved:
+            cursor.execute(
+                f'WITH rows AS (DELETE FROM {quote_name(default)} '
+                f'WHERE created_at >= %s AND created_at < %s RETURNING *) '
+                f'INSERT INTO {quote_name(name)} SELECT * FROM rows',
+                [lower, upper],
+            )
+            cursor.execute(
+                f'ALTER TABLE {quote_name(table)} '
+                f'ATTACH PARTITION {quote_name(default)} DEFAULT'
+            )
+    return name
+
+
+def ensure_partitions(table, months_ahead=2):
+    """Создаёт секции с текущего месяца на months_ahead месяцев вперёд."""
+    existing = list_partitions(table)
+    current = month_start(timezone.now().date())
+    return [
+        create_partition(table, month_start(current, shift))
+        for shift in range(months_ahead + 1)
+        if month_start(current, shift) not in existing
+    ]
+
+
+def detach_partitions(table, retain_months, drop=False):
+    """
+    Отсоединяет секции старше retain_months месяцев.
+
+    Отсоединение секции не переписывает строки, в отличие от DELETE.
+    Отсоединённые таблицы остаются в БД для архивации, если не
+    передан drop.
+    """
+    oldest_kept = month_start(timezone.now().date(), -retain_months)
+    quote_name = connection.ops.quote_name
+    detached = []
+    for month, name in sorted(list_partitions(table).items()):
+        if month >= oldest_kept:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'ALTER TABLE {quote_name(table)} '
+                f'DETACH PARTITION {quote_name(name)}'
+            )
+            if drop:
+                cursor.execute(f'DROP TABLE {quote_name(name)}')
+        detached.append(name)
+    return detached
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import random
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Payout, StatusChoice
+from .providers import (
+    PermanentProviderError,
+    TransientProviderError,
+    get_provider
+)
+from .routing import route_queue
+from .transitions import apply_transitions, transition
+from .validators import (
+    payout_fingerprint,
+    payout_requisites,
+    validate_requisites
+)
+
+
+logger = logging.getLogger(__name__)
+
+PROCESSABLE_STATUSES = (StatusChoice.PENDING, StatusChoice.APPROVED)
+TRANSIENT_ERRORS = (TransientProviderError, TimeoutError, ConnectionError)
+
+
+def check_payout(payout):
+    """
+    Возвращает причину отклонения заявки или None.
+
+    Реквизиты, уже проверенные API, повторно не проверяются, если
+    отпечаток проверки совпадает с текущими реквизитами заявки;
+    сравнение идёт по сохранённым хэшам, без расшифровки и HMAC.
+    """
+    if payout.amount <= 0:
+        return "сумма <= 0"
+    if payout.validation_fingerprint == payout_fingerprint(payout):
+        return None
+    errors = validate_requisites(**payout_requisites(payout))
+    if errors:
+        return "; ".join(errors.values())
+    return None
+
+
+def retry_delay(retries):
+    """Экспоненциальная задержка повтора с джиттером, в секундах."""
+    delay = min(
+        settings.PAYOUT_RETRY_BACKOFF_BASE * 2 ** retries,
+        settings.PAYOUT_RETRY_BACKOFF_MAX,
+    )
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+async def process_one(provider, semaphore, payout):
+    """
+    Отправляет одну выплату провайдеру и возвращает итоговый статус.
+
+    Отказ провайдера сразу отклоняет заявку. При временной ошибке
+    возвращается processing: заявка остаётся за воркером до повтора.
+    """
+    try:
+        async with semaphore:
+            await provider.send_payout(payout)
+    except PermanentProviderError as exc:
+        logger.warning(
+            f"Заявка {payout.payout_uid} отклонена провайдером: {exc}"
+        )
+        return StatusChoice.REJECTED
+    except TRANSIENT_ERRORS as exc:
+        logger.warning(
+            f"Временная ошибка провайдера по заявке "
+            f"{payout.payout_uid}: {exc!r}"
+        )
+        return StatusChoice.PROCESSING
+    logger.info(f"Заявка {payout.payout_uid} успешно обработана")
+    return StatusChoice.COMPLETED
+
+
+async def run_batch(provider, payouts, concurrency=None):
+    """
+    Обрабатывает пачку выплат конкурентно в одном цикле событий.
+
+    Одновременно к провайдеру уходит не более concurrency запросов,
+    поэтому один процесс воркера держит тысячи вызовов в полёте
+    вместо одного блокирующего ожидания на заявку.
+    """
+    semaphore = asyncio.Semaphore(
+        concurrency or settings.PAYOUT_PROCESSOR_CONCURRENCY
+    )
+    statuses = await asyncio.gather(*(
+        process_one(provider, semaphore, payout) for payout in payouts
+    ))
+    return dict(zip((payout.payout_uid for payout in payouts), statuses))
+
+
+def reject_invalid(payouts):
+    """Отклоняет заявки с некорректными реквизитами, возвращает остальные."""
+    valid = []
+    rejected = {}
+    for payout in payouts:
+        reason = check_payout(payout)
+        if reason:
+            logger.warning(f"Заявка {payout.payout_uid} отклонена: {reason}")
+            rejected[payout.payout_uid] = StatusChoice.REJECTED
+        else:
+            valid.append(payout)
+    apply_transitions(rejected)
+    return valid
+
+
+def claim_payouts(payout_uids=None, limit=None, throttle=None,
+                  retry=False, queue=None):
+    """
+    Атомарно забирает заявки в обработку.
+
+    Строки блокируются через SELECT ... FOR UPDATE SKIP LOCKED и сразу
+    переводятся в статус processing, поэтому параллельные воркеры
+    на разных узлах никогда не получат одну и ту же заявку. Заявки
+    забираются в порядке создания по частичному индексу активных заявок.
+    Если передан throttle, забираются только заявки, пропущенные лимитами
+    провайдеров, остальные остаются в исходном статусе. Заявки
+    с некорректными реквизитами отклоняются здесь же, до перевода
+    в processing и вызова провайдера. При retry
+    повторно забираются заявки, оставленные в processing после
+    временной ошибки. С queue забираются только заявки, которые правила
+    маршрутизации направляют в эту очередь.
+    """
+    queryset = Payout.objects.filter(
+        status__in=[StatusChoice.PROCESSING] if retry
+        else PROCESSABLE_STATUSES
+    )
+    if payout_uids is not None:
+        queryset = queryset.filter(pk__in=payout_uids)
+    if queue is not None:
+        queryset = queryset.alias(queue=route_queue()).filter(queue=queue)
+    queryset = queryset.order_by('created_at').select_for_update(
+        skip_locked=True
+    )
+    if limit:
+        queryset = queryset[:limit]
+    with transaction.atomic():
+        payouts = reject_invalid(list(queryset))
+        if throttle is not None:
+            payouts = throttle.admit(payouts)
+        payout_uids = [payout.payout_uid for payout in payouts]
+        if retry:
+            # Продлевает видимость заявок, чтобы их не забрал reaper
+            Payout.objects.filter(pk__in=payout_uids).update(
+                updated_at=timezone.now()
+            )
+        else:
+            transition(payout_uids, StatusChoice.PROCESSING)
+    for payout in payouts:
+        payout.status = StatusChoice.PROCESSING
+    return payouts
+
+
+def process_claimed(payouts, provider=None, concurrency=None):
+    """
+    Вызывает провайдера для забранных заявок и сохраняет итог.
+
+    Итоговые статусы пишутся одним условным UPDATE из processing,
+    поэтому блокировки на время вызова провайдера не удерживаются.
+    Заявки с временной ошибкой остаются в processing с увеличенным
+    retry_count, а исчерпавшие PAYOUT_MAX_RETRIES переводятся в failed.
+    """
+    logger.info(f"Начата обработка {len(payouts)} заявок")
+    statuses = asyncio.run(
+        run_batch(provider or get_provider(), payouts, concurrency)
+    )
+    retry = []
+    for payout in payouts:
+        if statuses[payout.payout_uid] != StatusChoice.PROCESSING:
+            continue
+        if payout.retry_count >= settings.PAYOUT_MAX_RETRIES:
+            logger.warning(
+                f"Заявка {payout.payout_uid} переведена в failed после "
+                f"{payout.retry_count} повторов"
+            )
+            statuses[payout.payout_uid] = StatusChoice.FAILED
+        else:
+            retry.append(payout.payout_uid)
+    final = {
+        payout_uid: status for payout_uid, status in statuses.items()
+        if status != StatusChoice.PROCESSING
+    }
+    with transaction.atomic():
+        moved = apply_transitions(final)
+        Payout.objects.filter(
+            pk__in=retry, status=StatusChoice.PROCESSING
+        ).update(retry_count=F('retry_count') + 1, updated_at=timezone.now())
+    if len(moved) != len(final):
+        logger.warning(
+            f"Статус изменён параллельно для "
+            f"{len(final) - len(moved)} заявок, итог не записан"
+        )
+    for payout in payouts:
+        payout.status = statuses[payout.payout_uid]
+    return statuses
+
+
+def process_payouts(payout_uids, provider=None, concurrency=None,
+                    throttle=None, retry=False):
+    """Забирает указанные заявки в обработку и обрабатывает их."""
+    payouts = claim_payouts(payout_uids, throttle=throttle, retry=retry)
+    if not payouts:
+        if throttle is None or not throttle.deferred:
+            logger.error(f"Заявки для обработки не найдены: {payout_uids}")
+        return {}
+    return process_claimed(payouts, provider, concurrency)
+
+
+def process_pending_payouts(limit=None, provider=None, concurrency=None,
+                            throttle=None, queue=None):
+    """Забирает до limit ожидающих заявок очереди queue и обрабатывает их."""
+    payouts = claim_payouts(
+        limit=limit or settings.PAYOUT_CLAIM_BATCH_SIZE,
+        throttle=throttle,
+        queue=queue,
+    )
+    if not payouts:
+        return {}
+    return process_claimed(payouts, provider, concurrency)
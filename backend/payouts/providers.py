@@ -0,0 +1,69 @@
+import asyncio
+import random
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class ProviderError(Exception):
+    """Ошибка вызова провайдера."""
+
+
+class TransientProviderError(ProviderError):
+    """Временная ошибка провайдера, вызов можно повторить."""
+
+
+class PermanentProviderError(ProviderError):
+    """Провайдер окончательно отклонил выплату."""
+
+
+class BaseProvider:
+    """Базовый асинхронный клиент платёжного провайдера."""
+
+    async def send_payout(self, payout):
+        """Отправляет выплату провайдеру."""
+        raise NotImplementedError
+
+
+class FakeProvider(BaseProvider):
+    """Локальный провайдер с настраиваемой задержкой ответа."""
+
+    def __init__(self, latency=None):
+        if latency is None:
+            latency = settings.PAYOUT_FAKE_PROVIDER_LATENCY
+        self.latency = latency
+
+    async def send_payout(self, payout):
+        await asyncio.sleep(self.latency)
+
+
+class FaultyProvider(FakeProvider):
+    """
+    Локальный провайдер, отвечающий случайными ошибками.
+
+    Используется для нагрузочной проверки повторов: доля failure_rate
+    вызовов завершается временной ошибкой, permanent_rate — постоянной.
+    """
+
+    def __init__(self, latency=None, failure_rate=None, permanent_rate=0.0,
+                 seed=None):
+        super().__init__(latency)
+        if failure_rate is None:
+            failure_rate = settings.PAYOUT_FAKE_PROVIDER_FAILURE_RATE
+        self.failure_rate = failure_rate
+        self.permanent_rate = permanent_rate
+        self.random = random.Random(seed)
+
+    async def send_payout(self, payout):
+        await super().send_payout(payout)
+        roll = self.random.random()
+        if roll < self.permanent_rate:
+            raise PermanentProviderError("провайдер отклонил выплату")
+        if roll < self.permanent_rate + self.failure_rate:
+            raise TransientProviderError("провайдер временно недоступен")
+
+
+def get_provider():
+    """Возвращает клиент провайдера из настройки PAYOUT_PROVIDER_CLASS."""
+    provider_class = import_string(settings.PAYOUT_PROVIDER_CLASS)
+    return provider_class(**settings.PAYOUT_PROVIDER_OPTIONS)
@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import ACTIVE_STATUSES, Payout, StatusChoice
+
+
+def stuck_payouts(older_than=None, statuses=ACTIVE_STATUSES):
+    """
+    Возвращает активные заявки, не менявшиеся дольше older_than секунд.
+
+    Запрос обслуживается частичным индексом payout_active_updated_idx.
+    """
+    if older_than is None:
+        older_than = settings.PAYOUT_STUCK_AFTER
+    threshold = timezone.now() - timedelta(seconds=older_than)
+    return Payout.objects.filter(
+        status__in=statuses, updated_at__lt=threshold
+    ).order_by('updated_at')
+
+
+def queue_depth():
+    """
+    Количество активных заявок по статусу, валюте и способу выплаты.
+
+    Запрос обслуживается частичным индексом payout_active_queue_idx.
+    """
+    return (
+        Payout.objects.filter(status__in=ACTIVE_STATUSES)
+        .order_by()
+        .values('status', 'currency', 'method')
+        .annotate(count=Count('*'))
+    )
+
+
+def collect_queue_depth():
+    return [
+        (
+            {
+                'status': row['status'],
+                'currency': row['currency'],
+                'method': row['method'],
+            },
+            row['count'],
+        )
+        for row in queue_depth()
+    ]
+
+
+def collect_stuck_payouts():
+    counts = dict(
+        stuck_payouts().order_by().values('status')
+        .annotate(count=Count('*')).values_list('status', 'count')
+    )
+    return [
+        ({'status': status}, counts.get(status, 0))
+        for status in ACTIVE_STATUSES
+    ]
+
+
+def collect_failed_payouts():
+    """Заявки в failed по валютам, по индексу (status, currency)."""
+    return [
+        ({'currency': currency}, count)
+        for currency, count in Payout.objects.filter(
+            status=StatusChoice.FAILED
+        ).order_by().values('currency').annotate(
+            count=Count('*')
+        ).values_list('currency', 'count')
+    ]
@@ -0,0 +1,41 @@
+import pickle
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import metrics
+from .encryption import open_body, seal_body
+
+
+def _cache():
+    return caches['payouts']
+
+
+def get_payout(payout_uid):
+    """Возвращает закэшированный ответ по заявке или None."""
+    data = _cache().get(str(payout_uid))
+    metrics.incr(
+        'payout_cache_misses_total' if data is None
+        else 'payout_cache_hits_total'
+    )
+    return open_body(data)
+
+
+def set_payout(payout_uid, data):
+    """
+    Кэширует ответ по заявке, если он не превышает лимит размера.
+
+    Номера карты и счёта хранятся в кэше зашифрованными.
+    """
+    data = seal_body(data)
+    if len(pickle.dumps(data)) > settings.PAYOUT_CACHE_MAX_ENTRY_BYTES:
+        metrics.incr('payout_cache_skipped_total')
+        return
+    _cache().set(str(payout_uid), data)
+
+
+def invalidate_payouts(payout_uids):
+    """Сбрасывает кэш заявок после смены статуса или удаления."""
+    keys = [str(payout_uid) for payout_uid in payout_uids]
+    if keys:
+        _cache().delete_many(keys)
@@ -0,0 +1,68 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import metrics
+from .models import Payout, StatusChoice
+from .services import enqueue_payouts
+from .transitions import apply_transitions
+
+
+logger = logging.getLogger(__name__)
+
+
+def reap_stuck_payouts(visibility_timeout=None, max_attempts=None,
+                       batch_size=None):
+    """
+    Возвращает в очередь заявки, зависшие в статусе processing.
+
+    Заявка считается потерянной воркером, если её статус не менялся
+    дольше visibility_timeout секунд. Такие заявки пачкой переводятся
+    в pending и ставятся в очередь заново, а исчерпавшие max_attempts
+    попыток переводятся в failed. Поиск идёт по частичному индексу
+    (status, updated_at) активных заявок, поэтому частый запуск дёшев
+    и на большой таблице.
+    """
+    if visibility_timeout is None:
+        visibility_timeout = settings.PAYOUT_VISIBILITY_TIMEOUT
+    max_attempts = max_attempts or settings.PAYOUT_MAX_ATTEMPTS
+    batch_size = batch_size or settings.PAYOUT_REAPER_BATCH_SIZE
+    threshold = timezone.now() - timedelta(seconds=visibility_timeout)
+    with transaction.atomic():
+        stuck = list(
+            Payout.objects.filter(
+                status=StatusChoice.PROCESSING, updated_at__lt=threshold
+            )
+            .order_by('updated_at')
+            .select_for_update(skip_locked=True)
+            .values_list('payout_uid', 'attempts')[:batch_size]
+        )
+        moved = apply_transitions(
+            {
+                payout_uid: (
+                    StatusChoice.FAILED if attempts >= max_attempts
+                    else StatusChoice.PENDING
+                )
+                for payout_uid, attempts in stuck
+            },
+            sources=[StatusChoice.PROCESSING],
+        )
+        requeued = [
+            payout_uid for payout_uid, status in moved.items()
+            if status == StatusChoice.PENDING
+        ]
+        if requeued:
+            transaction.on_commit(lambda: enqueue_payouts(requeued))
+    failed = len(moved) - len(requeued)
+    if requeued:
+        metrics.incr('payouts_reaped_total', len(requeued), result='requeued')
+    if failed:
+        metrics.incr('payouts_reaped_total', failed, result='failed')
+        logger.warning(
+            f"{failed} заявок переведены в failed после {max_attempts} "
+            f"попыток обработки"
+        )
+    return {'requeued': len(requeued), 'failed': failed}
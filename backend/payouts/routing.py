@@ -0,0 +1,150 @@
+import logging
+from decimal import Decimal
+
+from celery import current_app
+from django.conf import settings
+from django.db.models import Case, CharField, Q, Value, When
+from kombu.exceptions import ChannelError, OperationalError
+
+from .fx import convert
+from .models import Payout
+
+
+logger = logging.getLogger(__name__)
+
+PAYOUT_TASKS = (
+    'payouts.tasks.process_payout_task',
+    'payouts.tasks.process_payout_batch_task',
+)
+
+
+def payout_queues():
+    """Все очереди обработки выплат из правил маршрутизации."""
+    queues = [settings.PAYOUT_DEFAULT_QUEUE]
+    for rule in settings.PAYOUT_ROUTES:
+        if rule['queue'] not in queues:
+            queues.append(rule['queue'])
+    return queues
+
+
+def match_rule(rule, method, currency, amount):
+    if 'method' in rule and method not in rule['method']:
+        return False
+    if 'currency' in rule and currency not in rule['currency']:
+        return False
+    if 'amount_min' in rule and amount < Decimal(rule['amount_min']):
+        return False
+    if 'amount_max' in rule and amount >= Decimal(rule['amount_max']):
+        return False
+    return True
+
+
+def rule_condition(rule):
+    """Условие правила маршрутизации для запроса к Payout."""
+    condition = Q(pk__isnull=False)
+    if 'method' in rule:
+        condition &= Q(method__in=rule['method'])
+    if 'currency' in rule:
+        condition &= Q(currency__in=rule['currency'])
+    if 'amount_min' in rule:
+        condition &= Q(amount__gte=Decimal(rule['amount_min']))
+    if 'amount_max' in rule:
+        condition &= Q(amount__lt=Decimal(rule['amount_max']))
+    return condition
+
+
+def route_queue():
+    """
+    Очередь заявки по PAYOUT_ROUTES, вычисляемая в SQL.
+
+    Как и в route_payout, очередь задаёт первое подходящее правило,
+    поэтому по выражению можно выбрать заявки одной очереди.
+    """
+    return Case(
+        *(
+            When(rule_condition(rule), then=Value(rule['queue']))
+            for rule in settings.PAYOUT_ROUTES
+        ),
+        default=Value(settings.PAYOUT_DEFAULT_QUEUE),
+        output_field=CharField(),
+    )
+
+
+def route_payout(method, currency, amount):
+    """
+    Возвращает (очередь, приоритет) для заявки.
+
+    Очередь выбирается первым подходящим правилом PAYOUT_ROUTES,
+    приоритет — по порогам суммы PAYOUT_PRIORITY_BANDS. Пороги
+    приоритета заданы в базовой валюте: сумма пересчитывается по
+    кэшированному курсу, без курса сравнивается исходная сумма.
+    В транспорте Redis меньшее значение приоритета обрабатывается раньше.
+    """
+    queue = next(
+        (
+            rule['queue'] for rule in settings.PAYOUT_ROUTES
+            if match_rule(rule, method, currency, amount)
+        ),
+        settings.PAYOUT_DEFAULT_QUEUE,
+    )
+    base_amount = convert(amount, currency) or amount
+    priority = next(
+        (
+            band_priority
+            for threshold, band_priority in settings.PAYOUT_PRIORITY_BANDS
+            if base_amount >= Decimal(threshold)
+        ),
+        settings.PAYOUT_DEFAULT_PRIORITY,
+    )
+    return queue, priority
+
+
+def route_payout_uids(payout_uids):
+    """Группирует заявки по (очередь, приоритет)."""
+    routes = {}
+    rows = Payout.objects.filter(pk__in=payout_uids).values_list(
+        'payout_uid', 'method', 'currency', 'amount'
+    )
+    for payout_uid, method, currency, amount in rows:
+        route = route_payout(method, currency, amount)
+        routes.setdefault(route, []).append(str(payout_uid))
+    return routes
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Роутер Celery для process_payout_task.
+
+    Пакетные задачи получают очередь явно в enqueue_payouts.
+    """
+    if name != PAYOUT_TASKS[0] or not args:
+        return None
+    routes = route_payout_uids([args[0]])
+    if not routes:
+        return None
+    (queue, priority), = routes
+    return {'queue': queue, 'priority': priority}
+
+
+def collect_broker_queue_depth():
+    """Количество сообщений в каждой очереди выплат брокера."""
+    samples = []
+    try:
+        with current_app.connection_for_read() as connection:
+            connection.ensure_connection(max_retries=0)
+            for queue in payout_queues():
+                # Пассивное объявление отсутствующей очереди закрывает
+                # канал, поэтому каждая очередь опрашивается в своём.
+                with connection.channel() as channel:
+                    try:
+                        declared = channel.queue_declare(
+                            queue=queue, passive=True
+                        )
+                    except ChannelError:
+                        count = 0
+                    else:
+                        count = declared.message_count
+                samples.append(({'queue': queue}, count))
+    except OperationalError as error:
+        logger.warning(f"Брокер недоступен для подсчёта очередей: {error}")
+    return samples
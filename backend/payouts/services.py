@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db import transaction
+
+from .models import Payout, PayoutOutbox
+from .routing import route_payout_uids
+from .stats import record_created
+from .tasks import process_payout_batch_task
+
+
+def enqueue_payouts(payout_uids, retry=False, countdown=None):
+    """
+    Отправляет заявки на обработку пачками задач Celery.
+
+    Заявки группируются по очереди и приоритету из правил
+    маршрутизации, каждая пачка содержит заявки одного маршрута.
+    С retry пачки повторяют обработку заявок, оставленных в processing
+    после временной ошибки.
+    """
+    chunk_size = settings.PAYOUT_DISPATCH_CHUNK_SIZE
+    routes = route_payout_uids(payout_uids)
+    for (queue, priority), route_uids in routes.items():
+        for start in range(0, len(route_uids), chunk_size):
+            process_payout_batch_task.apply_async(
+                args=[route_uids[start:start + chunk_size]],
+                kwargs={'retry': retry},
+                countdown=countdown,
+                queue=queue,
+                priority=priority,
+            )
+
+
+def bulk_create_payouts(items, chunk_size=None):
+    """
+    Создаёт заявки пачками через bulk_create.
+
+    Сигнал post_save при bulk_create не отправляется, поэтому сообщения
+    outbox и дневные итоги записываются явно в той же транзакции,
+    что и заявки.
+    """
+    chunk_size = chunk_size or settings.PAYOUT_BULK_CHUNK_SIZE
+    payouts = [Payout(**attrs) for attrs in items]
+    for start in range(0, len(payouts), chunk_size):
+        chunk = payouts[start:start + chunk_size]
+        with transaction.atomic():
+            Payout.objects.bulk_create(chunk)
+            PayoutOutbox.objects.bulk_create(
+                PayoutOutbox(payout_uid=payout.payout_uid) for payout in chunk
+            )
+            record_created(chunk)
+    return payouts
@@ -1,11 +1,22 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import Payout
-from .tasks import process_payout_task
+from .models import Payout, PayoutOutbox
+from .stats import record_created, record_deleted
 
 
 @receiver(post_save, sender=Payout)
-def run_payout_task(sender, instance, created, **kwargs):
+def write_payout_outbox(sender, instance, created, **kwargs):
     if created:
-        process_payout_task.delay(str(instance.payout_uid))
+        PayoutOutbox.objects.create(payout_uid=instance.payout_uid)
+
+
+@receiver(post_save, sender=Payout)
+def count_created_payout(sender, instance, created, **kwargs):
+    if created:
+        record_created([instance])
+
+
+@receiver(post_delete, sender=Payout)
+def count_deleted_payout(sender, instance, **kwargs):
+    record_deleted([instance])
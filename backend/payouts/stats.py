@@ -0,0 +1,256 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .fx import CENT, normalized_amount
+from .models import Payout, PayoutArchive, PayoutDailyStat
+
+
+# Измерения, по которым можно группировать итоги
+STAT_DIMENSIONS = ('day', 'status', 'currency', 'method')
+
+
+def quoted_table():
+    return connection.ops.quote_name(PayoutDailyStat._meta.db_table)
+
+
+def day_sql(column='created_at'):
+    """SQL-выражение дня создания заявки в часовом поясе TIME_ZONE."""
+    return f'({column} AT TIME ZONE %s)::date'
+
+
+def payout_day(created_at):
+    return timezone.localdate(
+        created_at, timezone.get_default_timezone()
+    )
+
+
+def upsert_sql(select_sql):
+    """
+    INSERT ... ON CONFLICT, прибавляющий строки select_sql к итогам.
+
+    select_sql возвращает столбцы day, status, currency, method, count,
+    amount. Строки должны быть упорядочены по ключу, чтобы параллельные
+    транзакции блокировали строки итогов в одном порядке.
+    """
+    return (
+        f'INSERT INTO {quoted_table()} AS s '
+        f'(day, status, currency, method, count, amount) {select_sql} '
+        f'ON CONFLICT (day, status, currency, method) DO UPDATE '
+        f'SET count = s.count + EXCLUDED.count, '
+        f'amount = s.amount + EXCLUDED.amount'
+    )
+
+
+def delta_sql(source):
+    """
+    SELECT изменений итогов для перехода статусов.
+
+    source — имя CTE со столбцами created_at, from_status, to_status,
+    currency, method, amount. Требует один параметр — TIME_ZONE.
+    """
+    return (
+        f'SELECT {day_sql()} AS day, status, currency, method, '
+        f'sum(count), sum(amount) FROM ('
+        f'SELECT created_at, from_status AS status, currency, method, '
+        f'-1 AS count, -amount AS amount FROM {source} '
+        f'UNION ALL '
+        f'SELECT created_at, to_status, currency, method, 1, amount '
+        f'FROM {source}) AS d '
+        f'GROUP BY 1, 2, 3, 4 ORDER BY 1, 2, 3, 4'
+    )
+
+
+def apply_deltas(deltas):
+    """
+    Прибавляет изменения к итогам одним INSERT ... ON CONFLICT.
+
+    deltas — последовательность (day, status, currency, method, count,
+    amount); изменения с одинаковым ключом суммируются заранее.
+    """
+    totals = defaultdict(lambda: [0, Decimal(0)])
+    for day, status, currency, method, count, amount in deltas:
+        total = totals[(day, str(status), str(currency), str(method))]
+        total[0] += count
+        total[1] += amount
+    if not totals:
+        return
+    rows = []
+    params = []
+    for key in sorted(totals):
+        rows.append('(%s::date, %s, %s, %s, %s::bigint, %s::numeric)')
+        params += [*key, *totals[key]]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            upsert_sql(f'VALUES {", ".join(rows)}'), params
+        )
+
+
+def payout_delta(payout, sign=1, status=None, method=None):
+    # amount может быть ещё не приведённым к Decimal значением из create()
+    amount = Decimal(str(payout.amount))
+    return (
+        payout_day(payout.created_at),
+        status or payout.status,
+        payout.currency,
+        method or payout.method,
+        sign,
+        sign * amount,
+    )
+
+
+def record_created(payouts):
+    """Учитывает в итогах новые заявки."""
+    apply_deltas(payout_delta(payout) for payout in payouts)
+
+
+def record_deleted(payouts):
+    """Исключает из итогов удалённые заявки."""
+    apply_deltas(payout_delta(payout, -1) for payout in payouts)
+
+
+def record_method_change(payout, old_method, status=None):
+    """
+    Переносит заявку в итогах на новый способ выплаты.
+
+    status — текущий статус строки, заблокированной в транзакции
+    изменения; по умолчанию берётся статус экземпляра.
+    """
+    if old_method == payout.method:
+        return
+    apply_deltas([
+        payout_delta(payout, -1, status=status, method=old_method),
+        payout_delta(payout, status=status),
+    ])
+
+
+def day_bounds(day_from, day_to):
+    tz = timezone.get_default_timezone()
+    return (
+        timezone.make_aware(datetime.combine(day_from, time.min), tz),
+        timezone.make_aware(
+            datetime.combine(day_to + timedelta(days=1), time.min), tz
+        ),
+    )
+
+
+def correction_sql(sources):
+    """
+    SELECT поправок итогов за день: фактические итоги минус сохранённые.
+
+    Выполняется одним выражением, поэтому заявки и итоги читаются
+    в одном снимке: изменения незавершённых транзакций не видны ни там,
+    ни там и прибавятся к итогам сами после их фиксации.
+    """
+    return (
+        f'WITH actual AS ('
+        f'SELECT {day_sql()} AS day, status, currency, method, '
+        f'count(*) AS count, sum(amount) AS amount FROM ({sources}) AS p '
+        f'GROUP BY 1, 2, 3, 4), '
+        f'stored AS ('
+        f'SELECT day, status, currency, method, count, amount '
+        f'FROM {quoted_table()} WHERE day = %s) '
+        f'SELECT day, status, currency, method, '
+        f'coalesce(a.count, 0) - coalesce(r.count, 0), '
+        f'coalesce(a.amount, 0) - coalesce(r.amount, 0) '
+        f'FROM actual AS a FULL JOIN stored AS r '
+        f'USING (day, status, currency, method) '
+        f'WHERE coalesce(a.count, 0) <> coalesce(r.count, 0) '
+        f'OR coalesce(a.amount, 0) <> coalesce(r.amount, 0) '
+        f'ORDER BY 1, 2, 3, 4'
+    )
+
+
+def rebuild_stats(day_from, day_to):
+    """
+    Пересчитывает итоги за дни [day_from, day_to] по заявкам и архиву.
+
+    Каждый день исправляется отдельным выражением в своей транзакции:
+    к итогам прибавляются поправки (correction_sql) тем же
+    INSERT ... ON CONFLICT, что и при инкрементальных обновлениях.
+    Таблица итогов не блокируется, а поправки и параллельные обновления
+    складываются. Возвращает число исправленных строк итогов.
+    """
+    quote_name = connection.ops.quote_name
+    sources = ' UNION ALL '.join(
+        f'SELECT created_at, status, currency, method, amount '
+        f'FROM {quote_name(model._meta.db_table)} '
+        f'WHERE created_at >= %s AND created_at < %s'
+        for model in (Payout, PayoutArchive)
+    )
+    sql = upsert_sql(correction_sql(sources))
+    corrected = 0
+    day = day_from
+    while day <= day_to:
+        start, end = day_bounds(day, day)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                sql, [settings.TIME_ZONE, start, end, start, end, day]
+            )
+            corrected += cursor.rowcount
+        day += timedelta(days=1)
+    return corrected
+
+
+def rebuild_recent_stats(days=None):
+    """Пересчитывает итоги за последние days дней."""
+    days = days or settings.PAYOUT_STATS_REBUILD_DAYS
+    today = timezone.localdate(
+        timezone.now(), timezone.get_default_timezone()
+    )
+    return rebuild_stats(today - timedelta(days=days - 1), today)
+
+
+def query_stats(
+    day_from=None, day_to=None, filters=None, group_by=(), normalize_to=None
+):
+    """
+    Возвращает итоги, сгруппированные по измерениям group_by.
+
+    filters — словарь {измерение: список значений}. При normalize_to
+    строки дополняются суммой в этой валюте (normalized_amount),
+    пересчитанной по курсу на день итога. Строки с нулевым количеством
+    заявок не возвращаются.
+    """
+    queryset = PayoutDailyStat.objects.all()
+    if day_from:
+        queryset = queryset.filter(day__gte=day_from)
+    if day_to:
+        queryset = queryset.filter(day__lte=day_to)
+    for name, values in (filters or {}).items():
+        queryset = queryset.filter(**{f'{name}__in': values})
+    aggregates = {
+        'total_count': Sum('count'),
+        'total_amount': Sum('amount'),
+    }
+    if normalize_to:
+        aggregates['normalized_amount'] = normalized_amount(normalize_to)
+    if not group_by:
+        totals = queryset.aggregate(**aggregates)
+        rows = [totals] if totals['total_count'] else []
+    else:
+        rows = (
+            queryset.values(*group_by)
+            .annotate(**aggregates)
+            .filter(total_count__gt=0)
+            .order_by(*group_by)
+        )
+    results = []
+    for row in rows:
+        result = {
+            **{name: row[name] for name in group_by},
+            'count': row['total_count'],
+            'amount': row['total_amount'],
+        }
+        if normalize_to:
+            normalized = row['normalized_amount']
+            result['normalized_amount'] = (
+                normalized if normalized is None else normalized.quantize(CENT)
+            )
+        results.append(result)
+    return results
@@ -1,52 +1,171 @@
-import time
-import logging
-
 from celery import shared_task
-from django.utils import timezone
+from celery.exceptions import MaxRetriesExceededError
+from django.conf import settings
 
-from .models import Payout, StatusChoice, PaymentMethodChoice
+from .archive import archive_payouts
+from .fx import load_rates, read_rates_file, stub_rates
+from .idempotency import purge_expired_keys
+from .models import PayoutStatusEvent, StatusChoice
+from .partitions import detach_partitions, ensure_partitions
+from .processor import process_payouts, process_pending_payouts, retry_delay
+from .routing import payout_queues
+from .stats import rebuild_recent_stats
+from .throttling import ProviderThrottle
+from .transitions import transition
 
 
-logger = logging.getLogger(__name__)
+def defer(task, args, kwargs, countdown):
+    """Откладывает задачу в ту же очередь и с тем же приоритетом."""
+    delivery_info = task.request.delivery_info or {}
+    task.apply_async(
+        args=args,
+        kwargs=kwargs,
+        countdown=countdown,
+        queue=delivery_info.get('routing_key'),
+        priority=delivery_info.get('priority'),
+    )
 
 
-@shared_task
-def process_payout_task(payout_uid):
+def retry_uids(statuses):
+    return [
+        str(payout_uid) for payout_uid, status in statuses.items()
+        if status == StatusChoice.PROCESSING
+    ]
+
+
+def retry_transient(task, args, payout_uids):
+    """
+    Повторяет задачу для заявок с временной ошибкой провайдера.
+
+    Задержка растёт экспоненциально с джиттером, после max_retries
+    повторов задачи заявки переводятся в failed.
+    """
     try:
-        payout = Payout.objects.get(pk=payout_uid)
-    except Payout.DoesNotExist:
-        logger.error(f"Заявка с id={payout_uid} не найдена")
-        return
-    logger.info(
-        f"Начата обработка заявки {payout.payout_uid} "
-        f"({payout.amount} {payout.currency})"
-    )
-    payout.status = StatusChoice.PROCESSING
-    payout.save(update_fields=["status", "updated_at"])
-    time.sleep(5)  # имитация обработки
-    if payout.amount <= 0:
-        payout.status = StatusChoice.REJECTED
-        payout.save(update_fields=["status", "updated_at"])
-        logger.warning(f"Заявка {payout.payout_uid} провалена (сумма <= 0)")
-        return
-    if payout.method == PaymentMethodChoice.BANK_TRANSFER:
-        if not payout.account_number or len(payout.account_number) != 20:
-            payout.status = StatusChoice.REJECTED
-            payout.save(update_fields=["status", "updated_at"])
-            logger.warning(
-                f"Заявка {payout.payout_uid} отклонена: некорректный счёт"
+        raise task.retry(
+            args=args, kwargs={'retry': True},
+            countdown=retry_delay(task.request.retries),
+        )
+    except MaxRetriesExceededError:
+        transition(
+            payout_uids, StatusChoice.FAILED,
+            sources=[StatusChoice.PROCESSING],
+        )
+
+
+@shared_task(bind=True, max_retries=settings.PAYOUT_MAX_RETRIES)
+def process_payout_task(self, payout_uid, retry=False):
+    with ProviderThrottle() as throttle:
+        statuses = process_payouts(
+            [payout_uid], throttle=throttle, retry=retry
+        )
+    if throttle.deferred:
+        defer(self, [payout_uid], {'retry': retry}, throttle.retry_after)
+    if retry_uids(statuses):
+        retry_transient(self, [payout_uid], [payout_uid])
+    return next(iter(statuses.values()), None)
+
+
+@shared_task(bind=True, max_retries=settings.PAYOUT_MAX_RETRIES)
+def process_payout_batch_task(self, payout_uids, retry=False):
+    with ProviderThrottle() as throttle:
+        statuses = process_payouts(
+            payout_uids, throttle=throttle, retry=retry
+        )
+    if throttle.deferred:
+        defer(
+            self, [[str(uid) for uid in throttle.deferred]],
+            {'retry': retry}, throttle.retry_after,
+        )
+    transient = retry_uids(statuses)
+    if transient:
+        retry_transient(self, [transient], transient)
+    return {
+        str(payout_uid): status for payout_uid, status in statuses.items()
+    }
+
+
+@shared_task
+def claim_pending_payouts_task(limit=None, max_batches=None, queue=None):
+    """
+    Забирает и обрабатывает ожидающие заявки, пока очередь не опустеет.
+
+    Без queue задача только ставит по задаче в каждую очередь выплат:
+    воркер очереди забирает лишь заявки своего маршрута, поэтому
+    очереди масштабируются независимо. Заявки с временной ошибкой
+    повторяются задачами своего маршрута.
+    """
+    if queue is None:
+        queues = payout_queues()
+        for queue in queues:
+            claim_pending_payouts_task.apply_async(
+                kwargs={
+                    'limit': limit,
+                    'max_batches': max_batches,
+                    'queue': queue,
+                },
+                queue=queue,
+                # Пока пул очереди недоступен, обходы не копятся в ней:
+                # следующий обход beat поставит новая задача
+                expires=settings.PAYOUT_CLAIM_INTERVAL,
             )
-            return
-    elif payout.method == PaymentMethodChoice.CARD_TRANSFER:
-        if not payout.card_number or len(payout.card_number) != 16:
-            payout.status = StatusChoice.REJECTED
-            payout.save(update_fields=["status", "updated_at"])
-            logger.warning(
-                f"Заявка {payout.payout_uid} отклонена: некорректный номер"
+        return queues
+    from .services import enqueue_payouts
+    max_batches = max_batches or settings.PAYOUT_CLAIM_MAX_BATCHES
+    processed = 0
+    for _ in range(max_batches):
+        with ProviderThrottle() as throttle:
+            statuses = process_pending_payouts(
+                limit, throttle=throttle, queue=queue
             )
-            return
-    payout.status = StatusChoice.COMPLETED
-    payout.updated_at = timezone.now()
-    payout.save(update_fields=["status", "updated_at"])
-    logger.info(f"Заявка {payout.payout_uid} успешно обработана")
-    return payout.status
+        if not statuses:
+            break
+        transient = retry_uids(statuses)
+        if transient:
+            enqueue_payouts(
+                transient, retry=True, countdown=retry_delay(0)
+            )
+        processed += len(statuses)
+    return processed
+
+
+@shared_task
+def purge_idempotency_keys_task():
+    return purge_expired_keys()
+
+
+@shared_task
+def maintain_status_event_partitions_task():
+    table = PayoutStatusEvent._meta.db_table
+    created = ensure_partitions(
+        table, settings.PAYOUT_STATUS_EVENT_PARTITIONS_AHEAD
+    )
+    detached = detach_partitions(
+        table, settings.PAYOUT_STATUS_EVENT_RETENTION_MONTHS
+    )
+    return {'created': created, 'detached': detached}
+
+
+@shared_task
+def archive_payouts_task():
+    return archive_payouts(
+        max_batches=settings.PAYOUT_ARCHIVE_MAX_BATCHES
+    )
+
+
+@shared_task
+def rebuild_payout_stats_task():
+    return rebuild_recent_stats()
+
+
+@shared_task
+def load_fx_rates_task():
+    if settings.PAYOUT_FX_RATES_FILE:
+        return load_rates(read_rates_file(settings.PAYOUT_FX_RATES_FILE))
+    return load_rates(stub_rates())
+
+
+@shared_task
+def reap_stuck_payouts_task():
+    # reaper ставит задачи через services, который импортирует этот модуль
+    from .reaper import reap_stuck_payouts
+    return reap_stuck_payouts()
@@ -0,0 +1,171 @@
+import logging
+import uuid
+
+import redis
+from django.conf import settings
+
+from . import metrics
+
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_script = None
+
+# Атомарно выдаёт до requested разрешений на вызов провайдера.
+# Ограничения: маркерная корзина (rate в секунду, ёмкость burst)
+# и семафор одновременных вызовов concurrency, где каждый занятый
+# слот — элемент ZSET с временем истечения аренды, чтобы слоты упавшего
+# воркера освобождались сами. Нулевой лимит означает его отсутствие.
+# Возвращает {выдано, через сколько секунд повторить}.
+ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+local holder = ARGV[5]
+local lease = tonumber(ARGV[6])
+local granted = requested
+local wait = 0
+if limit > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+    local free = limit - redis.call('ZCARD', KEYS[2])
+    granted = math.max(math.min(granted, free), 0)
+end
+if rate > 0 then
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(now - ts, 0) * rate)
+    granted = math.min(granted, math.floor(tokens))
+    tokens = tokens - granted
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    if granted < requested and tokens < 1 then
+        wait = (1 - tokens) / rate
+    end
+end
+if limit > 0 and granted > 0 then
+    for i = 1, granted do
+        redis.call('ZADD', KEYS[2], now + lease, holder .. ':' .. i)
+    end
+    redis.call('EXPIRE', KEYS[2], math.ceil(lease) + 1)
+end
+return {granted, tostring(wait)}
+"""
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.PAYOUT_THROTTLE_REDIS_URL)
+    return _client
+
+
+def get_script():
+    global _script
+    if _script is None:
+        _script = get_client().register_script(ACQUIRE_SCRIPT)
+    return _script
+
+
+def bucket_key(provider):
+    return f'payouts:throttle:{provider}:bucket'
+
+
+def slots_key(provider):
+    return f'payouts:throttle:{provider}:slots'
+
+
+class ProviderThrottle:
+    """
+    Распределённое ограничение вызовов провайдеров для одной пачки.
+
+    Лимиты задаются в PAYOUT_PROVIDER_LIMITS по способу выплаты.
+    Заявки сверх лимита не забираются в обработку, а остаются
+    в deferred, чтобы задачу можно было отложить на retry_after секунд
+    вместо ожидания в слоте воркера. Занятые слоты семафора
+    освобождаются при выходе из контекста. При недоступности Redis
+    заявки пропускаются без ограничений.
+    """
+
+    def __init__(self):
+        self.holder = uuid.uuid4().hex
+        self.slots = {}
+        self.deferred = []
+        self.retry_after = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def admit(self, payouts):
+        """Возвращает заявки, для которых получено разрешение."""
+        groups = {}
+        for payout in payouts:
+            groups.setdefault(str(payout.method), []).append(payout)
+        admitted = []
+        for provider, group in groups.items():
+            granted, retry_after = self.acquire(provider, len(group))
+            admitted += group[:granted]
+            deferred = group[granted:]
+            metrics.incr(
+                'payout_provider_admitted_total', granted, provider=provider
+            )
+            if deferred:
+                self.deferred += [payout.payout_uid for payout in deferred]
+                self.retry_after = max(
+                    self.retry_after, retry_after,
+                    settings.PAYOUT_THROTTLE_MIN_DELAY,
+                )
+                metrics.incr(
+                    'payout_provider_throttled_total', len(deferred),
+                    provider=provider,
+                )
+        return admitted
+
+    def acquire(self, provider, requested):
+        limits = settings.PAYOUT_PROVIDER_LIMITS.get(provider)
+        if not limits:
+            return requested, 0
+        rate = limits.get('rate', 0)
+        try:
+            granted, retry_after = get_script()(
+                keys=[bucket_key(provider), slots_key(provider)],
+                args=[
+                    rate, limits.get('burst', rate),
+                    limits.get('concurrency', 0), requested, self.holder,
+                    settings.PAYOUT_VISIBILITY_TIMEOUT,
+                ],
+            )
+        except redis.RedisError as exc:
+            logger.warning(
+                f"Лимиты провайдера {provider} не проверены: {exc}"
+            )
+            return requested, 0
+        granted = int(granted)
+        if granted and limits.get('concurrency'):
+            self.slots[provider] = granted
+        return granted, float(retry_after)
+
+    def release(self):
+        """Освобождает занятые слоты семафоров."""
+        if not self.slots:
+            return
+        try:
+            pipeline = get_client().pipeline(transaction=False)
+            for provider, count in self.slots.items():
+                pipeline.zrem(slots_key(provider), *(
+                    f'{self.holder}:{index}'
+                    for index in range(1, count + 1)
+                ))
+            pipeline.execute()
+        except redis.RedisError as exc:
+            logger.warning(
+                f"Слоты провайдеров не освобождены, истекут сами: {exc}"
+            )
+        self.slots = {}
@@ -0,0 +1,190 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import metrics
+from .events import publish_statuses
+from .models import Payout, PayoutStatusEvent, StatusChoice
+from .read_cache import invalidate_payouts
+from .stats import delta_sql, upsert_sql
+
+
+# Допустимые переходы статусов заявки: текущий статус -> новые статусы
+TRANSITIONS = {
+    StatusChoice.PENDING: (
+        StatusChoice.APPROVED,
+        StatusChoice.PROCESSING,
+        StatusChoice.REJECTED,
+        StatusChoice.CANCELLED,
+    ),
+    StatusChoice.APPROVED: (
+        StatusChoice.PROCESSING,
+        StatusChoice.REJECTED,
+        StatusChoice.CANCELLED,
+    ),
+    StatusChoice.PROCESSING: (
+        StatusChoice.PENDING,
+        StatusChoice.COMPLETED,
+        StatusChoice.REJECTED,
+        StatusChoice.FAILED,
+    ),
+    StatusChoice.FAILED: (
+        StatusChoice.PENDING,
+        StatusChoice.CANCELLED,
+    ),
+    StatusChoice.COMPLETED: (),
+    StatusChoice.REJECTED: (),
+    StatusChoice.CANCELLED: (),
+}
+
+
+def can_transition(source, target):
+    return target in TRANSITIONS.get(source, ())
+
+
+def source_statuses(target):
+    """Статусы, из которых допустим переход в target."""
+    return [
+        str(source) for source, targets in TRANSITIONS.items()
+        if target in targets
+    ]
+
+
+def apply_transitions(targets, sources=None):
+    """
+    Применяет переходы статусов одним условным UPDATE.
+
+    targets — словарь {payout_uid: новый статус}. Строка обновляется,
+    только если её текущий статус допускает переход (и входит в sources,
+    если он передан), поэтому параллельные изменения не затираются.
+    В том же выражении каждая смена статуса пишется в журнал
+    PayoutStatusEvent, переход в processing увеличивает attempts,
+    а заявка переносится между строками дневных итогов PayoutDailyStat.
+    Возвращает словарь {payout_uid: новый статус} для фактически
+    изменённых строк.
+    """
+    if not targets:
+        return {}
+    rows = []
+    params = []
+    for payout_uid, target in targets.items():
+        allowed = source_statuses(target)
+        if sources is not None:
+            allowed = [status for status in allowed if status in sources]
+        rows.append('(%s::uuid, %s, %s::varchar[])')
+        params += [str(payout_uid), str(target), allowed]
+    updated_at = timezone.now()
+    quote_name = connection.ops.quote_name
+    payouts_table = quote_name(Payout._meta.db_table)
+    events_table = quote_name(PayoutStatusEvent._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'WITH v (payout_uid, status, sources) AS '
+            f'(VALUES {", ".join(rows)}), '
+            f'old AS ('
+            f'SELECT p.payout_uid, p.status FROM {payouts_table} AS p '
+            f'JOIN v ON v.payout_uid = p.payout_uid '
+            f'WHERE p.status = ANY(v.sources) FOR UPDATE OF p), '
+            f'moved AS ('
+            f'UPDATE {payouts_table} AS p '
+            f'SET status = v.status, updated_at = %s, '
+            f'attempts = p.attempts + (v.status = %s)::int '
+            f'FROM v JOIN old ON old.payout_uid = v.payout_uid '
+            f'WHERE p.payout_uid = v.payout_uid '
+            f'AND old.status = ANY(v.sources) '
+            f'RETURNING p.payout_uid, old.status AS from_status, '
+            f'p.status AS to_status, p.created_at, p.currency, '
+            f'p.method, p.amount), '
+            f'events AS ('
+            f'INSERT INTO {events_table} '
+            f'(payout_uid, from_status, to_status, created_at) '
+            f'SELECT payout_uid, from_status, to_status, %s FROM moved), '
+            f'stats AS ({upsert_sql(delta_sql("moved"))}) '
+            f'SELECT payout_uid, to_status FROM moved',
+            [
+                *params, updated_at, StatusChoice.PROCESSING.value,
+                updated_at, settings.TIME_ZONE,
+            ],
+        )
+        moved = dict(cursor.fetchall())
+    if moved:
+        transaction.on_commit(lambda: invalidate_payouts(moved))
+        transaction.on_commit(lambda: publish_statuses(moved, updated_at))
+        failed = list(moved.values()).count(StatusChoice.FAILED)
+        if failed:
+            transaction.on_commit(
+                lambda: metrics.incr('payouts_failed_total', failed)
+            )
+    return moved
+
+
+def transition(payout_uids, target, sources=None):
+    """Переводит заявки в статус target, возвращает изменённые uid."""
+    return list(apply_transitions(
+        {payout_uid: target for payout_uid in payout_uids}, sources
+    ))
+
+
+def transition_payout(payout_uid, target, sources=None):
+    """Переводит одну заявку в статус target, True при успехе."""
+    return bool(transition([payout_uid], target, sources))
+
+
+def bulk_transition(payout_uids, target, chunk_size=None):
+    """
+    Переводит заявки в статус target пачками условных UPDATE.
+
+    Каждая пачка применяется в своей транзакции. Возвращает словарь
+    с результатами по заявкам: updated — переведённые, conflicts —
+    заявки, текущий статус которых не допускает перехода, not_found —
+    несуществующие.
+    """
+    chunk_size = chunk_size or settings.PAYOUT_BULK_TRANSITION_CHUNK_SIZE
+    payout_uids = list(dict.fromkeys(map(str, payout_uids)))
+    results = {'updated': [], 'conflicts': [], 'not_found': []}
+    for start in range(0, len(payout_uids), chunk_size):
+        chunk = payout_uids[start:start + chunk_size]
+        with transaction.atomic():
+            moved = {str(uid) for uid in transition(chunk, target)}
+        results['updated'] += [uid for uid in chunk if uid in moved]
+        rest = [uid for uid in chunk if uid not in moved]
+        current = {
+            str(payout_uid): status
+            for payout_uid, status in Payout.objects.filter(
+                payout_uid__in=rest
+            ).values_list('payout_uid', 'status')
+        }
+        for uid in rest:
+            if uid in current:
+                results['conflicts'].append(
+                    {'payout_uid': uid, 'status': current[uid]}
+                )
+            else:
+                results['not_found'].append(uid)
+    return results
+
+
+def bulk_transition_matching(queryset, target, chunk_size=None):
+    """
+    Переводит в статус target заявки queryset, допускающие переход.
+
+    Заявки выбираются пачками по возрастанию payout_uid, поэтому
+    заявки, созданные после начала обхода, могут не попасть в выборку.
+    Результат имеет тот же вид, что у bulk_transition.
+    """
+    chunk_size = chunk_size or settings.PAYOUT_BULK_TRANSITION_CHUNK_SIZE
+    queryset = queryset.filter(
+        status__in=source_statuses(target)
+    ).order_by('payout_uid')
+    results = {'updated': [], 'conflicts': [], 'not_found': []}
+    last_uid = None
+    while True:
+        page = queryset
+        if last_uid is not None:
+            page = page.filter(payout_uid__gt=last_uid)
+        chunk = list(page.values_list('payout_uid', flat=True)[:chunk_size])
+        if not chunk:
+            return results
+        last_uid = chunk[-1]
+        for name, items in bulk_transition(chunk, target, chunk_size).items():
+            results[name] += items
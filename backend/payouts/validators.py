@@ -0,0 +1,126 @@
+import re
+
+from .encryption import blind_index
+from .models import PaymentMethodChoice
+
+
+# Версия правил проверки входит в отпечаток: при изменении правил
+# старые отпечатки перестают совпадать и заявки проверяются заново.
+VALIDATION_VERSION = '1'
+
+CARD_RE = re.compile(r'[0-9]{16}')
+ACCOUNT_RE = re.compile(r'[0-9]{20}')
+BIK_RE = re.compile(r'04[0-9]{7}')
+
+REQUISITE_FIELDS = ('method', 'card_number', 'account_number', 'bank_bik')
+
+# Удвоенная цифра по алгоритму Луна
+LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+# Весовые коэффициенты контрольного ключа счёта (ЦБ РФ, 23 разряда)
+ACCOUNT_WEIGHTS = (7, 1, 3) * 8
+# Условные номера РКЦ: для них ключ считается по «0» + 5-6 цифры БИК
+RKC_SUFFIXES = ('000', '001', '002')
+
+
+def luhn_valid(number):
+    digits = [ord(char) - 48 for char in reversed(number)]
+    total = sum(digits[0::2]) + sum(LUHN_DOUBLED[d] for d in digits[1::2])
+    return total % 10 == 0
+
+
+def account_valid(account, bik):
+    """Проверяет контрольный ключ счёта относительно БИК банка."""
+    prefix = bik[-3:]
+    if prefix in RKC_SUFFIXES:
+        prefix = '0' + bik[4:6]
+    total = sum(
+        (ord(char) - 48) * weight
+        for char, weight in zip(prefix + account, ACCOUNT_WEIGHTS)
+    )
+    return total % 10 == 0
+
+
+def validate_requisites(method, card_number='', account_number='',
+                        bank_bik=''):
+    """
+    Проверяет реквизиты выплаты.
+
+    Возвращает словарь {поле: сообщение об ошибке}, пустой для
+    корректных реквизитов. Используется и API, и воркером.
+    """
+    errors = {}
+    if method == PaymentMethodChoice.CARD_TRANSFER:
+        if not card_number:
+            errors['card_number'] = (
+                "Для выплаты на карту требуется card_number"
+            )
+        elif not CARD_RE.fullmatch(card_number):
+            errors['card_number'] = "Номер карты должен содержать 16 цифр"
+        elif not luhn_valid(card_number):
+            errors['card_number'] = (
+                "Номер карты не проходит проверку контрольной цифры"
+            )
+    elif method == PaymentMethodChoice.BANK_TRANSFER:
+        if not bank_bik:
+            errors['bank_bik'] = (
+                "Для выплаты на банковский счёт требуется bank_bik"
+            )
+        elif not BIK_RE.fullmatch(bank_bik):
+            errors['bank_bik'] = (
+                "БИК должен содержать 9 цифр и начинаться с 04"
+            )
+        if not account_number:
+            errors['account_number'] = (
+                "Для выплаты на банковский счёт требуется account_number"
+            )
+        elif not ACCOUNT_RE.fullmatch(account_number):
+            errors['account_number'] = "Номер счёта должен содержать 20 цифр"
+        elif 'bank_bik' not in errors and not account_valid(
+            account_number, bank_bik
+        ):
+            errors['account_number'] = (
+                "Номер счёта не проходит проверку контрольного ключа"
+            )
+    return errors
+
+
+def requisites_fingerprint(method, bank_bik, card_number_hash,
+                           account_number_hash):
+    # Префиксов хэшей достаточно, чтобы заметить смену номера
+    return (
+        f'{VALIDATION_VERSION}:{method}:{bank_bik}:'
+        f'{card_number_hash[:16]}:{account_number_hash[:16]}'
+    )
+
+
+def validation_fingerprint(method, card_number='', account_number='',
+                           bank_bik=''):
+    """
+    Отпечаток проверенных реквизитов.
+
+    Номера входят в отпечаток своими ключевыми хэшами, которые модель
+    хранит рядом и обновляет при save(), update() и bulk_update().
+    Поэтому воркер сверяет отпечаток со строкой заявки без хэширования
+    (payout_fingerprint), а изменение реквизитов через ORM в обход
+    проверки делает отпечаток несовпадающим.
+    """
+    return requisites_fingerprint(
+        method,
+        bank_bik,
+        blind_index('card_number', card_number),
+        blind_index('account_number', account_number),
+    )
+
+
+def payout_fingerprint(payout):
+    """Отпечаток текущих реквизитов заявки по сохранённым хэшам."""
+    return requisites_fingerprint(
+        payout.method,
+        payout.bank_bik or '',
+        payout.card_number_hash,
+        payout.account_number_hash,
+    )
+
+
+def payout_requisites(payout):
+    return {field: getattr(payout, field) or '' for field in REQUISITE_FIELDS}
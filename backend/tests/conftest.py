@@ -1,10 +1,41 @@
 import pytest
 from unittest.mock import patch
+from django.core.cache import caches
+from django.db import connection
 from rest_framework.test import APIClient
 
+from payouts.fx import rate_cache
 from payouts.models import CurrencyChoice, Payout, PaymentMethodChoice
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Очистка кэшей между тестами."""
+    yield
+    for cache in caches.all():
+        cache.clear()
+    rate_cache.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def redis_client():
+    """Подмена клиента Redis для публикации событий."""
+    with patch("payouts.events.get_client") as mocked_client:
+        yield mocked_client.return_value
+
+
+@pytest.fixture(autouse=True)
+def throttle_script():
+    """Подмена Redis лимитов провайдеров: все вызовы разрешены."""
+    with patch("payouts.throttling.get_client"), patch(
+        "payouts.throttling.get_script"
+    ) as mocked_script:
+        mocked_script.return_value.side_effect = (
+            lambda keys, args: [args[3], '0']
+        )
+        yield mocked_script.return_value
+
+
 @pytest.fixture
 def api_client():
     """Неавторизованный APIClient."""
@@ -12,15 +43,14 @@ def api_client():
 
 
 @pytest.fixture
-@patch("payouts.signals.process_payout_task.delay")
-def payout_card(mocked_delay):
+def payout_card():
     """Фикстура для создания выплаты на карту."""
     payout = Payout.objects.create(
         method=PaymentMethodChoice.CARD_TRANSFER,
         amount=100.0,
         currency=CurrencyChoice.RUB,
         bank_name="Test bank",
-        card_number="1234567890123456",
+        card_number="1234567890123452",
         phone="89526984567",
         description="Test payout to card"
     )
@@ -28,8 +58,7 @@ def payout_card(mocked_delay):
 
 
 @pytest.fixture
-@patch("payouts.signals.process_payout_task.delay")
-def payout_bank(mocked_delay):
+def payout_bank():
     """Фикстура для создания выплаты на банковский счёт."""
     payouts = Payout.objects.create(
         method=PaymentMethodChoice.BANK_TRANSFER,
@@ -37,8 +66,77 @@ def payout_bank(mocked_delay):
         currency=CurrencyChoice.USD,
         bank_name="T-Bank",
         bank_bik="044525974",
-        account_number="12345678901234567890",
+        account_number="12345678901234527890",
         phone="8954258954321",
         description="Test payout to bank account"
     )
     return payouts
+
+
+@pytest.fixture(scope="class")
+def payout_table(django_db_setup, django_db_blocker):
+    """
+    Фикстура таблицы выплат реалистичного размера для проверки планов.
+
+    100 000 заявок: завершённые за 2024-2025 годы, активные (около 4%)
+    созданы за последний час; рублёвых 80%. Строки вставляются один раз
+    на класс тестов вне транзакции теста, после вставки собирается
+    статистика.
+    """
+    with django_db_blocker.unblock(), connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO payouts_payout (
+                payout_uid, amount, currency, status, method, bank_name,
+                bank_bik, card_number, account_number, card_number_hash,
+                account_number_hash, phone, description, attempts,
+                retry_count, validation_fingerprint, created_at, updated_at
+            )
+            SELECT
+                gen_random_uuid(),
+                round((random() * 100000)::numeric, 2),
+                CASE WHEN r.currency < 0.80 THEN 'RUB'
+                     WHEN r.currency < 0.95 THEN 'USD'
+                     WHEN r.currency < 0.99 THEN 'EUR' ELSE 'CNY' END,
+                CASE WHEN r.status < 0.02 THEN 'pending'
+                     WHEN r.status < 0.03 THEN 'approved'
+                     WHEN r.status < 0.04 THEN 'processing'
+                     WHEN r.status < 0.90 THEN 'completed'
+                     WHEN r.status < 0.95 THEN 'rejected'
+                     ELSE 'cancelled' END,
+                CASE WHEN random() < 0.7 THEN 'card' ELSE 'bank' END,
+                '', '', '', '', md5(random()::text), md5(random()::text),
+                '', '', 0, 0, '',
+                r.created_at,
+                r.created_at + random() * r.lifetime
+            FROM (
+                SELECT s.*,
+                       CASE WHEN s.status < 0.04
+                            THEN now() - random() * interval '1 hour'
+                            ELSE timestamptz '2024-01-01'
+                                 + random() * interval '730 days'
+                       END AS created_at,
+                       CASE WHEN s.status < 0.04 THEN interval '0'
+                            ELSE interval '2 days' END AS lifetime
+                FROM (
+                    SELECT random() AS currency, random() AS status
+                    FROM generate_series(1, 100000)
+                ) AS s
+            ) AS r
+            """
+        )
+        cursor.execute("ANALYZE payouts_payout")
+        yield
+        cursor.execute("TRUNCATE payouts_payout")
+        cursor.execute("ANALYZE payouts_payout")
+
+
+@pytest.fixture
+def explain():
+    """Фикстура, возвращающая план запроса queryset."""
+    def explain(queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}", params)
+            return "\n".join(row[0] for row in cursor.fetchall())
+    return explain
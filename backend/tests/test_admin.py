@@ -0,0 +1,98 @@
+import pytest
+from django.contrib.admin.sites import site
+from django.urls import reverse
+from django.utils import timezone
+
+from payouts.admin import (
+    ALL_DATES_VAR,
+    EstimatedCountPaginator,
+    search_lookups
+)
+from payouts.models import Payout
+
+
+pytestmark = pytest.mark.django_db
+
+URL = reverse("admin:payouts_payout_changelist")
+
+
+def search(term):
+    admin = site._registry[Payout]
+    queryset, may_have_duplicates = admin.get_search_results(
+        None, Payout.objects.all(), term
+    )
+    assert not may_have_duplicates
+    return set(queryset)
+
+
+class TestPayoutAdmin:
+    """Набор тестов списка заявок в админке."""
+
+    def test_search_exact(self, payout_card, payout_bank):
+        """Тест точного поиска по реквизитам."""
+        assert search(str(payout_card.payout_uid)) == {payout_card}
+        assert search(payout_card.card_number) == {payout_card}
+        assert search(payout_bank.account_number) == {payout_bank}
+        assert search(payout_card.card_number[:6]) == set()
+        assert search("89526984567") == {payout_card}
+
+    def test_search_prefix(self, payout_card, payout_bank):
+        """Тест поиска по префиксу телефона и названию банка."""
+        assert search("8952*") == {payout_card}
+        assert search("+7 952 698*") == {payout_card}
+        assert search("t*") == {payout_card, payout_bank}
+        assert search("*") == set()
+        assert search("test ba") == {payout_card}
+        assert search("est ba") == set()
+
+    def test_search_lookups_without_digits(self):
+        """Тест поиска текста только по названию банка."""
+        assert str(search_lookups("Тинькофф")) == (
+            "(AND: ('bank_name__istartswith', 'Тинькофф'))"
+        )
+
+    def test_paginator_exact_for_small_tables(self, payout_card, settings):
+        """Тест точного подсчёта при малой оценке."""
+        settings.PAYOUT_ADMIN_EXACT_COUNT_LIMIT = 10000
+        assert EstimatedCountPaginator(Payout.objects.all(), 10).count == 1
+
+    def test_paginator_estimates(self, payout_card, settings):
+        """Тест оценки количества строк вместо COUNT(*)."""
+        settings.PAYOUT_ADMIN_EXACT_COUNT_LIMIT = 0
+        paginator = EstimatedCountPaginator(
+            Payout.objects.filter(status='pending'), 10
+        )
+        assert paginator.count >= 0
+
+    def test_changelist_defaults_to_month(self, admin_client, payout_card):
+        """Тест открытия списка за текущий месяц."""
+        today = timezone.localdate()
+        response = admin_client.get(URL, {"status": "pending"})
+        assert response.status_code == 302
+        assert response.url == (
+            f'{URL}?status=pending&created_at__year={today.year}'
+            f'&created_at__month={today.month}&{ALL_DATES_VAR}=1'
+        )
+        response = admin_client.get(response.url)
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert str(payout_card.payout_uid) in content
+        assert (
+            f'?{ALL_DATES_VAR}=1&amp;created_at__year={today.year}'
+            '&amp;status=pending'
+        ) in content
+
+    def test_changelist_all_dates(self, admin_client, payout_card):
+        """Тест полного списка после выбора «Все даты»."""
+        Payout.objects.filter(pk=payout_card.pk).update(
+            created_at=timezone.now().replace(year=2020)
+        )
+        response = admin_client.get(URL, {ALL_DATES_VAR: 1})
+        assert response.status_code == 200
+        assert str(payout_card.payout_uid) in response.content.decode()
+
+    def test_changelist_search(self, admin_client, payout_card):
+        """Тест поиска в списке заявок."""
+        response = admin_client.get(URL, {"q": payout_card.card_number})
+        assert response.status_code == 200
+        assert str(payout_card.payout_uid) in response.content.decode()
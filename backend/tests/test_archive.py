@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from payouts.archive import archive_payouts
+from payouts.models import Payout, PayoutArchive, StatusChoice
+from payouts.partitions import list_partitions, month_start
+
+
+pytestmark = pytest.mark.django_db
+
+
+def age_payout(payout, days, status_value=StatusChoice.COMPLETED):
+    Payout.objects.filter(pk=payout.pk).update(
+        status=status_value,
+        created_at=timezone.now() - timedelta(days=days),
+    )
+
+
+class TestPayoutArchive:
+    """Набор тестов архивации завершённых выплат."""
+
+    def test_archive_moves_old_terminal(self, payout_card, payout_bank):
+        """Тест переноса только старых завершённых выплат."""
+        age_payout(payout_card, 120)
+        age_payout(payout_bank, 120, StatusChoice.PENDING)
+        assert archive_payouts(older_than_days=90) == 1
+        assert not Payout.objects.filter(pk=payout_card.pk).exists()
+        archived = PayoutArchive.objects.get()
+        assert archived.payout_uid == payout_card.payout_uid
+        assert archived.status == StatusChoice.COMPLETED
+        assert archived.card_number == payout_card.card_number
+        assert Payout.objects.filter(pk=payout_bank.pk).exists()
+
+    def test_archive_creates_partitions(self, payout_card, payout_bank):
+        """Тест создания секций архива по месяцам переносимых выплат."""
+        age_payout(payout_card, 120)
+        age_payout(payout_bank, 200, StatusChoice.CANCELLED)
+        assert archive_payouts(older_than_days=90, batch_size=1) == 2
+        months = {
+            month_start(created_at.date())
+            for created_at in PayoutArchive.objects.values_list(
+                'created_at', flat=True
+            )
+        }
+        assert months <= set(
+            list_partitions(PayoutArchive._meta.db_table)
+        )
+
+    def test_retrieve_archived(self, api_client, payout_card):
+        """Тест просмотра выплаты, перенесённой в архив."""
+        age_payout(payout_card, 120)
+        archive_payouts(older_than_days=90)
+        url = reverse("api:payouts-detail", args=[payout_card.payout_uid])
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["payout_uid"] == str(payout_card.payout_uid)
+        assert response.data["status"] == StatusChoice.COMPLETED
+        response = api_client.patch(url, {"status": StatusChoice.PENDING})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_command(self, payout_card):
+        """Тест команды архивации."""
+        age_payout(payout_card, 10, StatusChoice.REJECTED)
+        call_command('archive_payouts', days=5)
+        assert PayoutArchive.objects.filter(pk=payout_card.pk).exists()
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from unittest.mock import patch
+from django.urls import reverse
+from rest_framework import status
+
+from payouts.models import (
+    CurrencyChoice,
+    Payout,
+    PayoutOutbox,
+    PaymentMethodChoice
+)
+from payouts.outbox import relay_outbox
+
+
+pytestmark = pytest.mark.django_db
+
+
+def make_card_item(**kwargs):
+    item = {
+        "method": PaymentMethodChoice.CARD_TRANSFER,
+        "amount": 500.0,
+        "currency": CurrencyChoice.RUB,
+        "bank_name": "Тинькофф",
+        "card_number": "2201221554561246",
+        "phone": "+79856584565",
+    }
+    item.update(kwargs)
+    return item
+
+
+class TestPayoutBulk:
+    """Набор тестов пакетного создания выплат."""
+
+    def test_bulk_create_json(self, api_client):
+        """Тест пакетного создания с ошибками по отдельным элементам."""
+        url = reverse("api:payouts-bulk")
+        data = [
+            make_card_item(),
+            make_card_item(card_number="123"),
+            make_card_item(amount=700.0),
+        ]
+        response = api_client.post(url, data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [item["index"] for item in response.data["created"]] == [0, 2]
+        assert response.data["errors"][0]["index"] == 1
+        assert "card_number" in response.data["errors"][0]["errors"]
+        assert Payout.objects.count() == 2
+        assert set(
+            PayoutOutbox.objects.values_list('payout_uid', flat=True)
+        ) == set(Payout.objects.values_list('payout_uid', flat=True))
+
+    def test_bulk_create_ndjson(self, api_client):
+        """Тест пакетного создания из потока NDJSON."""
+        url = reverse("api:payouts-bulk")
+        body = "\n".join(
+            json.dumps(make_card_item(amount=amount))
+            for amount in (100.0, 200.0, 300.0)
+        )
+        response = api_client.post(
+            url, body, content_type='application/x-ndjson'
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data["created"]) == 3
+        assert Payout.objects.count() == 3
+
+    def test_bulk_create_all_invalid(self, api_client):
+        """Тест пакета, в котором нет ни одной корректной заявки."""
+        url = reverse("api:payouts-bulk")
+        data = [make_card_item(card_number=""), make_card_item(amount=-1)]
+        response = api_client.post(url, data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert len(response.data["errors"]) == 2
+        assert not Payout.objects.exists()
+
+    def test_bulk_create_not_list(self, api_client):
+        """Тест пакетного создания с телом запроса не в виде списка."""
+        url = reverse("api:payouts-bulk")
+        response = api_client.post(url, make_card_item(), format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestPayoutOutbox:
+    """Набор тестов relay сообщений outbox."""
+
+    @patch("payouts.services.process_payout_batch_task.apply_async")
+    def test_relay_outbox(self, mocked_send, payout_card, payout_bank):
+        """Тест отправки сообщений outbox в брокер пачкой на маршрут."""
+        assert relay_outbox(batch_size=10) == 2
+        assert {
+            uid
+            for call in mocked_send.call_args_list
+            for uid in call.kwargs["args"][0]
+        } == {str(payout_card.payout_uid), str(payout_bank.payout_uid)}
+        assert not PayoutOutbox.objects.exists()
+        assert relay_outbox(batch_size=10) == 0
+
+    @patch(
+        "payouts.services.process_payout_batch_task.apply_async",
+        side_effect=ConnectionError,
+    )
+    def test_relay_outbox_broker_down(self, mocked_send, payout_card):
+        """Тест сохранения сообщений outbox при недоступном брокере."""
+        with pytest.raises(ConnectionError):
+            relay_outbox()
+        assert PayoutOutbox.objects.filter(
+            payout_uid=payout_card.payout_uid
+        ).exists()
+
+    def test_metrics(self, api_client, payout_card):
+        """Тест выгрузки метрик outbox."""
+        response = api_client.get(reverse("api:metrics"))
+        assert response.status_code == status.HTTP_200_OK
+        assert "payout_outbox_pending 1" in response.content.decode()
@@ -0,0 +1,107 @@
+import uuid
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from payouts.models import Payout, PayoutStatusEvent, StatusChoice
+from payouts.transitions import bulk_transition, bulk_transition_matching
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestBulkTransition:
+    """Набор тестов массовой смены статуса заявок."""
+
+    def test_outcomes_by_payout(self, payout_card, payout_bank):
+        """Тест результатов по каждой заявке."""
+        Payout.objects.filter(pk=payout_bank.pk).update(
+            status=StatusChoice.COMPLETED
+        )
+        missing = uuid.uuid4()
+        results = bulk_transition(
+            [payout_card.payout_uid, payout_bank.payout_uid, missing],
+            StatusChoice.CANCELLED,
+            chunk_size=2,
+        )
+        assert results == {
+            'updated': [str(payout_card.payout_uid)],
+            'conflicts': [{
+                'payout_uid': str(payout_bank.payout_uid),
+                'status': 'completed',
+            }],
+            'not_found': [str(missing)],
+        }
+        payout_card.refresh_from_db()
+        assert payout_card.status == StatusChoice.CANCELLED
+        assert PayoutStatusEvent.objects.filter(
+            payout_uid=payout_card.payout_uid,
+            to_status=StatusChoice.CANCELLED,
+        ).exists()
+
+    def test_matching_in_chunks(self, payout_card, payout_bank):
+        """Тест перевода заявок по фильтру несколькими пачками."""
+        results = bulk_transition_matching(
+            Payout.objects.all(), StatusChoice.APPROVED, chunk_size=1
+        )
+        assert sorted(results['updated']) == sorted(
+            [str(payout_card.payout_uid), str(payout_bank.payout_uid)]
+        )
+        assert not Payout.objects.exclude(
+            status=StatusChoice.APPROVED
+        ).exists()
+
+
+class TestBulkTransitionEndpoint:
+    """Набор тестов эндпоинта массовой смены статуса."""
+
+    url = reverse("api:payouts-bulk-transition")
+
+    def test_by_uids(self, api_client, payout_card, payout_bank):
+        """Тест отмены заявок по списку uid."""
+        response = api_client.post(
+            self.url,
+            {
+                "status": "cancelled",
+                "payout_uids": [str(payout_card.payout_uid)],
+            },
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "status": "cancelled",
+            "updated": [str(payout_card.payout_uid)],
+            "conflicts": [],
+            "not_found": [],
+        }
+        payout_bank.refresh_from_db()
+        assert payout_bank.status == StatusChoice.PENDING
+
+    def test_by_filter(self, api_client, payout_card, payout_bank):
+        """Тест отмены заявок по фильтру."""
+        response = api_client.post(
+            self.url,
+            {"status": "cancelled", "filter": {"currency": "USD"}},
+            format="json",
+        )
+        assert response.json()["updated"] == [str(payout_bank.payout_uid)]
+        payout_card.refresh_from_db()
+        assert payout_card.status == StatusChoice.PENDING
+
+    @pytest.mark.parametrize("data", [
+        {"status": "cancelled"},
+        {"status": "completed", "payout_uids": [str(uuid.uuid4())]},
+        {"status": "cancelled", "filter": {}},
+        {"status": "cancelled", "filter": {"client": "1"}},
+        {"status": "cancelled", "filter": {"status": "unknown"}},
+        {
+            "status": "cancelled",
+            "payout_uids": [str(uuid.uuid4())],
+            "filter": {"currency": "USD"},
+        },
+    ])
+    def test_invalid(self, api_client, data):
+        """Тест отклонения некорректных запросов."""
+        response = api_client.post(self.url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,144 @@
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import FieldError
+from django.db import connection
+from django.db.models import F
+from django.urls import reverse
+from rest_framework import status
+
+from payouts.encryption import (
+    DecryptionError,
+    blind_index,
+    decrypt,
+    encrypt,
+    generate_key
+)
+from payouts.fields import Ciphertext
+from payouts.models import Payout
+from payouts.services import bulk_create_payouts
+
+
+pytestmark = pytest.mark.django_db
+
+
+def raw_requisites(payout):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT card_number, account_number, card_number_hash '
+            'FROM payouts_payout WHERE payout_uid = %s',
+            [payout.payout_uid],
+        )
+        return cursor.fetchone()
+
+
+class TestPayoutEncryption:
+    """Набор тестов шифрования номеров карт и счетов."""
+
+    def test_stored_encrypted(self, payout_card):
+        """Тест хранения номера карты в зашифрованном виде."""
+        card_number, account_number, card_hash = raw_requisites(payout_card)
+        assert card_number != '1234567890123452'
+        assert decrypt(card_number) == '1234567890123452'
+        assert account_number == ''
+        assert card_hash == blind_index('card_number', '1234567890123452')
+
+    def test_encryption_not_deterministic(self):
+        """Тест различия шифротекстов одного значения."""
+        assert encrypt('1234567890123452') != encrypt('1234567890123452')
+
+    def test_lazy_decryption(self, payout_card):
+        """Тест расшифровки только при чтении атрибута."""
+        payout = Payout.objects.get(pk=payout_card.pk)
+        assert isinstance(payout.__dict__['card_number'], Ciphertext)
+        assert payout.card_number == '1234567890123452'
+        assert payout.__dict__['card_number'] == '1234567890123452'
+
+    def test_bulk_create_sets_hash(self, payout_card):
+        """Тест вычисления хэша при пакетном создании."""
+        items = [
+            {
+                'method': payout_card.method,
+                'amount': Decimal('10.00'),
+                'currency': payout_card.currency,
+                'bank_name': payout_card.bank_name,
+                'card_number': '2201221554561246',
+                'phone': '+79856584565',
+            }
+        ]
+        created = bulk_create_payouts(items)
+        assert Payout.objects.get(
+            card_number_hash=blind_index('card_number', '2201221554561246')
+        ).pk == created[0].pk
+
+    def test_update_fields_refreshes_hash(self, payout_card):
+        """Тест пересчёта хэша при сохранении только номера карты."""
+        payout = Payout.objects.get(pk=payout_card.pk)
+        payout.card_number = '2201221554561246'
+        payout.save(update_fields=['card_number'])
+        _, _, card_hash = raw_requisites(payout)
+        assert card_hash == blind_index('card_number', '2201221554561246')
+
+    def test_queryset_update_refreshes_hash(self, payout_card):
+        """Тест пересчёта хэша при update() и bulk_update()."""
+        payouts = Payout.objects.filter(pk=payout_card.pk)
+        payouts.update(card_number='2201221554561246')
+        _, _, card_hash = raw_requisites(payout_card)
+        assert card_hash == blind_index('card_number', '2201221554561246')
+        payout = payouts.get()
+        payout.card_number = '4111111111111111'
+        Payout.objects.bulk_update([payout], ['card_number'])
+        card_number, _, card_hash = raw_requisites(payout_card)
+        assert decrypt(card_number) == '4111111111111111'
+        assert card_hash == blind_index('card_number', '4111111111111111')
+        with pytest.raises(FieldError):
+            payouts.update(card_number=F('account_number'))
+
+    @pytest.mark.parametrize("lookup", ["", "__iexact", "__startswith"])
+    def test_lookup_rejected(self, payout_card, lookup):
+        """Тест запрета поиска по шифротексту."""
+        with pytest.raises(FieldError):
+            Payout.objects.filter(
+                **{f'card_number{lookup}': '1234567890123452'}
+            )
+        assert Payout.objects.filter(card_number__isnull=False).exists()
+
+    def test_unchanged_value_keeps_ciphertext(self, payout_card):
+        """Тест сохранения без повторного шифрования нерасшифрованного поля."""
+        before = raw_requisites(payout_card)
+        payout = Payout.objects.get(pk=payout_card.pk)
+        payout.bank_name = 'Другой банк'
+        payout.save()
+        assert raw_requisites(payout) == before
+
+    def test_key_rotation(self, payout_card, settings):
+        """Тест расшифровки старых значений после смены ключа."""
+        old_key, new_key = generate_key(), generate_key()
+        settings.PAYOUT_ENCRYPTION_KEYS = [old_key]
+        token = encrypt('1234567890123452')
+        settings.PAYOUT_ENCRYPTION_KEYS = [new_key, old_key]
+        assert decrypt(token) == '1234567890123452'
+        settings.PAYOUT_ENCRYPTION_KEYS = [new_key]
+        with pytest.raises(DecryptionError):
+            decrypt(token)
+
+    @pytest.mark.parametrize("fast_read", [True, False])
+    def test_api_returns_plaintext(
+        self, api_client, payout_card, payout_bank, settings, fast_read
+    ):
+        """Тест расшифрованных номеров в списке и карточке выплаты."""
+        settings.PAYOUT_FAST_READ = fast_read
+        response = api_client.get(reverse("api:payouts-list"))
+        assert response.status_code == status.HTTP_200_OK
+        numbers = {
+            (item["card_number"], item["account_number"])
+            for item in response.json()["results"]
+        }
+        assert numbers == {
+            ("1234567890123452", ""),
+            ("", "12345678901234527890"),
+        }
+        response = api_client.get(
+            reverse("api:payouts-detail", args=[payout_card.payout_uid])
+        )
+        assert response.json()["card_number"] == "1234567890123452"
@@ -0,0 +1,192 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import sync_to_async
+from unittest.mock import AsyncMock, MagicMock, patch
+from django.db import connections
+from django.urls import reverse
+from rest_framework import status
+
+from api.events import stream_statuses
+from config.asgi import application
+from payouts.events import status_channel, subscriptions
+from payouts.models import Payout, StatusChoice
+from payouts.processor import process_payouts
+from payouts.providers import FakeProvider
+
+
+def published(redis_client):
+    pipeline = redis_client.pipeline.return_value
+    return [
+        (call.args[0], json.loads(call.args[1])["status"])
+        for call in pipeline.publish.call_args_list
+    ]
+
+
+class FakePubSub:
+    """Pub/sub-подключение Redis в памяти."""
+
+    def __init__(self):
+        self.channels = set()
+        self.subscribed = []
+        self.connected = False
+        self.closed = False
+        self.messages = None
+
+    async def connect(self):
+        self.connected = True
+
+    async def subscribe(self, *channels):
+        self.subscribed.extend(channels)
+        self.channels.update(channels)
+
+    async def unsubscribe(self, *channels):
+        self.channels.difference_update(channels)
+
+    async def get_message(self, ignore_subscribe_messages, timeout):
+        if self.messages is None:
+            self.messages = asyncio.Queue()
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        self.closed = True
+
+    def publish(self, payout_uid, status):
+        self.messages.put_nowait({
+            "channel": status_channel(payout_uid).encode(),
+            "data": json.dumps({
+                "payout_uid": str(payout_uid),
+                "status": status,
+                "updated_at": "2025-01-01T00:00:00+03:00",
+            }),
+        })
+
+
+async def collect(stream):
+    chunks = [chunk async for chunk in stream]
+    await sync_to_async(connections.close_all)()
+    return chunks
+
+
+class TestPayoutStatusEvents:
+    """Набор тестов публикации и подписки на смену статусов."""
+
+    @pytest.mark.django_db
+    def test_publish_on_processing(
+        self, redis_client, payout_card, django_capture_on_commit_callbacks
+    ):
+        """Тест публикации переходов статуса воркером."""
+        with django_capture_on_commit_callbacks(execute=True):
+            process_payouts(
+                [payout_card.payout_uid], FakeProvider(latency=0)
+            )
+        channel = status_channel(payout_card.payout_uid)
+        assert published(redis_client) == [
+            (channel, StatusChoice.PROCESSING),
+            (channel, StatusChoice.COMPLETED),
+        ]
+
+    @pytest.mark.django_db
+    def test_publish_on_patch(
+        self, api_client, redis_client, payout_card,
+        django_capture_on_commit_callbacks
+    ):
+        """Тест публикации смены статуса через PATCH."""
+        url = reverse("api:payouts-detail", args=[payout_card.payout_uid])
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(url, {"status": StatusChoice.CANCELLED})
+        assert published(redis_client) == [
+            (status_channel(payout_card.payout_uid), StatusChoice.CANCELLED)
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_stream_until_terminal(self, settings, payout_card, payout_bank):
+        """Тест потоков событий до конечного статуса всех заявок."""
+        settings.PAYOUT_EVENTS_HEARTBEAT = 0.05
+        Payout.objects.filter(pk=payout_bank.pk).update(
+            status=StatusChoice.COMPLETED
+        )
+
+        async def scenario(pubsub):
+            async def publish_later():
+                await asyncio.sleep(0.3)
+                pubsub.publish(payout_card.payout_uid, StatusChoice.COMPLETED)
+
+            chunks = await asyncio.gather(
+                collect(stream_statuses(
+                    [payout_card.payout_uid, payout_bank.payout_uid]
+                )),
+                collect(stream_statuses([payout_card.payout_uid])),
+                publish_later(),
+            )
+            await subscriptions.stop()
+            return chunks[:2]
+
+        pubsub = FakePubSub()
+        client = MagicMock(pubsub=MagicMock(return_value=pubsub))
+        client.aclose = AsyncMock()
+        with patch("payouts.events.get_async_client", return_value=client):
+            both, card = asyncio.run(scenario(pubsub))
+        client.pubsub.assert_called_once()
+        # Канал заявки, на которую подписаны оба потока, подписан один раз
+        assert sorted(pubsub.subscribed) == sorted(
+            map(status_channel, [payout_card.payout_uid, payout_bank.pk])
+        )
+        assert pubsub.channels == set()
+        for chunks, size in ((both, 2), (card, 1)):
+            assert ": keepalive\n\n" in chunks[size:-1]
+            assert StatusChoice.COMPLETED in chunks[-1]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_stream_ends_on_failed(self, payout_card):
+        """Тест закрытия потока для заявки в статусе failed."""
+        Payout.objects.filter(pk=payout_card.pk).update(
+            status=StatusChoice.FAILED
+        )
+
+        async def scenario():
+            chunks = await collect(stream_statuses([payout_card.payout_uid]))
+            await subscriptions.stop()
+            return chunks
+
+        client = MagicMock(pubsub=MagicMock(return_value=FakePubSub()))
+        client.aclose = AsyncMock()
+        with patch("payouts.events.get_async_client", return_value=client):
+            chunks = asyncio.run(scenario())
+        assert len(chunks) == 1
+        assert StatusChoice.FAILED in chunks[0]
+
+    def test_lifespan_starts_subscriptions(self):
+        """Тест создания общего pub/sub-подключения при старте ASGI."""
+        messages = [
+            {"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}
+        ]
+        sent = []
+
+        async def receive():
+            await asyncio.sleep(0)
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        pubsub = FakePubSub()
+        client = MagicMock(pubsub=MagicMock(return_value=pubsub))
+        client.aclose = AsyncMock()
+        with patch("payouts.events.get_async_client", return_value=client):
+            asyncio.run(application({"type": "lifespan"}, receive, send))
+        assert sent == [
+            "lifespan.startup.complete", "lifespan.shutdown.complete"
+        ]
+        assert pubsub.connected and pubsub.closed
+        client.aclose.assert_awaited_once()
+
+    def test_subscribe_invalid_uid(self, api_client):
+        """Тест подписки с некорректным UUID заявки."""
+        url = reverse("api:payouts-events")
+        response = api_client.get(url, {"payout_uid": "not-a-uuid"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
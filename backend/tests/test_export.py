@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from api.serializers import PayoutReadSerializer
+from payouts.models import StatusChoice
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestPayoutExport:
+    """Набор тестов потоковой выгрузки выплат."""
+
+    def test_export_csv(self, api_client, payout_card, payout_bank):
+        """Тест выгрузки CSV с фильтром по валюте."""
+        url = reverse("api:payouts-export")
+        response = api_client.get(url, {"currency": "RUB"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert len(rows) == 1
+        assert rows[0] == PayoutReadSerializer(payout_card).data
+
+    def test_export_ndjson(self, api_client, payout_card, payout_bank):
+        """Тест выгрузки NDJSON, совпадающей с данными API."""
+        url = reverse("api:payouts-export")
+        response = api_client.get(url, {"export_format": "ndjson"})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        rows = {
+            row["payout_uid"]: row for row in map(json.loads, lines)
+        }
+        assert rows[str(payout_bank.payout_uid)] == (
+            PayoutReadSerializer(payout_bank).data
+        )
+        assert len(rows) == 2
+
+    def test_export_invalid_format(self, api_client):
+        """Тест выгрузки в неподдерживаемом формате."""
+        url = reverse("api:payouts-export")
+        response = api_client.get(url, {"export_format": "xml"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_command(self, payout_card, payout_bank):
+        """Тест выгрузки через management-команду."""
+        out = io.StringIO()
+        call_command(
+            "export_payouts", "--format", "ndjson",
+            "--status", StatusChoice.PENDING, stdout=out,
+        )
+        assert len(out.getvalue().splitlines()) == 2
@@ -0,0 +1,171 @@
+import re
+from itertools import combinations
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from api.filters import filter_payouts
+from api.pagination import PayoutPagination
+from payouts.models import Payout, PaymentMethodChoice, StatusChoice
+
+
+pytestmark = pytest.mark.django_db
+
+FILTER_PARAMS = {
+    "status": "pending,approved",
+    "currency": "RUB",
+    "method": "card",
+    "amount_min": "10",
+    "amount_max": "1000",
+    "created_after": "2025-01-01",
+    "created_before": "2025-02-01T00:00:00+03:00",
+    "updated_after": "2025-01-01",
+    "updated_before": "2025-02-01",
+}
+CREATED = "created_at"
+PAGE_SIZE = 20
+
+
+def page(params):
+    return filter_payouts(Payout.objects.all(), params).order_by(
+        *PayoutPagination.ordering
+    )[:PAGE_SIZE + 1]
+
+
+def scanned_indexes(plan):
+    return {
+        name for names in re.findall(
+            r"Index(?: Only)? Scan(?: Backward)? using (\w+)"
+            r"|Bitmap Index Scan on (\w+)",
+            plan,
+        )
+        for name in names if name
+    }
+
+
+def created_indexes():
+    """Полные индексы, начинающиеся с created_at."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, Payout._meta.db_table
+        )
+    return {
+        name for name, constraint in constraints.items()
+        if constraint["index"]
+        and constraint["columns"][:1] == ["created_at"]
+        and name != "payout_active_created_idx"
+    }
+
+
+class TestPayoutFilters:
+    """Набор тестов серверной фильтрации выплат."""
+
+    def test_filter_status_currency(
+        self, api_client, payout_card, payout_bank
+    ):
+        """Тест фильтрации по статусу и валюте."""
+        url = reverse("api:payouts-list")
+        response = api_client.get(
+            url, {"status": StatusChoice.PENDING, "currency": "USD"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["payout_uid"] for item in response.data["results"]] == [
+            str(payout_bank.payout_uid)
+        ]
+
+    def test_filter_amount_and_method(
+        self, api_client, payout_card, payout_bank
+    ):
+        """Тест фильтрации по способу выплаты и диапазону суммы."""
+        url = reverse("api:payouts-list")
+        response = api_client.get(url, {
+            "method": PaymentMethodChoice.CARD_TRANSFER,
+            "amount_min": "50",
+            "amount_max": "150",
+            "cursor": "",
+        })
+        assert [item["payout_uid"] for item in response.data["results"]] == [
+            str(payout_card.payout_uid)
+        ]
+
+    def test_filter_created_window(self, api_client, payout_card):
+        """Тест фильтрации по окну даты создания."""
+        url = reverse("api:payouts-list")
+        created = payout_card.created_at.date().isoformat()
+        response = api_client.get(url, {"created_after": created})
+        assert len(response.data["results"]) == 1
+        response = api_client.get(url, {"created_before": created})
+        assert len(response.data["results"]) == 0
+
+    @pytest.mark.parametrize(
+        "params,invalid_field",
+        [
+            ({"status": "unknown"}, "status"),
+            ({"currency": "RUB,рубли"}, "currency"),
+            ({"amount_min": "много"}, "amount_min"),
+            ({"updated_after": "вчера"}, "updated_after"),
+            ({"created_after": "2025-02-30"}, "created_after"),
+            ({"created_before": "2025-13-01T00:00:00"}, "created_before"),
+            ({"amount_min": "NaN"}, "amount_min"),
+            ({"amount_max": "Infinity"}, "amount_max"),
+        ],
+    )
+    def test_filter_invalid(self, api_client, params, invalid_field):
+        """Тест некорректных значений фильтров."""
+        response = api_client.get(reverse("api:payouts-list"), params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert invalid_field in response.data
+
+
+@pytest.mark.usefixtures("payout_table")
+class TestPayoutFilterPlans:
+    """Набор тестов планов запросов страницы выдачи с фильтрами."""
+
+    @pytest.mark.parametrize(
+        "params,expected",
+        [
+            ({}, CREATED),
+            ({"currency": "RUB"}, CREATED),
+            ({"method": "card"}, CREATED),
+            ({"amount_min": "10", "amount_max": "1000"}, CREATED),
+            ({"status": "completed"}, CREATED),
+            ({"created_after": "2025-01-01", "created_before": "2025-02-01"},
+             CREATED),
+            ({"updated_after": "2025-01-01", "updated_before": "2025-02-01"},
+             CREATED),
+            ({"currency": "USD", "method": "bank",
+              "created_after": "2025-01-01"}, CREATED),
+            ({"status": "pending,approved"}, "payout_active_created_idx"),
+            ({"status": "pending", "currency": "RUB"},
+             "payout_active_created_idx"),
+            ({"status": "processing", "method": "card"},
+             "payout_active_created_idx"),
+            ({"status": "pending", "updated_after": "2025-01-01",
+              "updated_before": "2025-02-01"}, "payout_active_updated_idx"),
+        ],
+    )
+    def test_filters_plan(self, explain, params, expected):
+        """
+        Тест выбора индекса планировщиком для страницы выдачи.
+
+        Страница упорядочена по created_at, поэтому без фильтра
+        по активным статусам индекс created_at читается с конца;
+        активные статусы читаются частичными индексами.
+        """
+        plan = explain(page(params))
+        indexes = scanned_indexes(plan)
+        if expected == CREATED:
+            assert indexes and indexes <= created_indexes(), plan
+        else:
+            assert indexes == {expected}, plan
+
+    def test_filters_use_indexes(self, explain):
+        """Тест отсутствия полного чтения таблицы при любых фильтрах."""
+        names = list(FILTER_PARAMS)
+        for size in range(1, len(names) + 1):
+            for combination in combinations(names, size):
+                params = {name: FILTER_PARAMS[name] for name in combination}
+                plan = explain(page(params))
+                assert "Seq Scan" not in plan, (combination, plan)
@@ -0,0 +1,116 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from payouts.fx import (
+    convert,
+    get_rate,
+    load_rates,
+    normalized_total,
+    parse_rate,
+    stub_rates
+)
+from payouts.models import FxRate, Payout
+from payouts.stats import payout_day, query_stats
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def rates(payout_card):
+    """Курсы на день создания заявок и днём ранее."""
+    day = payout_day(payout_card.created_at)
+    load_rates([
+        parse_rate(day - timedelta(days=1), 'USD', '80'),
+        parse_rate(day, 'USD', '90'),
+        parse_rate(day, 'EUR', '100'),
+    ])
+    return day
+
+
+class TestFxRates:
+    """Набор тестов курсов валют и пересчёта сумм."""
+
+    def test_get_rate_as_of(self, rates):
+        """Тест выбора последнего снимка не позже дня."""
+        assert get_rate('USD', rates) == Decimal('90')
+        assert get_rate('USD', rates - timedelta(days=1)) == Decimal('80')
+        assert get_rate('USD', rates - timedelta(days=2)) is None
+        assert get_rate('RUB', rates) == Decimal('1')
+
+    def test_get_rate_cached(self, rates, django_assert_num_queries):
+        """Тест кэширования курса в процессе."""
+        get_rate('USD', rates)
+        with django_assert_num_queries(0):
+            assert get_rate('USD', rates) == Decimal('90')
+
+    def test_convert(self, rates):
+        """Тест пересчёта суммы между валютами."""
+        assert convert(Decimal('10'), 'USD', day=rates) == Decimal('900.00')
+        assert convert(Decimal('90'), 'USD', 'EUR', rates) == Decimal(
+            '81.00'
+        )
+        assert convert(Decimal('10'), 'CNY', day=rates) is None
+
+    def test_normalized_total(self, rates, payout_card, payout_bank):
+        """Тест итога в базовой валюте одним запросом."""
+        assert normalized_total(Payout.objects.all()) == (
+            Decimal('22600.00'), []
+        )
+        assert normalized_total(Payout.objects.all(), 'EUR') == (
+            Decimal('226.00'), []
+        )
+
+    def test_normalized_total_unconverted(self, payout_card, payout_bank):
+        """Тест списка валют без курса."""
+        assert normalized_total(Payout.objects.all()) == (
+            Decimal('100.00'), ['USD']
+        )
+
+    def test_normalized_stats(self, rates, payout_card, payout_bank):
+        """Тест пересчёта дневных итогов в одну валюту."""
+        assert query_stats(normalize_to='RUB') == [{
+            'count': 2,
+            'amount': Decimal('350.00'),
+            'normalized_amount': Decimal('22600.00'),
+        }]
+
+    def test_load_command(self, tmp_path):
+        """Тест загрузки курсов из файла и заглушки."""
+        rates_file = tmp_path / 'rates.csv'
+        rates_file.write_text(
+            'day,currency,rate\n2024-01-09,USD,89.5\n2024-01-09,EUR,98\n'
+        )
+        call_command('load_fx_rates', file=str(rates_file))
+        call_command('load_fx_rates', stub=True, day='2024-01-09')
+        assert FxRate.objects.count() == 3
+        assert FxRate.objects.get(currency='USD').rate == Decimal('90.00')
+        assert len(stub_rates()) == 3
+
+
+class TestExposureEndpoint:
+    """Набор тестов эндпоинта суммы выплат в одной валюте."""
+
+    url = reverse("api:payouts-exposure")
+
+    def test_exposure(self, api_client, rates, payout_card, payout_bank):
+        """Тест суммы отфильтрованных выплат в выбранной валюте."""
+        response = api_client.get(
+            self.url, {"currency_to": "USD", "method": "bank"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "currency": "USD",
+            "amount": "250.00",
+            "unconverted_currencies": [],
+        }
+
+    def test_exposure_invalid_currency(self, api_client):
+        """Тест отклонения неизвестной валюты."""
+        response = api_client.get(self.url, {"currency_to": "GBP"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,122 @@
+import json
+from datetime import timedelta
+
+import pytest
+from unittest.mock import patch
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from payouts.idempotency import purge_expired_keys
+from payouts.models import (
+    CurrencyChoice,
+    IdempotencyKey,
+    Payout,
+    PayoutOutbox,
+    PaymentMethodChoice
+)
+
+
+pytestmark = pytest.mark.django_db
+
+PAYOUT_DATA = {
+    "method": PaymentMethodChoice.CARD_TRANSFER,
+    "amount": 1000.0,
+    "currency": CurrencyChoice.RUB,
+    "bank_name": "Тинькофф",
+    "card_number": "2201221554561246",
+    "phone": "+79856584565",
+}
+
+
+class TestPayoutIdempotency:
+    """Набор тестов ключей идемпотентности при создании выплат."""
+
+    def test_replay(self, api_client):
+        """Тест повторного запроса с тем же ключом."""
+        url = reverse("api:payouts-list")
+        first = api_client.post(
+            url, PAYOUT_DATA, format='json', HTTP_IDEMPOTENCY_KEY="key-1"
+        )
+        assert first.status_code == status.HTTP_201_CREATED
+        with patch(
+            "api.serializers.PayoutCreateSerializer.validate"
+        ) as mocked_validate:
+            second = api_client.post(
+                url, PAYOUT_DATA, format='json',
+                HTTP_IDEMPOTENCY_KEY="key-1",
+            )
+        mocked_validate.assert_not_called()
+        assert second.status_code == status.HTTP_201_CREATED
+        assert second.data == first.data
+        assert second["Idempotent-Replayed"] == "true"
+        assert Payout.objects.count() == 1
+        assert PayoutOutbox.objects.count() == 1
+
+    def test_replay_from_db(self, api_client):
+        """Тест повторного запроса после потери записи в Redis."""
+        url = reverse("api:payouts-list")
+        first = api_client.post(
+            url, PAYOUT_DATA, format='json', HTTP_IDEMPOTENCY_KEY="key-2"
+        )
+        with patch("payouts.idempotency.cache.get", return_value=None):
+            second = api_client.post(
+                url, PAYOUT_DATA, format='json',
+                HTTP_IDEMPOTENCY_KEY="key-2",
+            )
+        assert second.data["payout_uid"] == first.data["payout_uid"]
+        assert Payout.objects.count() == 1
+
+    def test_requisites_not_stored_plaintext(self, api_client):
+        """Тест хранения ответа без открытого номера карты."""
+        url = reverse("api:payouts-list")
+        first = api_client.post(
+            url, PAYOUT_DATA, format='json', HTTP_IDEMPOTENCY_KEY="key-5"
+        )
+        stored = IdempotencyKey.objects.get(key="key-5").response_body
+        assert PAYOUT_DATA["card_number"] not in json.dumps(stored)
+        assert stored["payout_uid"] == first.data["payout_uid"]
+        with patch("payouts.idempotency.cache.get", return_value=None):
+            second = api_client.post(
+                url, PAYOUT_DATA, format='json',
+                HTTP_IDEMPOTENCY_KEY="key-5",
+            )
+        assert second.json() == first.json()
+
+    def test_key_reused_with_other_data(self, api_client):
+        """Тест повторного использования ключа с другими данными."""
+        url = reverse("api:payouts-list")
+        api_client.post(
+            url, PAYOUT_DATA, format='json', HTTP_IDEMPOTENCY_KEY="key-3"
+        )
+        response = api_client.post(
+            url, {**PAYOUT_DATA, "amount": 5.0}, format='json',
+            HTTP_IDEMPOTENCY_KEY="key-3",
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert Payout.objects.count() == 1
+
+    def test_invalid_request_not_stored(self, api_client):
+        """Тест того, что ответ с ошибкой валидации не сохраняется."""
+        url = reverse("api:payouts-list")
+        response = api_client.post(
+            url, {**PAYOUT_DATA, "card_number": ""}, format='json',
+            HTTP_IDEMPOTENCY_KEY="key-4",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not IdempotencyKey.objects.exists()
+
+    def test_purge_expired_keys(self, settings):
+        """Тест удаления ключей старше окна хранения."""
+        settings.PAYOUT_IDEMPOTENCY_RETENTION = 60
+        for key in ("old", "new"):
+            IdempotencyKey.objects.create(
+                key=key, request_hash="", status_code=201, response_body={}
+            )
+        IdempotencyKey.objects.filter(key="old").update(
+            created_at=timezone.now() - timedelta(minutes=5)
+        )
+        assert purge_expired_keys(batch_size=1) == 1
+        assert list(
+            IdempotencyKey.objects.values_list("key", flat=True)
+        ) == ["new"]
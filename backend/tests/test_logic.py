@@ -1,11 +1,11 @@
 import pytest
-from unittest.mock import patch
 from django.urls import reverse
 from rest_framework import status
 
 from payouts.models import (
     CurrencyChoice,
     Payout,
+    PayoutOutbox,
     PaymentMethodChoice,
     StatusChoice
 )
@@ -17,8 +17,7 @@ pytestmark = pytest.mark.django_db
 class TestPayoutPossitive:
     """Набор положительных тестов по работе с выплатами."""
 
-    @patch("payouts.signals.process_payout_task.delay")
-    def test_create_payout_bank(self, mocked_delay, api_client):
+    def test_create_payout_bank(self, api_client):
         """Тест создания заявки на выплату на счёт."""
         url = reverse("api:payouts-list")
         data = {
@@ -27,7 +26,7 @@ class TestPayoutPossitive:
             "currency": CurrencyChoice.RUB,
             "bank_name": "Сбербанк",
             "bank_bik": "044525225",
-            "account_number": "40817810099910004312",
+            "account_number": "40817810899910004312",
             "phone": "+79856584565",
             "description": "Оплата обучения"
         }
@@ -37,10 +36,11 @@ class TestPayoutPossitive:
         assert Payout.objects.filter(
             payout_uid=response.data["payout_uid"]
         ).exists()
-        mocked_delay.assert_called_once_with(response.data["payout_uid"])
+        assert PayoutOutbox.objects.filter(
+            payout_uid=response.data["payout_uid"]
+        ).exists()
 
-    @patch("payouts.signals.process_payout_task.delay")
-    def test_create_payout_card(self, mocked_delay, api_client):
+    def test_create_payout_card(self, api_client):
         """Тест создания заявки на выплату на карту."""
         url = reverse("api:payouts-list")
         data = {
@@ -48,14 +48,14 @@ class TestPayoutPossitive:
             "amount": 1000.0,
             "currency": CurrencyChoice.RUB,
             "bank_name": "Тинькофф",
-            "card_number": "2201221554561245",
+            "card_number": "2201221554561246",
             "phone": "+79856584565",
         }
 
         response = api_client.post(url, data, format='json')
         assert response.status_code == status.HTTP_201_CREATED
         payout_uid = response.data["payout_uid"]
-        mocked_delay.assert_called_once_with(payout_uid)
+        assert PayoutOutbox.objects.filter(payout_uid=payout_uid).count() == 1
 
     def test_get_payout(self, api_client, payout_card):
         """Тест получения информации по заявке на выплату."""
@@ -149,7 +149,7 @@ class TestPayoutNegative:
                     "currency": "рубли",
                     "bank_name": "Сбербанк",
                     "phone": "+79856584565",
-                    "account_number": "40817810099910004312",
+                    "account_number": "40817810899910004312",
                 },
                 "currency",
             ),
@@ -160,7 +160,7 @@ class TestPayoutNegative:
                     "currency": CurrencyChoice.USD,
                     "bank_name": "Сбербанк",
                     "phone": "+79856584565",
-                    "account_number": "40817810099910004312",
+                    "account_number": "40817810899910004312",
                 },
                 "amount",
             ),
@@ -171,7 +171,7 @@ class TestPayoutNegative:
                     "currency": CurrencyChoice.USD,
                     "bank_name": "Сбербанк",
                     "phone": "+7584565",
-                    "account_number": "40817810099910004312",
+                    "account_number": "40817810899910004312",
                 },
                 "phone",
             ),
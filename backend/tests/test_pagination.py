@@ -0,0 +1,90 @@
+import base64
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from payouts.models import CurrencyChoice, Payout, PaymentMethodChoice
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def payouts():
+    """Фикстура для создания пяти выплат на карту."""
+    return [
+        Payout.objects.create(
+            method=PaymentMethodChoice.CARD_TRANSFER,
+            amount=100 + index,
+            currency=CurrencyChoice.RUB,
+            bank_name="Test bank",
+            card_number="1234567890123452",
+            phone="89526984567",
+        )
+        for index in range(5)
+    ]
+
+
+class TestPayoutKeysetPagination:
+    """Набор тестов keyset пагинации списка выплат."""
+
+    def test_walk_pages(self, api_client, payouts):
+        """Тест обхода всех страниц вперёд и назад по курсору."""
+        url = reverse("api:payouts-list") + "?cursor=&limit=2"
+        expected = [
+            str(payout.payout_uid) for payout in
+            Payout.objects.order_by("-created_at", "-payout_uid")
+        ]
+        seen, pages = [], []
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert "count" not in response.data
+            pages.append(response.data)
+            seen += [item["payout_uid"] for item in response.data["results"]]
+            url = response.data["next"]
+        assert seen == expected
+        assert len(pages) == 3
+        assert pages[0]["previous"] is None
+        response = api_client.get(pages[2]["previous"])
+        assert [
+            item["payout_uid"] for item in response.data["results"]
+        ] == expected[2:4]
+        assert response.data["previous"] is not None
+
+    def test_count_modes(self, api_client, payouts):
+        """Тест точного и оценочного подсчёта количества выплат."""
+        url = reverse("api:payouts-list")
+        response = api_client.get(url, {"cursor": "", "count": "exact"})
+        assert response.data["count"] == 5
+        response = api_client.get(
+            url, {"cursor": "", "count": "estimated"}
+        )
+        assert response.data["count"] >= 0
+
+    def test_invalid_cursor(self, api_client, payouts):
+        """Тест запроса с некорректным курсором."""
+        url = reverse("api:payouts-list")
+        response = api_client.get(url, {"cursor": "invalid"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize(
+        "position",
+        [
+            ["2020-01-01T00:00:00", 123],
+            [123, "0b3c0e1c-2a4f-4c65-9d6b-3a1f5c1f1b8e"],
+            ["2020-02-30T00:00:00", "0b3c0e1c-2a4f-4c65-9d6b-3a1f5c1f1b8e"],
+            {"created_at": "2020-01-01T00:00:00"},
+            "2020-01-01T00:00:00",
+            ["2020-01-01T00:00:00"],
+        ],
+    )
+    def test_malformed_cursor(self, api_client, payouts, position):
+        """Тест курсора с элементами неверного типа или значения."""
+        token = base64.urlsafe_b64encode(json.dumps(position).encode())
+        response = api_client.get(
+            reverse("api:payouts-list"), {"cursor": token.decode()}
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
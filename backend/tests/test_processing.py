@@ -0,0 +1,153 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from celery.exceptions import Retry
+
+from payouts.models import Payout, StatusChoice
+from payouts.processor import (
+    claim_payouts,
+    process_payouts,
+    process_pending_payouts,
+    retry_delay,
+    run_batch,
+)
+from payouts.providers import (
+    FakeProvider,
+    FaultyProvider,
+    TransientProviderError
+)
+from payouts.tasks import process_payout_batch_task
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestPayoutProcessing:
+    """Набор тестов асинхронной обработки выплат."""
+
+    def test_process_payouts(self, payout_card, payout_bank):
+        """Тест обработки пачки корректных заявок."""
+        statuses = process_payouts(
+            [payout_card.payout_uid, payout_bank.payout_uid],
+            provider=FakeProvider(latency=0),
+        )
+        assert set(statuses.values()) == {StatusChoice.COMPLETED}
+        payout_card.refresh_from_db()
+        assert payout_card.status == StatusChoice.COMPLETED
+
+    def test_process_payouts_reject(self, payout_card):
+        """Тест отклонения заявки с некорректным номером карты."""
+        Payout.objects.filter(pk=payout_card.pk).update(card_number="123")
+        process_payouts([payout_card.payout_uid], FakeProvider(latency=0))
+        payout_card.refresh_from_db()
+        assert payout_card.status == StatusChoice.REJECTED
+
+    def test_process_payouts_skips_terminal(self, payout_card):
+        """Тест пропуска заявок в конечном статусе."""
+        Payout.objects.filter(pk=payout_card.pk).update(
+            status=StatusChoice.CANCELLED
+        )
+        statuses = process_payouts(
+            [payout_card.payout_uid], FakeProvider(latency=0)
+        )
+        assert statuses == {}
+
+    def test_run_batch_concurrency(self, payout_card):
+        """Тест одновременной отправки выплат провайдеру."""
+        payouts = [payout_card] * 500
+        statuses = asyncio.run(
+            run_batch(FakeProvider(latency=0.01), payouts, concurrency=500)
+        )
+        assert statuses == {payout_card.payout_uid: StatusChoice.COMPLETED}
+
+    def test_claim_payouts_skip_locked(self, payout_card, payout_bank):
+        """Тест того, что забранные заявки не выдаются повторно."""
+        claimed = claim_payouts(limit=1)
+        assert len(claimed) == 1
+        assert claimed[0].status == StatusChoice.PROCESSING
+        claimed_again = claim_payouts(limit=10)
+        assert [payout.pk for payout in claimed_again] != [claimed[0].pk]
+        assert len(claimed_again) == 1
+        assert claim_payouts(limit=10) == []
+
+    def test_process_pending_payouts(self, payout_card, payout_bank):
+        """Тест пакетной обработки ожидающих заявок."""
+        statuses = process_pending_payouts(
+            limit=10, provider=FakeProvider(latency=0)
+        )
+        assert len(statuses) == 2
+        assert not Payout.objects.exclude(
+            status=StatusChoice.COMPLETED
+        ).exists()
+
+
+class TestPayoutRetries:
+    """Набор тестов повторов при ошибках провайдера."""
+
+    def test_transient_error_keeps_processing(self, payout_card):
+        """Тест сохранения заявки в processing при временной ошибке."""
+        statuses = process_payouts(
+            [payout_card.payout_uid], FaultyProvider(0, failure_rate=1)
+        )
+        assert statuses == {payout_card.payout_uid: StatusChoice.PROCESSING}
+        payout_card.refresh_from_db()
+        assert payout_card.status == StatusChoice.PROCESSING
+        assert payout_card.retry_count == 1
+        statuses = process_payouts(
+            [payout_card.payout_uid], FakeProvider(latency=0), retry=True
+        )
+        assert statuses == {payout_card.payout_uid: StatusChoice.COMPLETED}
+
+    def test_permanent_error_rejects(self, payout_card):
+        """Тест немедленного отклонения при постоянной ошибке."""
+        process_payouts(
+            [payout_card.payout_uid],
+            FaultyProvider(0, failure_rate=0, permanent_rate=1),
+        )
+        payout_card.refresh_from_db()
+        assert payout_card.status == StatusChoice.REJECTED
+        assert payout_card.retry_count == 0
+
+    def test_retries_exhausted(self, settings, payout_card):
+        """Тест перевода в failed после исчерпания повторов."""
+        settings.PAYOUT_MAX_RETRIES = 2
+        Payout.objects.filter(pk=payout_card.pk).update(
+            status=StatusChoice.PROCESSING, retry_count=2
+        )
+        statuses = process_payouts(
+            [payout_card.payout_uid], FaultyProvider(0, failure_rate=1),
+            retry=True,
+        )
+        assert statuses == {payout_card.payout_uid: StatusChoice.FAILED}
+
+    @patch("payouts.tasks.process_payouts")
+    @patch("payouts.tasks.process_payout_batch_task.retry")
+    def test_task_retries_with_backoff(self, mocked_retry, mocked_process):
+        """Тест повтора задачи с экспоненциальной задержкой."""
+        mocked_retry.side_effect = Retry()
+        mocked_process.return_value = {"a": StatusChoice.PROCESSING}
+        process_payout_batch_task.apply(args=[["a"]])
+        mocked_retry.assert_called_once()
+        assert mocked_retry.call_args.kwargs["args"] == [["a"]]
+        assert mocked_retry.call_args.kwargs["kwargs"] == {"retry": True}
+        assert 1 <= mocked_retry.call_args.kwargs["countdown"] <= 2
+
+    def test_retry_delay(self, settings):
+        """Тест роста задержки повтора и её ограничения сверху."""
+        settings.PAYOUT_RETRY_BACKOFF_BASE = 2
+        settings.PAYOUT_RETRY_BACKOFF_MAX = 60
+        for retries, (low, high) in enumerate([(1, 2), (2, 4), (4, 8)]):
+            assert low <= retry_delay(retries) <= high
+        assert 30 <= retry_delay(20) <= 60
+
+    def test_faulty_provider_rate(self):
+        """Тест доли ошибок локального провайдера с ошибками."""
+        provider = FaultyProvider(0, failure_rate=0.3, seed=1)
+        failures = 0
+        for _ in range(1000):
+            try:
+                asyncio.run(provider.send_payout(None))
+            except TransientProviderError:
+                failures += 1
+        assert 250 < failures < 350
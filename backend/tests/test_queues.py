@@ -0,0 +1,97 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+from django.urls import reverse
+from django.utils import timezone
+
+from payouts.models import Payout, StatusChoice
+from payouts.processor import PROCESSABLE_STATUSES
+from payouts.queues import queue_depth, stuck_payouts
+from payouts.transitions import transition
+
+
+pytestmark = pytest.mark.django_db
+
+
+def make_stale(payout, status_value, seconds):
+    Payout.objects.filter(pk=payout.pk).update(
+        status=status_value,
+        updated_at=timezone.now() - timedelta(seconds=seconds),
+    )
+
+
+class TestPayoutQueues:
+    """Набор тестов запросов по активным заявкам."""
+
+    def test_stuck_payouts(self, payout_card, payout_bank):
+        """Тест поиска заявок, зависших в активном статусе."""
+        make_stale(payout_card, StatusChoice.PROCESSING, 3600)
+        make_stale(payout_bank, StatusChoice.COMPLETED, 3600)
+        assert list(
+            stuck_payouts(600).values_list('payout_uid', flat=True)
+        ) == [payout_card.payout_uid]
+        assert not stuck_payouts(7200).exists()
+
+    def test_queue_depth(self, payout_card, payout_bank):
+        """Тест подсчёта активных заявок по статусу, валюте и способу."""
+        make_stale(payout_bank, StatusChoice.COMPLETED, 0)
+        assert list(queue_depth()) == [{
+            'status': StatusChoice.PENDING,
+            'currency': payout_card.currency,
+            'method': payout_card.method,
+            'count': 1,
+        }]
+
+    def test_metrics(self, client, payout_card):
+        """Тест выгрузки глубины очереди и зависших заявок в метриках."""
+        make_stale(payout_card, StatusChoice.PROCESSING, 3600)
+        body = client.get(reverse("api:metrics")).content.decode()
+        assert 'payout_stuck{status="processing"} 1' in body
+        assert (
+            f'payout_queue_depth{{currency="{payout_card.currency}",'
+            f'method="{payout_card.method}",status="processing"}} 1'
+        ) in body
+
+    def test_failed_metrics(
+        self, client, payout_card, django_capture_on_commit_callbacks
+    ):
+        """Тест выгрузки заявок в failed в метриках."""
+        make_stale(payout_card, StatusChoice.PROCESSING, 0)
+        with django_capture_on_commit_callbacks(execute=True):
+            transition([payout_card.payout_uid], StatusChoice.FAILED)
+        body = client.get(reverse("api:metrics")).content.decode()
+        assert (
+            f'payout_failed{{currency="{payout_card.currency}"}} 1'
+        ) in body
+        assert 'payouts_failed_total 1' in body
+
+    def test_command(self, payout_card):
+        """Тест команды поиска зависших заявок."""
+        make_stale(payout_card, StatusChoice.APPROVED, 3600)
+        out = StringIO()
+        call_command('scan_stuck_payouts', stdout=out)
+        assert str(payout_card.payout_uid) in out.getvalue()
+
+
+@pytest.mark.usefixtures("payout_table")
+class TestPayoutQueuePlans:
+    """Набор тестов планов запросов воркера на таблице большого размера."""
+
+    def test_partial_indexes_used(self, explain):
+        """Тест использования частичных индексов запросами воркера."""
+        claim = (
+            Payout.objects.filter(status__in=PROCESSABLE_STATUSES)
+            .order_by('created_at')[:10]
+        )
+        assert "payout_active_created_idx" in explain(claim)
+        assert "payout_active_updated_idx" in explain(
+            stuck_payouts(600, [StatusChoice.PROCESSING])[:100]
+        )
+        assert "payout_active_queue_idx" in explain(queue_depth())
+        assert "Seq Scan" not in explain(
+            Payout.objects.filter(status=StatusChoice.FAILED)
+            .order_by().values('currency').annotate(count=Count('*'))
+        )
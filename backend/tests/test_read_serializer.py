@@ -0,0 +1,93 @@
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+
+from payouts import metrics
+from payouts.models import Payout, StatusChoice
+from payouts.processor import process_payouts
+from payouts.providers import FakeProvider
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestPayoutFastRead:
+    """Набор тестов быстрого сериализатора чтения выплат."""
+
+    @pytest.mark.parametrize("params", [{}, {"cursor": "", "limit": 1}])
+    def test_list_identical(
+        self, api_client, settings, payout_card, payout_bank, params
+    ):
+        """Тест побайтового совпадения списка с PayoutReadSerializer."""
+        url = reverse("api:payouts-list")
+        settings.PAYOUT_FAST_READ = True
+        fast = api_client.get(url, params).content
+        settings.PAYOUT_FAST_READ = False
+        assert fast == api_client.get(url, params).content
+
+    def test_retrieve_identical(self, api_client, settings, payout_bank):
+        """Тест побайтового совпадения детального ответа."""
+        Payout.objects.filter(pk=payout_bank.pk).update(phone="+7 (495) 1")
+        url = reverse("api:payouts-detail", args=[payout_bank.payout_uid])
+        settings.PAYOUT_FAST_READ = True
+        fast = api_client.get(url).content
+        settings.PAYOUT_FAST_READ = False
+        assert fast == api_client.get(url).content
+
+    @pytest.mark.parametrize("fast_read", [True, False])
+    def test_swagger_schema(self, client, settings, fast_read):
+        """Тест построения схемы OpenAPI при любом режиме чтения."""
+        settings.PAYOUT_FAST_READ = fast_read
+        response = client.get(
+            reverse("schema-swagger-ui"), {"format": "openapi"}
+        )
+        assert response.status_code == 200
+        schema = response.json()
+        assert "card_number" in schema["definitions"]["PayoutRead"][
+            "properties"
+        ]
+
+
+class TestPayoutReadCache:
+    """Набор тестов кэша детальных ответов по выплатам."""
+
+    def test_retrieve_cached(
+        self, api_client, payout_card, django_assert_num_queries
+    ):
+        """Тест ответа из кэша без обращения к БД."""
+        url = reverse("api:payouts-detail", args=[payout_card.payout_uid])
+        first = api_client.get(url)
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+        assert second.data == first.data
+        assert "payout_cache_hits_total 1" in metrics.collect()
+
+    def test_cached_requisites_encrypted(self, api_client, payout_bank):
+        """Тест хранения номера счёта в кэше в зашифрованном виде."""
+        url = reverse("api:payouts-detail", args=[payout_bank.payout_uid])
+        first = api_client.get(url)
+        cached = caches["payouts"].get(str(payout_bank.payout_uid))
+        assert cached["account_number"] != payout_bank.account_number
+        assert payout_bank.account_number not in str(cached)
+        assert api_client.get(url).content == first.content
+
+    def test_invalidate_on_update(self, api_client, payout_card):
+        """Тест сброса кэша при смене статуса через PATCH."""
+        url = reverse("api:payouts-detail", args=[payout_card.payout_uid])
+        api_client.get(url)
+        api_client.patch(url, {"status": StatusChoice.CANCELLED})
+        response = api_client.get(url)
+        assert response.data["status"] == StatusChoice.CANCELLED
+
+    def test_invalidate_on_processing(
+        self, api_client, payout_card, django_capture_on_commit_callbacks
+    ):
+        """Тест сброса кэша при обработке заявки воркером."""
+        url = reverse("api:payouts-detail", args=[payout_card.payout_uid])
+        api_client.get(url)
+        with django_capture_on_commit_callbacks(execute=True):
+            process_payouts(
+                [payout_card.payout_uid], FakeProvider(latency=0)
+            )
+        response = api_client.get(url)
+        assert response.data["status"] == StatusChoice.COMPLETED
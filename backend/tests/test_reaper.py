@@ -0,0 +1,60 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+
+from payouts.models import Payout, PayoutStatusEvent, StatusChoice
+from payouts.processor import claim_payouts
+from payouts.reaper import reap_stuck_payouts
+
+
+pytestmark = pytest.mark.django_db
+
+
+def make_stuck(payout, attempts, seconds=3600):
+    Payout.objects.filter(pk=payout.pk).update(
+        status=StatusChoice.PROCESSING,
+        attempts=attempts,
+        updated_at=timezone.now() - timedelta(seconds=seconds),
+    )
+
+
+class TestPayoutReaper:
+    """Набор тестов возврата зависших заявок в очередь."""
+
+    def test_claim_counts_attempts(self, payout_card):
+        """Тест увеличения счётчика попыток при взятии в обработку."""
+        claim_payouts([payout_card.payout_uid])
+        payout_card.refresh_from_db()
+        assert payout_card.attempts == 1
+
+    @patch("payouts.reaper.enqueue_payouts")
+    def test_requeue_stuck(
+        self, enqueue, payout_card, payout_bank,
+        django_capture_on_commit_callbacks,
+    ):
+        """Тест возврата зависшей заявки в pending и в очередь."""
+        make_stuck(payout_card, 1)
+        make_stuck(payout_bank, 1, seconds=10)
+        with django_capture_on_commit_callbacks(execute=True):
+            result = reap_stuck_payouts(visibility_timeout=300)
+        assert result == {'requeued': 1, 'failed': 0}
+        enqueue.assert_called_once_with([payout_card.payout_uid])
+        payout_card.refresh_from_db()
+        payout_bank.refresh_from_db()
+        assert payout_card.status == StatusChoice.PENDING
+        assert payout_bank.status == StatusChoice.PROCESSING
+        assert PayoutStatusEvent.objects.get().to_status == (
+            StatusChoice.PENDING
+        )
+
+    @patch("payouts.reaper.enqueue_payouts")
+    def test_dead_letter(self, enqueue, payout_card):
+        """Тест перевода в failed после исчерпания попыток."""
+        make_stuck(payout_card, 3)
+        result = reap_stuck_payouts(visibility_timeout=300, max_attempts=3)
+        assert result == {'requeued': 0, 'failed': 1}
+        enqueue.assert_not_called()
+        payout_card.refresh_from_db()
+        assert payout_card.status == StatusChoice.FAILED
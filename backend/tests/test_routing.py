@@ -0,0 +1,179 @@
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+from kombu.exceptions import ChannelError, OperationalError
+
+from payouts.fx import load_rates, stub_rates
+from payouts.models import (
+    CurrencyChoice,
+    Payout,
+    PaymentMethodChoice,
+    StatusChoice
+)
+from payouts.processor import claim_payouts
+from payouts.routing import (
+    collect_broker_queue_depth,
+    route_payout,
+    route_queue,
+    route_task,
+)
+from payouts.services import enqueue_payouts
+from payouts.tasks import claim_pending_payouts_task
+
+
+pytestmark = pytest.mark.django_db
+
+ROUTES = [
+    {'queue': 'payouts.large', 'amount_min': '1000000'},
+    {'queue': 'payouts.bank', 'method': ['bank']},
+    {'queue': 'payouts.usd', 'currency': ['USD'], 'amount_max': '500'},
+]
+ROUTE_CASES = [
+    ("card", "RUB", "100", ("payouts", 6)),
+    ("bank", "RUB", "50000", ("payouts.bank", 3)),
+    ("card", "RUB", "2000000", ("payouts.large", 0)),
+    ("card", "USD", "499.99", ("payouts.usd", 6)),
+    ("card", "USD", "500", ("payouts", 6)),
+]
+
+
+@pytest.fixture(autouse=True)
+def routes(settings):
+    settings.PAYOUT_ROUTES = ROUTES
+    settings.PAYOUT_DEFAULT_QUEUE = 'payouts'
+    settings.PAYOUT_PRIORITY_BANDS = [['100000', 0], ['10000', 3]]
+    settings.PAYOUT_DEFAULT_PRIORITY = 6
+
+
+class TestPayoutRouting:
+    """Набор тестов маршрутизации заявок по очередям."""
+
+    @pytest.mark.parametrize("method, currency, amount, expected", ROUTE_CASES)
+    def test_route_payout(self, method, currency, amount, expected):
+        """Тест выбора очереди и приоритета по правилам."""
+        assert route_payout(method, currency, Decimal(amount)) == expected
+
+    @pytest.mark.parametrize("method, currency, amount, expected", ROUTE_CASES)
+    def test_route_queue_in_sql(self, method, currency, amount, expected):
+        """Тест совпадения очереди в SQL с route_payout."""
+        Payout.objects.create(
+            method=method, amount=Decimal(amount), currency=currency,
+            card_number="1234567890123452", phone="89526984567",
+        )
+        queue, _ = expected
+        assert Payout.objects.annotate(queue=route_queue()).get().queue == (
+            queue
+        )
+
+    def test_claim_by_queue(self, payout_card, payout_bank):
+        """Тест того, что воркер очереди забирает только свои заявки."""
+        assert claim_payouts(limit=10, queue="payouts.usd") == []
+        assert [
+            payout.pk for payout in claim_payouts(
+                limit=10, queue="payouts.bank"
+            )
+        ] == [payout_bank.pk]
+        assert [
+            payout.pk for payout in claim_payouts(limit=10, queue="payouts")
+        ] == [payout_card.pk]
+
+    @patch("payouts.tasks.claim_pending_payouts_task.apply_async")
+    def test_sweeper_dispatches_per_queue(self, mocked_send, settings):
+        """Тест постановки задачи забора в каждую очередь выплат."""
+        settings.PAYOUT_CLAIM_INTERVAL = 5
+        claim_pending_payouts_task()
+        assert [
+            (call.kwargs["queue"], call.kwargs["kwargs"]["queue"])
+            for call in mocked_send.call_args_list
+        ] == [
+            ("payouts", "payouts"),
+            ("payouts.large", "payouts.large"),
+            ("payouts.bank", "payouts.bank"),
+            ("payouts.usd", "payouts.usd"),
+        ]
+        assert {
+            call.kwargs["expires"] for call in mocked_send.call_args_list
+        } == {5}
+
+    @patch("payouts.services.process_payout_batch_task.apply_async")
+    @patch("payouts.tasks.process_pending_payouts")
+    def test_sweeper_retries_by_route(
+        self, mocked_process, mocked_send, payout_bank
+    ):
+        """Тест повтора временных ошибок в очереди маршрута заявки."""
+        mocked_process.side_effect = [
+            {payout_bank.payout_uid: StatusChoice.PROCESSING}, {},
+        ]
+        assert claim_pending_payouts_task(queue="payouts.bank") == 1
+        assert mocked_process.call_args.kwargs["queue"] == "payouts.bank"
+        call = mocked_send.call_args
+        assert call.kwargs["queue"] == "payouts.bank"
+        assert call.kwargs["kwargs"] == {"retry": True}
+        assert call.kwargs["args"] == [[str(payout_bank.payout_uid)]]
+
+    def test_priority_in_base_currency(self):
+        """Тест порогов приоритета по сумме в базовой валюте."""
+        load_rates(stub_rates())
+        assert route_payout("card", "USD", Decimal("200")) == (
+            "payouts.usd", 3
+        )
+
+    @patch("payouts.services.process_payout_batch_task.apply_async")
+    def test_enqueue_groups_by_route(
+        self, mocked_send, payout_card, payout_bank
+    ):
+        """Тест отправки пачек заявок в очереди своих маршрутов."""
+        large = Payout.objects.create(
+            method=PaymentMethodChoice.CARD_TRANSFER,
+            amount=5000000,
+            currency=CurrencyChoice.RUB,
+            card_number="1234567890123452",
+            phone="89526984567",
+        )
+        enqueue_payouts([
+            payout_card.payout_uid, payout_bank.payout_uid, large.payout_uid,
+        ])
+        sent = {
+            (call.kwargs["queue"], call.kwargs["priority"]):
+                call.kwargs["args"][0]
+            for call in mocked_send.call_args_list
+        }
+        assert sent == {
+            ("payouts", 6): [str(payout_card.payout_uid)],
+            ("payouts.bank", 6): [str(payout_bank.payout_uid)],
+            ("payouts.large", 0): [str(large.payout_uid)],
+        }
+
+    def test_route_task(self, payout_bank):
+        """Тест роутера Celery для одиночной задачи обработки."""
+        assert route_task(
+            "payouts.tasks.process_payout_task",
+            [str(payout_bank.payout_uid)], {}, {},
+        ) == {'queue': 'payouts.bank', 'priority': 6}
+        assert route_task("payouts.tasks.archive_payouts_task", [], {}, {}) \
+            is None
+
+    @patch("payouts.routing.current_app")
+    def test_broker_queue_depth(self, mocked_app):
+        """Тест подсчёта задач в очередях брокера."""
+        connection = mocked_app.connection_for_read.return_value.__enter__()
+        channel = connection.channel.return_value.__enter__()
+        channel.queue_declare.side_effect = [
+            MagicMock(message_count=5), ChannelError(), MagicMock(
+                message_count=1
+            ), MagicMock(message_count=0),
+        ]
+        assert collect_broker_queue_depth() == [
+            ({'queue': 'payouts'}, 5),
+            ({'queue': 'payouts.large'}, 0),
+            ({'queue': 'payouts.bank'}, 1),
+            ({'queue': 'payouts.usd'}, 0),
+        ]
+
+    @patch("payouts.routing.current_app")
+    def test_broker_down(self, mocked_app):
+        """Тест пустой метрики при недоступном брокере."""
+        connection = mocked_app.connection_for_read.return_value.__enter__()
+        connection.ensure_connection.side_effect = OperationalError
+        assert collect_broker_queue_depth() == []
@@ -0,0 +1,223 @@
+import threading
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from api.serializers import PayoutUpdateSerializer
+from payouts.archive import archive_payouts
+from payouts.models import Payout, PayoutDailyStat, StatusChoice
+from payouts.services import bulk_create_payouts
+from payouts.stats import payout_day, query_stats, rebuild_recent_stats
+from payouts.transitions import transition
+
+
+pytestmark = pytest.mark.django_db
+
+
+def totals():
+    return {
+        (row.status, row.method): (row.count, row.amount)
+        for row in PayoutDailyStat.objects.all() if row.count
+    }
+
+
+class TestPayoutStats:
+    """Набор тестов инкрементальных дневных итогов по заявкам."""
+
+    def test_created_payouts_counted(self, payout_card, payout_bank):
+        """Тест учёта созданных заявок в итогах."""
+        assert totals() == {
+            ('pending', 'card'): (1, Decimal('100.00')),
+            ('pending', 'bank'): (1, Decimal('250.00')),
+        }
+        stat = PayoutDailyStat.objects.first()
+        assert stat.day == payout_day(payout_card.created_at)
+
+    def test_bulk_create_counted(self, payout_card):
+        """Тест учёта заявок, созданных пакетно."""
+        items = [
+            {
+                'method': payout_card.method,
+                'amount': Decimal('10.50'),
+                'currency': payout_card.currency,
+                'bank_name': payout_card.bank_name,
+                'card_number': payout_card.card_number,
+                'phone': '+79856584565',
+            }
+            for _ in range(3)
+        ]
+        bulk_create_payouts(items, chunk_size=2)
+        assert totals() == {('pending', 'card'): (4, Decimal('131.50'))}
+
+    def test_transition_moves_payout(self, payout_card, payout_bank):
+        """Тест переноса заявки между статусами при переходе."""
+        transition([payout_card.payout_uid], StatusChoice.PROCESSING)
+        transition([payout_card.payout_uid], StatusChoice.COMPLETED)
+        assert totals() == {
+            ('completed', 'card'): (1, Decimal('100.00')),
+            ('pending', 'bank'): (1, Decimal('250.00')),
+        }
+
+    def test_update_and_delete(self, api_client, payout_card):
+        """Тест учёта смены способа выплаты и удаления заявки."""
+        url = reverse("api:payouts-detail", args=[payout_card.payout_uid])
+        response = api_client.patch(
+            url,
+            {
+                "method": "bank",
+                "account_number": "12345678301234567890",
+                "bank_bik": "044525974",
+            },
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert totals() == {('pending', 'bank'): (1, Decimal('100.00'))}
+        api_client.delete(url)
+        assert totals() == {}
+
+    def test_method_change_after_concurrent_transition(self, payout_card):
+        """Тест переноса итогов по статусу, сменённому воркером."""
+        serializer = PayoutUpdateSerializer(
+            payout_card,
+            data={
+                "method": "bank",
+                "account_number": "12345678301234567890",
+                "bank_bik": "044525974",
+            },
+            partial=True,
+        )
+        assert serializer.is_valid(), serializer.errors
+        transition([payout_card.payout_uid], StatusChoice.PROCESSING)
+        serializer.save()
+        assert totals() == {('processing', 'bank'): (1, Decimal('100.00'))}
+
+    def test_rebuild_corrects_drift(self, payout_card, payout_bank):
+        """Тест пересчёта итогов с учётом архива."""
+        Payout.objects.filter(pk=payout_bank.pk).update(
+            status=StatusChoice.COMPLETED,
+            created_at=timezone.now() - timedelta(days=120),
+        )
+        archive_payouts(older_than_days=90)
+        PayoutDailyStat.objects.update(count=7)
+        rebuild_recent_stats(days=200)
+        assert totals() == {
+            ('pending', 'card'): (1, Decimal('100.00')),
+            ('completed', 'bank'): (1, Decimal('250.00')),
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_rebuild_concurrent_with_writes(self, payout_card, payout_bank):
+        """Тест пересчёта, не ждущего незавершённых записей итогов."""
+        created, finished = threading.Event(), threading.Event()
+
+        def create_payout():
+            try:
+                with transaction.atomic():
+                    Payout.objects.create(
+                        method=payout_card.method,
+                        amount=payout_card.amount,
+                        currency=payout_card.currency,
+                        card_number=payout_card.card_number,
+                        phone="+79856584565",
+                    )
+                    created.set()
+                    finished.wait(10)
+            finally:
+                connections.close_all()
+
+        PayoutDailyStat.objects.filter(method='bank').update(count=7)
+        writer = threading.Thread(target=create_payout)
+        writer.start()
+        assert created.wait(10)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SET lock_timeout = '1s'")
+            rebuild_recent_stats(days=1)
+        finally:
+            finished.set()
+            writer.join()
+            with connection.cursor() as cursor:
+                cursor.execute("RESET lock_timeout")
+        assert totals() == {
+            ('pending', 'card'): (2, Decimal('200.00')),
+            ('pending', 'bank'): (1, Decimal('250.00')),
+        }
+
+    def test_rebuild_command(self, payout_card):
+        """Тест команды пересчёта итогов."""
+        PayoutDailyStat.objects.all().delete()
+        call_command('rebuild_payout_stats', days=1)
+        assert totals() == {('pending', 'card'): (1, Decimal('100.00'))}
+
+    def test_query_groups_and_filters(self, payout_card, payout_bank):
+        """Тест группировки и фильтрации итогов."""
+        assert query_stats(group_by=['status']) == [
+            {'status': 'pending', 'count': 2, 'amount': Decimal('350.00')}
+        ]
+        assert query_stats(filters={'method': ['bank']}) == [
+            {'count': 1, 'amount': Decimal('250.00')}
+        ]
+        tomorrow = payout_day(payout_card.created_at) + timedelta(days=1)
+        assert query_stats(day_from=tomorrow) == []
+
+
+class TestPayoutStatsEndpoint:
+    """Набор тестов эндпоинта итогов по выплатам."""
+
+    url = reverse("api:payouts-stats")
+
+    def test_stats(self, api_client, payout_card, payout_bank):
+        """Тест итогов в разрезе всех измерений."""
+        day = payout_day(payout_card.created_at).isoformat()
+        response = api_client.get(
+            self.url, {"date_from": day, "date_to": day}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"] == [
+            {
+                "day": day,
+                "status": "pending",
+                "currency": "RUB",
+                "method": "card",
+                "count": 1,
+                "amount": "100.00",
+            },
+            {
+                "day": day,
+                "status": "pending",
+                "currency": "USD",
+                "method": "bank",
+                "count": 1,
+                "amount": "250.00",
+            },
+        ]
+
+    def test_stats_group_by(self, api_client, payout_card, payout_bank):
+        """Тест группировки итогов по выбранным измерениям."""
+        response = api_client.get(
+            self.url, {"group_by": "currency", "status": "pending"}
+        )
+        assert response.json()["results"] == [
+            {"currency": "RUB", "count": 1, "amount": "100.00"},
+            {"currency": "USD", "count": 1, "amount": "250.00"},
+        ]
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"group_by": "amount"},
+            {"date_from": "вчера"},
+            {"date_to": "2025-02-30"},
+            {"status": "unknown"},
+        ],
+    )
+    def test_stats_invalid_params(self, api_client, params):
+        """Тест отклонения некорректных параметров."""
+        response = api_client.get(self.url, params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
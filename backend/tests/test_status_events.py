@@ -0,0 +1,146 @@
+from importlib import import_module
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from payouts.models import PayoutStatusEvent, StatusChoice
+from payouts.partitions import (
+    default_partition, detach_partitions, ensure_partitions,
+    list_partitions, month_start, partition_name,
+)
+from payouts.transitions import apply_transitions, transition
+
+
+pytestmark = pytest.mark.django_db
+
+TABLE = PayoutStatusEvent._meta.db_table
+
+
+def count_rows(table):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT count(*) FROM {table}')
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def without_partitions():
+    """Фикстура журнала статусов только с секцией DEFAULT."""
+    with connection.cursor() as cursor:
+        for name in list_partitions(TABLE).values():
+            cursor.execute(f'DROP TABLE {name}')
+
+
+class TestPayoutStatusEvents:
+    """Набор тестов журнала смены статусов выплат."""
+
+    def test_transition_writes_events(self, payout_card, payout_bank):
+        """Тест записи события для каждого выполненного перехода."""
+        transition([payout_card.payout_uid], StatusChoice.PROCESSING)
+        apply_transitions({
+            payout_card.payout_uid: StatusChoice.COMPLETED,
+            payout_bank.payout_uid: StatusChoice.COMPLETED,
+        })
+        events = list(
+            PayoutStatusEvent.objects.values_list(
+                'payout_uid', 'from_status', 'to_status'
+            )
+        )
+        assert events == [
+            (payout_card.payout_uid, StatusChoice.PENDING,
+             StatusChoice.PROCESSING),
+            (payout_card.payout_uid, StatusChoice.PROCESSING,
+             StatusChoice.COMPLETED),
+        ]
+
+    def test_patch_writes_event(self, api_client, payout_card):
+        """Тест записи события при смене статуса через PATCH."""
+        url = reverse("api:payouts-detail", args=[payout_card.payout_uid])
+        response = api_client.patch(url, {"status": StatusChoice.CANCELLED})
+        assert response.status_code == status.HTTP_200_OK
+        event = PayoutStatusEvent.objects.get()
+        assert event.from_status == StatusChoice.PENDING
+        assert event.to_status == StatusChoice.CANCELLED
+
+
+@pytest.mark.usefixtures("without_partitions")
+class TestStatusEventPartitions:
+    """Набор тестов обслуживания секций журнала статусов."""
+
+    def test_ensure_partitions(self):
+        """Тест создания секций на текущий и следующие месяцы."""
+        created = ensure_partitions(TABLE, months_ahead=1)
+        current = month_start(timezone.now().date())
+        assert created == [
+            partition_name(TABLE, current),
+            partition_name(TABLE, month_start(current, 1)),
+        ]
+        assert ensure_partitions(TABLE, months_ahead=1) == []
+        assert set(list_partitions(TABLE)) == {
+            current, month_start(current, 1),
+        }
+
+    def test_events_routed_to_partition(self, payout_card):
+        """Тест попадания событий в секцию текущего месяца."""
+        ensure_partitions(TABLE, months_ahead=0)
+        transition([payout_card.payout_uid], StatusChoice.CANCELLED)
+        name = partition_name(TABLE, month_start(timezone.now().date()))
+        assert count_rows(name) == 1
+
+    def test_partition_after_default_rows(self, payout_card):
+        """Тест создания секции после записи событий в DEFAULT."""
+        transition([payout_card.payout_uid], StatusChoice.CANCELLED)
+        default = default_partition(TABLE)
+        assert count_rows(default) == 1
+        ensure_partitions(TABLE, months_ahead=1)
+        name = partition_name(TABLE, month_start(timezone.now().date()))
+        assert count_rows(name) == 1
+        assert count_rows(default) == 0
+        assert default_partition(TABLE) == default
+        assert PayoutStatusEvent.objects.get().payout_uid == (
+            payout_card.payout_uid
+        )
+
+    def test_migration_creates_partitions(self, payout_card):
+        """Тест миграции начальных секций с переносом строк из DEFAULT."""
+        migration = import_module(
+            'payouts.migrations.0022_payoutstatusevent_initial_partitions'
+        )
+        transition([payout_card.payout_uid], StatusChoice.CANCELLED)
+        schema_editor = SimpleNamespace(connection=connection)
+        migration.create_partitions(None, schema_editor)
+        migration.create_partitions(None, schema_editor)
+        current = month_start(timezone.now().date())
+        assert set(list_partitions(TABLE)) == {
+            current, month_start(current, 1),
+        }
+        assert count_rows(partition_name(TABLE, current)) == 1
+        assert count_rows(default_partition(TABLE)) == 0
+
+    def test_detach_old_partitions(self):
+        """Тест отсоединения секций старше срока хранения."""
+        old = month_start(timezone.now().date(), -3)
+        name = partition_name(TABLE, old)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE {name} PARTITION OF {TABLE} '
+                f'FOR VALUES FROM (%s) TO (%s)',
+                [old, month_start(old, 1)],
+            )
+        assert detach_partitions(TABLE, retain_months=6) == []
+        assert detach_partitions(TABLE, retain_months=2) == [name]
+        assert old not in list_partitions(TABLE)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s)', [name])
+            assert cursor.fetchone()[0] == name
+
+    def test_command(self):
+        """Тест команды обслуживания секций."""
+        call_command(
+            'manage_status_event_partitions', ahead=0, retain_months=12
+        )
+        assert month_start(timezone.now().date()) in list_partitions(TABLE)
@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+
+from payouts.models import Payout, StatusChoice
+from payouts.processor import claim_payouts
+from payouts.tasks import process_payout_batch_task
+from payouts.throttling import ProviderThrottle, slots_key
+
+
+pytestmark = pytest.mark.django_db
+
+LIMITS = {
+    'card': {'rate': 10, 'burst': 10, 'concurrency': 5},
+}
+
+
+@pytest.fixture(autouse=True)
+def limits(settings):
+    settings.PAYOUT_PROVIDER_LIMITS = LIMITS
+    settings.PAYOUT_THROTTLE_MIN_DELAY = 1
+
+
+class TestProviderThrottle:
+    """Набор тестов лимитов вызовов провайдеров."""
+
+    def test_admit_within_limits(
+        self, throttle_script, payout_card, payout_bank
+    ):
+        """Тест пропуска заявок и аренды слотов семафора."""
+        with patch("payouts.throttling.get_client") as mocked_client:
+            with ProviderThrottle() as throttle:
+                admitted = throttle.admit([payout_card, payout_bank])
+                assert admitted == [payout_card, payout_bank]
+                assert throttle.slots == {'card': 1}
+            pipeline = mocked_client.return_value.pipeline.return_value
+            pipeline.zrem.assert_called_once_with(
+                slots_key('card'), f'{throttle.holder}:1'
+            )
+        # Для bank лимиты не заданы, Redis не вызывается
+        assert throttle_script.call_count == 1
+        assert throttle_script.call_args.kwargs['args'][:4] == [
+            10, 10, 5, 1
+        ]
+
+    def test_claim_defers_throttled(self, throttle_script, payout_card):
+        """Тест того, что отложенные заявки не забираются в обработку."""
+        throttle_script.side_effect = None
+        throttle_script.return_value = [0, '0.25']
+        throttle = ProviderThrottle()
+        assert claim_payouts([payout_card.payout_uid], throttle=throttle) \
+            == []
+        assert throttle.deferred == [payout_card.payout_uid]
+        assert throttle.retry_after == 1
+        payout_card.refresh_from_db()
+        assert payout_card.status == StatusChoice.PENDING
+
+    def test_redis_down_fail_open(self, throttle_script, payout_card):
+        """Тест пропуска заявок при недоступном Redis."""
+        throttle_script.side_effect = redis.ConnectionError
+        throttle = ProviderThrottle()
+        assert throttle.admit([payout_card]) == [payout_card]
+        assert not throttle.deferred
+
+    @patch("payouts.tasks.process_payout_batch_task.apply_async")
+    def test_task_defers_rest(
+        self, mocked_send, throttle_script, payout_card
+    ):
+        """Тест откладывания задачи вместо ожидания в слоте воркера."""
+        throttle_script.side_effect = None
+        throttle_script.return_value = [0, '2.5']
+        process_payout_batch_task.apply(
+            args=[[str(payout_card.payout_uid)]]
+        )
+        mocked_send.assert_called_once()
+        assert mocked_send.call_args.kwargs['args'] == [
+            [str(payout_card.payout_uid)]
+        ]
+        assert mocked_send.call_args.kwargs['countdown'] == 2.5
+        assert Payout.objects.get(pk=payout_card.pk).status == (
+            StatusChoice.PENDING
+        )
+
+    def test_metrics(self, client, throttle_script, payout_card):
+        """Тест счётчиков пропущенных и отложенных вызовов."""
+        throttle_script.side_effect = None
+        throttle_script.return_value = [0, '0']
+        ProviderThrottle().admit([payout_card, MagicMock(method='card')])
+        body = client.get('/api/metrics/').content.decode()
+        assert 'payout_provider_throttled_total{provider="card"} 2' in body
+        assert 'payout_provider_admitted_total{provider="card"} 0' in body
@@ -0,0 +1,75 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from api.exceptions import PayoutConflict
+from api.serializers import PayoutUpdateSerializer
+from payouts.models import Payout, StatusChoice
+from payouts.transitions import apply_transitions, transition
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestPayoutTransitions:
+    """Набор тестов машины состояний статусов выплат."""
+
+    def test_transition_conditional(self, payout_card, payout_bank):
+        """Тест перехода только для строк с допустимым статусом."""
+        Payout.objects.filter(pk=payout_bank.pk).update(
+            status=StatusChoice.COMPLETED
+        )
+        moved = transition(
+            [payout_card.payout_uid, payout_bank.payout_uid],
+            StatusChoice.CANCELLED,
+        )
+        assert moved == [payout_card.payout_uid]
+        payout_bank.refresh_from_db()
+        assert payout_bank.status == StatusChoice.COMPLETED
+
+    def test_apply_transitions_mixed_targets(self, payout_card, payout_bank):
+        """Тест разных целевых статусов в одном UPDATE."""
+        transition(
+            [payout_card.payout_uid, payout_bank.payout_uid],
+            StatusChoice.PROCESSING,
+        )
+        moved = apply_transitions({
+            payout_card.payout_uid: StatusChoice.COMPLETED,
+            payout_bank.payout_uid: StatusChoice.REJECTED,
+        })
+        assert moved == {
+            payout_card.payout_uid: StatusChoice.COMPLETED,
+            payout_bank.payout_uid: StatusChoice.REJECTED,
+        }
+
+    def test_transition_sources(self, payout_card):
+        """Тест перехода с проверкой ожидаемого текущего статуса."""
+        assert not transition(
+            [payout_card.payout_uid], StatusChoice.CANCELLED,
+            sources=[StatusChoice.APPROVED],
+        )
+
+    def test_patch_forbidden_transition(self, api_client, payout_card):
+        """Тест запрета недопустимого перехода через PATCH."""
+        Payout.objects.filter(pk=payout_card.pk).update(
+            status=StatusChoice.COMPLETED
+        )
+        url = reverse("api:payouts-detail", args=[payout_card.payout_uid])
+        response = api_client.patch(url, {"status": StatusChoice.PENDING})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "status" in response.data
+
+    def test_patch_concurrent_change(self, payout_card):
+        """Тест конфликта при параллельной смене статуса."""
+        serializer = PayoutUpdateSerializer(
+            payout_card, data={"status": StatusChoice.CANCELLED},
+            partial=True,
+        )
+        assert serializer.is_valid()
+        Payout.objects.filter(pk=payout_card.pk).update(
+            status=StatusChoice.APPROVED
+        )
+        with pytest.raises(PayoutConflict):
+            serializer.save()
+        payout_card.refresh_from_db()
+        assert payout_card.status == StatusChoice.APPROVED
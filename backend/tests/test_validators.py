@@ -0,0 +1,164 @@
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from payouts.encryption import blind_index
+from payouts.models import (
+    CurrencyChoice,
+    Payout,
+    PayoutStatusEvent,
+    PaymentMethodChoice,
+    StatusChoice
+)
+from payouts.processor import claim_payouts, process_payouts
+from payouts.providers import FakeProvider
+from payouts.validators import (
+    account_valid,
+    luhn_valid,
+    validate_requisites,
+    validation_fingerprint
+)
+
+
+pytestmark = pytest.mark.django_db
+
+CARD_DATA = {
+    "method": PaymentMethodChoice.CARD_TRANSFER,
+    "amount": 1000.0,
+    "currency": CurrencyChoice.RUB,
+    "bank_name": "Тинькофф",
+    "card_number": "2201221554561246",
+    "phone": "+79856584565",
+}
+
+
+class TestRequisiteValidators:
+    """Набор тестов проверки реквизитов выплат."""
+
+    @pytest.mark.parametrize("number, expected", [
+        ("2201221554561246", True),
+        ("4111111111111111", True),
+        ("2201221554561245", False),
+    ])
+    def test_luhn(self, number, expected):
+        """Тест проверки номера карты по алгоритму Луна."""
+        assert luhn_valid(number) is expected
+
+    @pytest.mark.parametrize("account, bik, expected", [
+        ("40817810899910004312", "044525225", True),
+        ("40817810099910004312", "044525225", False),
+        ("40102810545370000003", "044525000", True),
+        ("40102810145370000003", "044525000", False),
+    ])
+    def test_account_key(self, account, bik, expected):
+        """Тест контрольного ключа счёта относительно БИК."""
+        assert account_valid(account, bik) is expected
+
+    def test_bank_requires_bik(self):
+        """Тест обязательности БИК для выплаты на счёт."""
+        errors = validate_requisites(
+            PaymentMethodChoice.BANK_TRANSFER,
+            account_number="40817810899910004312",
+        )
+        assert set(errors) == {"bank_bik"}
+
+    @pytest.mark.parametrize("requisites, field", [
+        ({"method": PaymentMethodChoice.CARD_TRANSFER,
+          "card_number": "\u0661" * 16}, "card_number"),
+        ({"method": PaymentMethodChoice.BANK_TRANSFER,
+          "account_number": "\u0664" * 20,
+          "bank_bik": "044525225"}, "account_number"),
+        ({"method": PaymentMethodChoice.BANK_TRANSFER,
+          "account_number": "40817810899910004312",
+          "bank_bik": "04\u0664525225"}, "bank_bik"),
+    ])
+    def test_non_ascii_digits(self, requisites, field):
+        """Тест отклонения цифр, отличных от ASCII."""
+        assert set(validate_requisites(**requisites)) == {field}
+
+    def test_api_rejects_non_ascii_card(self, api_client):
+        """Тест ответа 400 на номер карты из арабско-индийских цифр."""
+        response = api_client.post(
+            reverse("api:payouts-list"),
+            {**CARD_DATA, "card_number": "\u0661" * 16},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "card_number" in response.data
+
+    def test_api_rejects_bad_checksum(self, api_client):
+        """Тест отклонения номера карты с неверной контрольной цифрой."""
+        response = api_client.post(
+            reverse("api:payouts-list"),
+            {**CARD_DATA, "card_number": "2201221554561245"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "card_number" in response.data
+        assert not Payout.objects.exists()
+
+    def test_api_stores_fingerprint(self, api_client):
+        """Тест сохранения отпечатка проверки при создании заявки."""
+        response = api_client.post(
+            reverse("api:payouts-list"), CARD_DATA, format="json"
+        )
+        payout = Payout.objects.get(pk=response.data["payout_uid"])
+        assert payout.validation_fingerprint == validation_fingerprint(
+            PaymentMethodChoice.CARD_TRANSFER,
+            card_number=CARD_DATA["card_number"],
+        )
+
+    def test_patch_revalidates(self, api_client, payout_card):
+        """Тест проверки реквизитов при их изменении через PATCH."""
+        url = reverse("api:payouts-detail", args=[payout_card.payout_uid])
+        response = api_client.patch(
+            url, {"card_number": "2201221554561245"}, format="json"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = api_client.patch(
+            url, {"card_number": "4111111111111111"}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        payout_card.refresh_from_db()
+        assert payout_card.validation_fingerprint == validation_fingerprint(
+            PaymentMethodChoice.CARD_TRANSFER,
+            card_number="4111111111111111",
+        )
+
+
+class TestWorkerValidation:
+    """Набор тестов проверки реквизитов в воркере."""
+
+    def test_fingerprint_skips_validation(self, api_client):
+        """Тест пропуска повторной проверки по отпечатку."""
+        response = api_client.post(
+            reverse("api:payouts-list"), CARD_DATA, format="json"
+        )
+        with patch(
+            "payouts.processor.validate_requisites"
+        ) as mocked, patch("payouts.encryption.salted_hmac") as hmac:
+            statuses = process_payouts(
+                [response.data["payout_uid"]], FakeProvider(latency=0)
+            )
+        mocked.assert_not_called()
+        hmac.assert_not_called()
+        assert set(statuses.values()) == {StatusChoice.COMPLETED}
+
+    def test_changed_requisites_revalidated(self, api_client):
+        """Тест проверки реквизитов, изменённых в обход API."""
+        response = api_client.post(
+            reverse("api:payouts-list"), CARD_DATA, format="json"
+        )
+        Payout.objects.filter(pk=response.data["payout_uid"]).update(
+            card_number="2201221554561245"
+        )
+        assert Payout.objects.filter(
+            card_number_hash=blind_index("card_number", "2201221554561245")
+        ).exists()
+        assert claim_payouts([response.data["payout_uid"]]) == []
+        event = PayoutStatusEvent.objects.get()
+        assert (event.from_status, event.to_status) == (
+            StatusChoice.PENDING, StatusChoice.REJECTED
+        )